@@ -22,6 +22,12 @@ class Settings(BaseSettings):
     MONGO_AUTH_SOURCE: str = Field(default="admin")
     DATABASE_NAME: str = Field(default="keeda")
 
+    # MongoDB Connection Pool (one shared client per process)
+    MONGO_MAX_POOL_SIZE: int = Field(default=200)
+    MONGO_MIN_POOL_SIZE: int = Field(default=10)
+    MONGO_MAX_IDLE_TIME_MS: int = Field(default=300_000)
+    MONGO_COMPRESSORS: str = Field(default="zstd,zlib")
+
     # MongoDB Admin (for scripts)
     MONGO_ADMIN_USERNAME: Optional[str] = Field(default=None)
     MONGO_ADMIN_PASSWORD: Optional[str] = Field(default=None)
@@ -66,6 +72,40 @@ class Settings(BaseSettings):
     OPENAI_API_KEY: Optional[str] = Field(default=None)
     ANTHROPIC_API_KEY: Optional[str] = Field(default=None)
 
+    # Shared OpenAI client connection pool
+    OPENAI_MAX_CONNECTIONS: int = Field(default=100)
+    OPENAI_MAX_KEEPALIVE_CONNECTIONS: int = Field(default=50)
+    OPENAI_KEEPALIVE_EXPIRY_SECONDS: float = Field(default=90.0)
+    OPENAI_TIMEOUT_SECONDS: float = Field(default=120.0)
+    # HTTP transport for the OpenAI client ("httpx" or "aiohttp")
+    OPENAI_HTTP_TRANSPORT: str = Field(default="httpx")
+    # Multiplex concurrent requests over HTTP/2 (httpx transport, needs h2)
+    OPENAI_HTTP2: bool = Field(default=False)
+
+    # Maximum agent LLM calls in flight per process
+    LLM_MAX_CONCURRENCY: int = Field(default=8)
+
+    # Client-side LLM rate limits for agent fan-out (0 disables)
+    LLM_REQUESTS_PER_MINUTE: int = Field(default=0)
+    LLM_TOKENS_PER_MINUTE: int = Field(default=0)
+
+    # LLM response cache ("memory" or "redis")
+    LLM_CACHE_BACKEND: str = Field(default="memory")
+    LLM_CACHE_ENABLED: bool = Field(default=True)
+    LLM_CACHE_TTL_SECONDS: int = Field(default=3600)
+    LLM_CACHE_MAX_ENTRIES: int = Field(default=1024)
+
+    # Semantic agent cache: reuse outputs of near-identical prompts
+    LLM_SEMANTIC_CACHE_ENABLED: bool = Field(default=False)
+    LLM_SEMANTIC_CACHE_THRESHOLD: float = Field(default=0.92)
+    LLM_SEMANTIC_CACHE_MAX_ENTRIES: int = Field(default=256)
+    LLM_SEMANTIC_CACHE_EMBEDDING_MODEL: str = Field(default="text-embedding-3-small")
+
+    # Provider fallback order and per-provider circuit breaker
+    LLM_FALLBACK_ORDER: List[str] = Field(default=["openai", "ollama"])
+    LLM_CIRCUIT_FAILURE_THRESHOLD: int = Field(default=5)
+    LLM_CIRCUIT_COOLDOWN_SECONDS: float = Field(default=30.0)
+
     # Ollama Configuration
     OLLAMA_BASE_URL: Optional[str] = Field(default="http://localhost:11434")
     OLLAMA_MODEL: Optional[str] = Field(default="llama3.2")
@@ -86,6 +126,10 @@ class Settings(BaseSettings):
     JAEGER_AGENT_HOST: str = Field(default="localhost")
     JAEGER_AGENT_PORT: int = Field(default=6831)
 
+    # Keep full prompts and responses on agent spans (otherwise truncated)
+    TRACE_FULL_PROMPT: bool = Field(default=False)
+    TRACE_ATTRIBUTE_MAX_LENGTH: int = Field(default=4096)
+
     # CORS
     BACKEND_CORS_ORIGINS: List[str] = Field(
         default=["http://localhost:3000", "http://localhost:8000"]
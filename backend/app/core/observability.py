@@ -5,14 +5,18 @@ import functools
 from typing import Dict, Any, Optional, Callable
 from contextlib import contextmanager
 import logging
+import orjson
 
 from opentelemetry import trace
 from opentelemetry.trace import Status, StatusCode
-from opentelemetry.sdk.trace import TracerProvider
+from opentelemetry.sdk.trace import SpanLimits, TracerProvider
 from opentelemetry.sdk.trace.export import BatchSpanProcessor
 from opentelemetry.exporter.otlp.proto.grpc.trace_exporter import OTLPSpanExporter
 from opentelemetry.sdk.resources import Resource
 from opentelemetry.instrumentation.fastapi import FastAPIInstrumentor
+from pydantic import BaseModel
+
+from app.core.config import settings
 
 logger = logging.getLogger(__name__)
 
@@ -47,9 +51,26 @@ def setup_tracing(
             insecure=True  # Use insecure connection for local development
         )
 
-        # Create tracer provider
-        provider = TracerProvider(resource=resource)
-        processor = BatchSpanProcessor(otlp_exporter)
+        # Create tracer provider. Agent spans carry prompts and responses;
+        # unless TRACE_FULL_PROMPT is set, long attributes are truncated
+        provider = TracerProvider(
+            resource=resource,
+            span_limits=SpanLimits(
+                max_attribute_length=(
+                    None if settings.TRACE_FULL_PROMPT
+                    else settings.TRACE_ATTRIBUTE_MAX_LENGTH
+                )
+            )
+        )
+
+        # Export off the request path, in batches sized for large LLM spans
+        processor = BatchSpanProcessor(
+            otlp_exporter,
+            max_queue_size=10000,
+            max_export_batch_size=512,
+            schedule_delay_millis=1000,
+            export_timeout_millis=30000
+        )
         provider.add_span_processor(processor)
 
         # Set as global tracer provider
@@ -329,12 +350,13 @@ def add_span_attributes(attributes: Dict[str, Any]) -> None:
                 continue
             elif isinstance(value, (str, bool, int, float)):
                 span.set_attribute(key, value)
-            elif isinstance(value, (list, tuple)):
-                # Convert to string representation for lists
-                span.set_attribute(key, str(value))
-            elif isinstance(value, dict):
-                # Flatten dict or convert to string
-                span.set_attribute(key, str(value))
+            elif isinstance(value, BaseModel):
+                span.set_attribute(key, value.model_dump_json())
+            elif isinstance(value, (list, tuple, dict)):
+                # Serialize containers as JSON
+                span.set_attribute(key, orjson.dumps(
+                    value, default=str, option=orjson.OPT_NON_STR_KEYS
+                ).decode())
             else:
                 span.set_attribute(key, str(value))
 
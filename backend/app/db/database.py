@@ -21,7 +21,18 @@ class MongoDB:
     def connect(cls) -> None:
         """Initialize MongoDB connection."""
         try:
-            cls._client = MongoClient(settings.MONGODB_URL)
+            # A single client (and connection pool) is shared by every
+            # repository. tz_aware keeps datetimes read back from MongoDB in
+            # UTC, matching the aware timestamps the models write.
+            cls._client = MongoClient(
+                settings.MONGODB_URL,
+                tz_aware=True,
+                maxPoolSize=settings.MONGO_MAX_POOL_SIZE,
+                minPoolSize=settings.MONGO_MIN_POOL_SIZE,
+                maxIdleTimeMS=settings.MONGO_MAX_IDLE_TIME_MS,
+                compressors=settings.MONGO_COMPRESSORS,
+                retryWrites=True,
+            )
             cls._database = cls._client[settings.DATABASE_NAME]
 
             # Test connection
@@ -1,10 +1,13 @@
 """Base repository with CRUD operations."""
 
-from typing import Type, TypeVar, Generic, Optional, List, Dict, Any
-from datetime import datetime
+from typing import Type, TypeVar, Generic, Optional, List, Dict, Any, Union
+from datetime import datetime, timezone
 from pymongo.collection import Collection
-from pymongo.errors import DuplicateKeyError
+from pymongo.results import BulkWriteResult
+from pymongo.errors import BulkWriteError, DuplicateKeyError, OperationFailure
 from bson import ObjectId
+from pydantic import BaseModel
+import asyncio
 import logging
 
 from app.db.database import get_collection
@@ -16,7 +19,12 @@ T = TypeVar('T', bound=BaseDocument)
 
 
 class BaseRepository(Generic[T]):
-    """Base repository with common CRUD operations."""
+    """Base repository with common CRUD operations.
+
+    PyMongo is blocking, so reads and writes run in a worker thread. This
+    keeps the event loop free and lets independent queries overlap under
+    asyncio.gather.
+    """
 
     def __init__(self, model: Type[T]):
         """Initialize repository with model."""
@@ -32,38 +40,51 @@ class BaseRepository(Generic[T]):
             self._collection = get_collection(self.collection_name)
         return self._collection
 
+    def bind(self, collection: Collection) -> None:
+        """Use the given collection and make sure its indexes exist."""
+        self._collection = collection
+        self._ensure_indexes()
+
     def _ensure_indexes(self):
-        """Ensure indexes are created for the collection."""
-        if hasattr(self.model.Config, 'indexes'):
-            for index_config in self.model.Config.indexes:
-                fields = index_config.get('fields')
-                unique = index_config.get('unique', False)
-
-                if isinstance(fields, list):
-                    # Compound index
-                    index_spec = [(field, 1) if isinstance(field, str) else field for field in fields]
-                else:
-                    # Simple index
-                    index_spec = [(fields, 1)]
+        """Ensure the model's indexes exist, in a single createIndexes call."""
+        indexes = getattr(self.model.Config, 'indexes', None)
+        if not indexes:
+            return
 
+        try:
+            names = self.collection.create_indexes(indexes)
+            logger.debug(f"Ensured indexes on {self.collection_name}: {names}")
+        except OperationFailure:
+            # The batch is all-or-nothing; fall back to one index at a time so
+            # a single conflicting definition does not block the others.
+            for index in indexes:
                 try:
-                    self.collection.create_index(index_spec, unique=unique)
-                    logger.debug(f"Created index on {self.collection_name}: {index_spec}")
+                    self.collection.create_indexes([index])
                 except Exception as e:
                     logger.debug(f"Index might already exist on {self.collection_name}: {e}")
+        except Exception as e:
+            logger.debug(f"Could not ensure indexes on {self.collection_name}: {e}")
+
+    @staticmethod
+    def _object_id(id: Union[str, ObjectId]) -> ObjectId:
+        """Return id as an ObjectId, skipping the parse if it already is one."""
+        return id if isinstance(id, ObjectId) else ObjectId(id)
 
     async def create(self, obj: T) -> T:
         """Create a new document."""
         try:
             # Update timestamps
-            obj.created_at = datetime.utcnow()
-            obj.updated_at = datetime.utcnow()
+            now = datetime.now(timezone.utc)
+            obj.created_at = now
+            obj.updated_at = now
+            if obj.id is None:
+                obj.id = ObjectId()
 
             # Convert to dict and insert
-            # Use exclude_none instead of exclude_unset to include defaults
-            doc = obj.dict(by_alias=True, exclude_none=True)
-            result = self.collection.insert_one(doc)
-            obj.id = result.inserted_id
+            # Use exclude_none instead of exclude_unset to include defaults,
+            # and model_dump so a pre-allocated _id stays an ObjectId
+            doc = obj.model_dump(by_alias=True, exclude_none=True)
+            await asyncio.to_thread(self.collection.insert_one, doc)
 
             logger.info(f"Created {self.collection_name} document: {obj.id}")
             return obj
@@ -75,10 +96,12 @@ class BaseRepository(Generic[T]):
             logger.error(f"Error creating document: {e}")
             raise
 
-    async def get(self, id: str) -> Optional[T]:
+    async def get(self, id: Union[str, ObjectId]) -> Optional[T]:
         """Get document by ID."""
         try:
-            doc = self.collection.find_one({"_id": ObjectId(id)})
+            doc = await asyncio.to_thread(
+                self.collection.find_one, {"_id": self._object_id(id)}
+            )
             if doc:
                 return self.model(**doc)
             return None
@@ -89,7 +112,7 @@ class BaseRepository(Generic[T]):
     async def get_by_field(self, field: str, value: Any) -> Optional[T]:
         """Get document by field value."""
         try:
-            doc = self.collection.find_one({field: value})
+            doc = await asyncio.to_thread(self.collection.find_one, {field: value})
             if doc:
                 return self.model(**doc)
             return None
@@ -114,24 +137,51 @@ class BaseRepository(Generic[T]):
             else:
                 cursor = cursor.sort([("created_at", -1)])
 
-            docs = list(cursor)
+            docs = await asyncio.to_thread(list, cursor)
             return [self.model(**doc) for doc in docs]
 
         except Exception as e:
             logger.error(f"Error listing documents: {e}")
             return []
 
-    async def update(self, id: str, update_data: Dict[str, Any]) -> Optional[T]:
+    async def list_cards(
+        self,
+        card_model: Type[BaseModel],
+        filter: Optional[Dict[str, Any]] = None,
+        skip: int = 0,
+        limit: int = 100,
+        sort: Optional[List[tuple]] = None
+    ) -> List[BaseModel]:
+        """List lightweight views using the model's list_projection.
+
+        Only the projected fields are fetched, so with a matching covering
+        index the query is served from the index without reading documents.
+        """
+        try:
+            query = filter or {}
+            projection = self.model.Config.list_projection
+            cursor = self.collection.find(query, projection).skip(skip).limit(limit)
+            cursor = cursor.sort(sort or [("created_at", -1)])
+
+            docs = await asyncio.to_thread(list, cursor)
+            return [card_model(**doc) for doc in docs]
+
+        except Exception as e:
+            logger.error(f"Error listing {self.collection_name} cards: {e}")
+            return []
+
+    async def update(self, id: Union[str, ObjectId], update_data: Dict[str, Any]) -> Optional[T]:
         """Update document by ID."""
         try:
             # Add updated_at timestamp
-            update_data["updated_at"] = datetime.utcnow()
+            update_data["updated_at"] = datetime.now(timezone.utc)
 
             # Remove None values
             update_data = {k: v for k, v in update_data.items() if v is not None}
 
-            result = self.collection.find_one_and_update(
-                {"_id": ObjectId(id)},
+            result = await asyncio.to_thread(
+                self.collection.find_one_and_update,
+                {"_id": self._object_id(id)},
                 {"$set": update_data},
                 return_document=True
             )
@@ -145,10 +195,12 @@ class BaseRepository(Generic[T]):
             logger.error(f"Error updating document {id}: {e}")
             raise
 
-    async def delete(self, id: str) -> bool:
+    async def delete(self, id: Union[str, ObjectId]) -> bool:
         """Delete document by ID."""
         try:
-            result = self.collection.delete_one({"_id": ObjectId(id)})
+            result = await asyncio.to_thread(
+                self.collection.delete_one, {"_id": self._object_id(id)}
+            )
             if result.deleted_count > 0:
                 logger.info(f"Deleted {self.collection_name} document: {id}")
                 return True
@@ -162,7 +214,7 @@ class BaseRepository(Generic[T]):
         """Count documents with optional filter."""
         try:
             query = filter or {}
-            return self.collection.count_documents(query)
+            return await asyncio.to_thread(self.collection.count_documents, query)
         except Exception as e:
             logger.error(f"Error counting documents: {e}")
             return 0
@@ -170,46 +222,81 @@ class BaseRepository(Generic[T]):
     async def exists(self, filter: Dict[str, Any]) -> bool:
         """Check if document exists with given filter."""
         try:
-            doc = self.collection.find_one(filter, {"_id": 1})
+            doc = await asyncio.to_thread(self.collection.find_one, filter, {"_id": 1})
             return doc is not None
         except Exception as e:
             logger.error(f"Error checking existence: {e}")
             return False
 
     async def bulk_create(self, objects: List[T]) -> List[T]:
-        """Create multiple documents."""
+        """Create multiple documents in a single insert_many round trip.
+
+        The insert is unordered, so one duplicate does not stop the rest:
+        documents rejected only for violating a unique index are skipped
+        (and logged), and the successfully inserted objects are returned.
+        """
         try:
             if not objects:
                 return []
 
-            # Update timestamps
-            now = datetime.utcnow()
+            # Update timestamps and allocate ids client-side, so every
+            # object's id is known whether or not the insert round trip
+            # reports it back
+            now = datetime.now(timezone.utc)
             docs = []
             for obj in objects:
+                if obj.id is None:
+                    obj.id = ObjectId()
                 obj.created_at = now
                 obj.updated_at = now
-                docs.append(obj.dict(by_alias=True, exclude_none=True))
+                docs.append(obj.model_dump(by_alias=True, exclude_none=True))
+
+            try:
+                await asyncio.to_thread(self.collection.insert_many, docs, ordered=False)
+                created = objects
+            except BulkWriteError as e:
+                errors = e.details.get("writeErrors", [])
+                if any(error.get("code") != 11000 for error in errors):
+                    raise
+                skipped = {error["index"] for error in errors}
+                created = [obj for i, obj in enumerate(objects) if i not in skipped]
+                logger.warning(
+                    f"Skipped {len(skipped)} duplicate {self.collection_name} documents"
+                )
+
+            logger.info(f"Bulk created {len(created)} {self.collection_name} documents")
+            return created
 
-            result = self.collection.insert_many(docs)
+        except Exception as e:
+            logger.error(f"Error bulk creating documents: {e}")
+            raise
 
-            # Update objects with inserted IDs
-            for obj, inserted_id in zip(objects, result.inserted_ids):
-                obj.id = inserted_id
+    async def bulk_commit(self, operations: List[Any]) -> BulkWriteResult:
+        """Run mixed write operations on this collection in one bulk_write.
 
-            logger.info(f"Bulk created {len(objects)} {self.collection_name} documents")
-            return objects
+        The batch is unordered, so operations must not depend on each other.
+        """
+        try:
+            result = await asyncio.to_thread(
+                self.collection.bulk_write, operations, ordered=False
+            )
+            logger.info(
+                f"Bulk wrote {self.collection_name}: {result.inserted_count} inserted, "
+                f"{result.modified_count} modified"
+            )
+            return result
 
         except Exception as e:
-            logger.error(f"Error bulk creating documents: {e}")
+            logger.error(f"Error bulk writing documents: {e}")
             raise
 
     async def update_many(self, filter: Dict[str, Any], update: Dict[str, Any]) -> int:
         """Update multiple documents."""
         try:
             # Add updated_at timestamp
-            update.setdefault("$set", {})["updated_at"] = datetime.utcnow()
+            update.setdefault("$set", {})["updated_at"] = datetime.now(timezone.utc)
 
-            result = self.collection.update_many(filter, update)
+            result = await asyncio.to_thread(self.collection.update_many, filter, update)
             logger.info(f"Updated {result.modified_count} {self.collection_name} documents")
             return result.modified_count
 
@@ -220,7 +307,7 @@ class BaseRepository(Generic[T]):
     async def delete_many(self, filter: Dict[str, Any]) -> int:
         """Delete multiple documents."""
         try:
-            result = self.collection.delete_many(filter)
+            result = await asyncio.to_thread(self.collection.delete_many, filter)
             logger.info(f"Deleted {result.deleted_count} {self.collection_name} documents")
             return result.deleted_count
 
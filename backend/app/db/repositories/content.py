@@ -2,8 +2,29 @@
 
 from typing import Optional, List, Dict, Any
 from bson import ObjectId
+import asyncio
+import logging
 from app.db.repositories.base import BaseRepository
-from app.models import Chapter, Scene, Panel, Character
+from app.models import Project, Chapter, Scene, Panel, Character, ChapterCard, SceneCard
+
+logger = logging.getLogger(__name__)
+
+# Character fields included in agent prompts
+CHARACTER_BRIEF_FIELDS = ("name", "role", "description")
+
+
+def _character_briefs_lookup(project_field: str) -> Dict[str, Any]:
+    """$lookup stage joining a project's character briefs as "characters"."""
+    return {"$lookup": {
+        "from": "characters",
+        "let": {"project_id": project_field},
+        "pipeline": [
+            {"$match": {"$expr": {"$eq": ["$project_id", "$$project_id"]}}},
+            {"$sort": {"created_at": -1}},
+            {"$project": {"_id": 0, **{field: 1 for field in CHARACTER_BRIEF_FIELDS}}}
+        ],
+        "as": "characters"
+    }}
 
 
 class CharacterRepository(BaseRepository[Character]):
@@ -18,6 +39,25 @@ class CharacterRepository(BaseRepository[Character]):
             filter={"project_id": ObjectId(project_id)}
         )
 
+    async def count_project_characters(self, project_id: str) -> int:
+        """Count a project's characters on the server."""
+        return await self.count({"project_id": ObjectId(project_id)})
+
+    async def get_project_character_briefs(self, project_id: str) -> List[Dict[str, Any]]:
+        """Get name, role and description of a project's characters.
+
+        Used to build agent prompts, so only the fields the prompts need are
+        fetched (not even _id) and the documents are returned as plain dicts
+        without model validation. Query errors are raised rather than
+        returned as an empty list, so callers never mistake a failed fetch
+        for a project without characters.
+        """
+        cursor = self.collection.find(
+            {"project_id": ObjectId(project_id)},
+            {"_id": 0, **{field: 1 for field in CHARACTER_BRIEF_FIELDS}}
+        ).sort([("created_at", -1)]).batch_size(64)
+        return await asyncio.to_thread(list, cursor)
+
 
 class ChapterRepository(BaseRepository[Chapter]):
     """Repository for chapter operations."""
@@ -32,6 +72,18 @@ class ChapterRepository(BaseRepository[Chapter]):
             sort=[("chapter_number", 1)]
         )
 
+    async def count_project_chapters(self, project_id: str) -> int:
+        """Count a project's chapters on the server."""
+        return await self.count({"project_id": ObjectId(project_id)})
+
+    async def get_project_chapter_cards(self, project_id: str) -> List[ChapterCard]:
+        """Get lightweight chapter cards for a project, ordered by chapter number."""
+        return await self.list_cards(
+            ChapterCard,
+            filter={"project_id": ObjectId(project_id)},
+            sort=[("chapter_number", 1)]
+        )
+
     async def get_chapter_with_scenes(self, chapter_id: str) -> Optional[dict]:
         """Get chapter with all its scenes."""
         pipeline = [
@@ -93,6 +145,47 @@ class ChapterRepository(BaseRepository[Chapter]):
         result = list(self.collection.aggregate(pipeline))
         return result[0] if result else None
 
+    async def get_chapter_context(
+        self,
+        chapter_id: str,
+        with_characters: bool = False
+    ) -> Optional[Dict[str, Any]]:
+        """Get a chapter and its project in one round trip.
+
+        Returns {"chapter": Chapter, "project": Project}, or None if either
+        is missing. With with_characters, the project's character briefs are
+        joined in the same query and returned under "characters".
+        """
+        if not ObjectId.is_valid(chapter_id):
+            return None
+
+        pipeline = [
+            {"$match": {"_id": ObjectId(chapter_id)}},
+
+            # Get parent project
+            {"$lookup": {
+                "from": "projects",
+                "localField": "project_id",
+                "foreignField": "_id",
+                "as": "project"
+            }},
+            {"$unwind": "$project"}
+        ]
+        if with_characters:
+            pipeline.append(_character_briefs_lookup("$project_id"))
+
+        result = await asyncio.to_thread(lambda: list(self.collection.aggregate(pipeline)))
+        if not result:
+            return None
+
+        doc = result[0]
+        project = doc.pop("project")
+        characters = doc.pop("characters", None)
+        context = {"chapter": Chapter(**doc), "project": Project(**project)}
+        if with_characters:
+            context["characters"] = characters
+        return context
+
     async def get_next_chapter_number(self, project_id: str) -> int:
         """Get the next available chapter number for a project."""
         pipeline = [
@@ -118,6 +211,66 @@ class SceneRepository(BaseRepository[Scene]):
             sort=[("scene_number", 1)]
         )
 
+    async def get_chapter_scene_cards(self, chapter_id: str) -> List[SceneCard]:
+        """Get lightweight scene cards for a chapter, ordered by scene number."""
+        return await self.list_cards(
+            SceneCard,
+            filter={"chapter_id": ObjectId(chapter_id)},
+            sort=[("scene_number", 1)]
+        )
+
+    async def get_scene_context(
+        self,
+        scene_id: str,
+        with_characters: bool = False
+    ) -> Optional[Dict[str, Any]]:
+        """Get a scene with its chapter and project in one round trip.
+
+        Returns {"scene": Scene, "chapter": Chapter, "project": Project}, or
+        None if any of them is missing. With with_characters, the project's
+        character briefs are joined in the same query and returned under
+        "characters".
+        """
+        if not ObjectId.is_valid(scene_id):
+            return None
+
+        pipeline = [
+            {"$match": {"_id": ObjectId(scene_id)}},
+
+            # Get parent chapter
+            {"$lookup": {
+                "from": "chapters",
+                "localField": "chapter_id",
+                "foreignField": "_id",
+                "as": "chapter"
+            }},
+            {"$unwind": "$chapter"},
+
+            # Get project through the chapter
+            {"$lookup": {
+                "from": "projects",
+                "localField": "chapter.project_id",
+                "foreignField": "_id",
+                "as": "project"
+            }},
+            {"$unwind": "$project"}
+        ]
+        if with_characters:
+            pipeline.append(_character_briefs_lookup("$chapter.project_id"))
+
+        result = await asyncio.to_thread(lambda: list(self.collection.aggregate(pipeline)))
+        if not result:
+            return None
+
+        doc = result[0]
+        chapter = doc.pop("chapter")
+        project = doc.pop("project")
+        characters = doc.pop("characters", None)
+        context = {"scene": Scene(**doc), "chapter": Chapter(**chapter), "project": Project(**project)}
+        if with_characters:
+            context["characters"] = characters
+        return context
+
     async def get_scene_with_panels(self, scene_id: str) -> Optional[dict]:
         """Get scene with all its panels and related data."""
         pipeline = [
@@ -1,10 +1,29 @@
-from typing import List, Optional, Dict, Any
+import asyncio
+from typing import List, Optional, Dict, Any, Union
 from bson import ObjectId
 from datetime import datetime, timezone
+from pymongo import UpdateMany, UpdateOne, WriteConcern
 
 from app.db.repositories.base import BaseRepository
 from app.models.models import Draft, DraftStatus
 
+# Drafts are regenerable, so their inserts only wait for the primary's ack
+# rather than the (majority) default write concern
+DRAFT_WRITE_CONCERN = WriteConcern(w=1)
+
+
+def _draft_document(draft: Draft) -> Dict[str, Any]:
+    """Dump a draft for insert, passing its content through as-is.
+
+    Content is agent output that is already plain data (from model_dump), and
+    exclude_none does not reach into it, so dumping it again would only copy
+    it. model_dump also keeps a pre-allocated _id as an ObjectId (dict() would
+    turn it into a string).
+    """
+    doc = draft.model_dump(by_alias=True, exclude_none=True, exclude={"content"})
+    doc["content"] = draft.content
+    return doc
+
 
 class DraftRepository(BaseRepository[Draft]):
     """Repository for draft operations"""
@@ -12,6 +31,72 @@ class DraftRepository(BaseRepository[Draft]):
     def __init__(self):
         super().__init__(Draft)
 
+    async def create_draft(self, draft: Draft) -> Draft:
+        """Create a draft acknowledged by the primary only."""
+        now = datetime.now(timezone.utc)
+        draft.created_at = now
+        draft.updated_at = now
+
+        doc = _draft_document(draft)
+        collection = self.collection.with_options(write_concern=DRAFT_WRITE_CONCERN)
+        result = await asyncio.to_thread(collection.insert_one, doc)
+        draft.id = result.inserted_id
+        return draft
+
+    async def create_drafts(self, drafts: List[Draft]) -> List[Draft]:
+        """Create drafts in a single insert_many, acknowledged by the primary only."""
+        if not drafts:
+            return []
+
+        now = datetime.now(timezone.utc)
+        docs = []
+        for draft in drafts:
+            if draft.id is None:
+                draft.id = ObjectId()
+            draft.created_at = now
+            draft.updated_at = now
+            docs.append(_draft_document(draft))
+
+        collection = self.collection.with_options(write_concern=DRAFT_WRITE_CONCERN)
+        await asyncio.to_thread(collection.insert_many, docs, ordered=False)
+        return drafts
+
+    async def get_pending_draft_summaries(self, project_id: str) -> List[Dict[str, Any]]:
+        """Get id, type and creation time of a project's pending drafts.
+
+        Draft content can be large, so only the summary fields are fetched
+        and returned as plain dicts.
+        """
+        cursor = self.collection.find(
+            {"project_id": ObjectId(project_id), "status": "pending"},
+            {"_id": 1, "type": 1, "created_at": 1}
+        ).sort("created_at", -1)
+        return await asyncio.to_thread(list, cursor)
+
+    async def push_feedback(self, draft_id: Union[str, ObjectId], entry: Dict[str, Any]) -> bool:
+        """Append a feedback entry to metadata.feedback atomically."""
+        result = await asyncio.to_thread(
+            self.collection.update_one,
+            {"_id": self._object_id(draft_id)},
+            {
+                "$push": {"metadata.feedback": entry},
+                "$set": {"updated_at": datetime.now(timezone.utc)}
+            }
+        )
+        return result.modified_count > 0
+
+    async def unlink_project(self, draft_id: Union[str, ObjectId], status: str) -> bool:
+        """Put a draft back to the given status and drop its project link."""
+        result = await asyncio.to_thread(
+            self.collection.update_one,
+            {"_id": self._object_id(draft_id)},
+            {
+                "$set": {"status": status, "updated_at": datetime.now(timezone.utc)},
+                "$unset": {"project_id": ""}
+            }
+        )
+        return result.modified_count > 0
+
     async def find_by_project(
         self,
         project_id: str,
@@ -87,39 +172,29 @@ class DraftRepository(BaseRepository[Draft]):
         if not draft:
             return False
 
-        # Determine entity type and ID
-        entity_type = None
-        entity_id = None
-
-        for field in ["scene_id", "panel_id", "chapter_id", "character_id"]:
-            if hasattr(draft, field) and getattr(draft, field):
-                entity_type = field.replace("_id", "")
-                entity_id = getattr(draft, field)
-                break
+        now = datetime.now(timezone.utc)
+        operations = [
+            UpdateOne(
+                {"_id": draft.id},
+                {"$set": {"status": "selected", "selected_at": now, "updated_at": now}}
+            )
+        ]
 
-        if entity_type and entity_id:
-            # Reject other drafts for the same entity
-            await self.collection.update_many(
+        if draft.entity_id:
+            # Reject other pending drafts for the same entity in the same batch
+            operations.append(UpdateMany(
                 {
-                    f"{entity_type}_id": entity_id,
-                    "draft_type": draft.draft_type,
-                    "_id": {"$ne": ObjectId(draft_id)},
-                    "status": DraftStatus.PENDING.value
+                    "entity_type": draft.entity_type,
+                    "entity_id": draft.entity_id,
+                    "type": draft.type,
+                    "_id": {"$ne": draft.id},
+                    "status": "pending"
                 },
-                {
-                    "$set": {
-                        "status": DraftStatus.REJECTED.value,
-                        "updated_at": datetime.now(timezone.utc)
-                    }
-                }
-            )
+                {"$set": {"status": "rejected", "updated_at": now}}
+            ))
 
-        # Select this draft
-        return await self.update_status(
-            draft_id,
-            DraftStatus.SELECTED,
-            datetime.now(timezone.utc)
-        )
+        result = await self.bulk_commit(operations)
+        return result.modified_count > 0
 
     async def get_selected_draft(
         self,
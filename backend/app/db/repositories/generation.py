@@ -1,16 +1,17 @@
 from typing import List, Optional, Dict, Any
+import asyncio
 from bson import ObjectId
 from datetime import datetime, timezone
 
 from app.db.repositories.base import BaseRepository
-from app.models.models import Generation, GenerationStatus
+from app.models.models import Generation, GenerationResult, GenerationStatus
 
 
 class GenerationRepository(BaseRepository[Generation]):
     """Repository for generation task operations"""
 
-    model = Generation
-    collection_name = "generations"
+    def __init__(self):
+        super().__init__(Generation)
 
     async def find_by_project(
         self,
@@ -70,13 +71,14 @@ class GenerationRepository(BaseRepository[Generation]):
         result_ids: Optional[List[str]] = None
     ) -> bool:
         """Update generation status"""
+        now = datetime.now(timezone.utc)
         update_data = {
-            "status": status.value,
-            "updated_at": datetime.now(timezone.utc)
+            "status": status,
+            "updated_at": now
         }
 
-        if status == GenerationStatus.COMPLETED:
-            update_data["completed_at"] = datetime.now(timezone.utc)
+        if status == "completed":
+            update_data["completed_at"] = now
 
         if error_message:
             update_data["error_message"] = error_message
@@ -84,7 +86,8 @@ class GenerationRepository(BaseRepository[Generation]):
         if result_ids:
             update_data["result_ids"] = result_ids
 
-        result = await self.collection.update_one(
+        result = await asyncio.to_thread(
+            self.collection.update_one,
             {"_id": ObjectId(generation_id)},
             {"$set": update_data}
         )
@@ -223,4 +226,32 @@ class GenerationRepository(BaseRepository[Generation]):
             }
         )
 
-        return result.modified_count > 0
\ No newline at end of file
+        return result.modified_count > 0
+
+
+class GenerationResultRepository(BaseRepository[GenerationResult]):
+    """Repository for generation text output.
+
+    Output is stored apart from the generation record so listing
+    generations never loads the (potentially large) generated text.
+    """
+
+    def __init__(self):
+        super().__init__(GenerationResult)
+
+    async def save_result(self, generation_id: str, content: str) -> None:
+        """Store the output for a generation, replacing any earlier result."""
+        now = datetime.now(timezone.utc)
+        await asyncio.to_thread(
+            self.collection.update_one,
+            {"generation_id": ObjectId(generation_id)},
+            {
+                "$set": {"content": content, "updated_at": now},
+                "$setOnInsert": {"created_at": now, "schema_version": "1.0.0"}
+            },
+            upsert=True
+        )
+
+    async def get_by_generation(self, generation_id: str) -> Optional[GenerationResult]:
+        """Get the stored output for a generation."""
+        return await self.get_by_field("generation_id", ObjectId(generation_id))
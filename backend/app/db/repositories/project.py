@@ -3,7 +3,7 @@
 from typing import Optional, List, Dict, Any
 from bson import ObjectId
 from app.db.repositories.base import BaseRepository
-from app.models import Project
+from app.models import Project, ProjectCard
 
 
 class ProjectRepository(BaseRepository[Project]):
@@ -21,6 +21,16 @@ class ProjectRepository(BaseRepository[Project]):
             sort=[("created_at", -1)]
         )
 
+    async def get_user_project_cards(self, user_id: str, skip: int = 0, limit: int = 20) -> List[ProjectCard]:
+        """Get lightweight project cards for a user's project list."""
+        return await self.list_cards(
+            ProjectCard,
+            filter={"user_id": ObjectId(user_id)},
+            skip=skip,
+            limit=limit,
+            sort=[("created_at", -1)]
+        )
+
     async def get_project_with_stats(self, project_id: str) -> Optional[dict]:
         """Get project with computed statistics."""
         pipeline = [
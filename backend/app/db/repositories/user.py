@@ -24,17 +24,20 @@ class UserRepository(BaseRepository[User]):
         """Get count of projects owned by user."""
         from app.db.database import get_collection
         projects = get_collection("projects")
-        return projects.count_documents({"owner_id": ObjectId(user_id)})
+        return projects.count_documents({"user_id": ObjectId(user_id)})
 
     async def get_user_with_stats(self, user_id: str) -> dict:
         """Get user with statistics using aggregation."""
         pipeline = [
             {"$match": {"_id": ObjectId(user_id)}},
-            # Lookup projects
+            # Lookup projects (status only, backed by the user_id index)
             {"$lookup": {
                 "from": "projects",
-                "localField": "_id",
-                "foreignField": "owner_id",
+                "let": {"user_id": "$_id"},
+                "pipeline": [
+                    {"$match": {"$expr": {"$eq": ["$user_id", "$$user_id"]}}},
+                    {"$project": {"status": 1}}
+                ],
                 "as": "projects"
             }},
             # Add project count
@@ -2,11 +2,13 @@
 
 from contextlib import asynccontextmanager
 from fastapi import FastAPI
+from fastapi.responses import ORJSONResponse
 from fastapi.middleware.cors import CORSMiddleware
 import logging
 
 from app.core.config import settings
 from app.db.database import MongoDB
+from app.services.ai.openai_client import warm_openai_client, close_openai_client
 
 # Configure logging
 logging.basicConfig(
@@ -23,6 +25,7 @@ async def lifespan(app: FastAPI):
     logger.info("Starting up Keeda backend...")
     MongoDB.connect()
     logger.info("Database connected")
+    await warm_openai_client()
 
     yield
 
@@ -30,11 +33,13 @@ async def lifespan(app: FastAPI):
     logger.info("Shutting down Keeda backend...")
     MongoDB.disconnect()
     logger.info("Database disconnected")
+    await close_openai_client()
 
 
 app = FastAPI(
     title=settings.PROJECT_NAME,
     openapi_url=f"{settings.API_V1_STR}/openapi.json",
+    default_response_class=ORJSONResponse,
     lifespan=lifespan
 )
 
@@ -13,7 +13,12 @@ from app.models.models import (
     Location,
     Draft,
     Generation,
+    GenerationResult,
     ProjectInstruction,
+    # List projections
+    ProjectCard,
+    ChapterCard,
+    SceneCard,
     # Enums
     ProjectStatus,
     ChapterStatus,
@@ -41,8 +46,14 @@ __all__ = [
     "Location",
     "Draft",
     "Generation",
+    "GenerationResult",
     "ProjectInstruction",
 
+    # List projections
+    "ProjectCard",
+    "ChapterCard",
+    "SceneCard",
+
     # Enums
     "ProjectStatus",
     "ChapterStatus",
@@ -1,8 +1,9 @@
 """Base models for database entities."""
 
-from datetime import datetime
-from typing import Optional, Any
-from pydantic import BaseModel, Field
+from datetime import datetime, timezone
+from typing import Optional, Any, Dict
+from pydantic import BaseModel, ConfigDict, Field
+from pydantic_core import core_schema
 from bson import ObjectId
 
 
@@ -10,8 +11,20 @@ class PyObjectId(ObjectId):
     """Custom ObjectId field for Pydantic models."""
 
     @classmethod
-    def __get_validators__(cls):
-        yield cls.validate
+    def __get_pydantic_core_schema__(cls, source_type: Any, handler: Any) -> core_schema.CoreSchema:
+        # ObjectId instances pass through untouched; anything else is parsed.
+        # In JSON mode the value is serialized straight to its hex string.
+        return core_schema.union_schema(
+            [
+                core_schema.is_instance_schema(ObjectId),
+                core_schema.no_info_plain_validator_function(cls.validate),
+            ],
+            serialization=core_schema.plain_serializer_function_ser_schema(
+                str,
+                return_schema=core_schema.str_schema(),
+                when_used="json",
+            ),
+        )
 
     @classmethod
     def validate(cls, v, field=None):
@@ -20,32 +33,30 @@ class PyObjectId(ObjectId):
         return ObjectId(v)
 
     @classmethod
-    def __get_pydantic_json_schema__(cls, field_schema: Any) -> None:
-        field_schema.update(type="string")
+    def __get_pydantic_json_schema__(cls, core_schema: Any, handler: Any) -> Dict[str, Any]:
+        return {"type": "string"}
 
 
 class BaseDocument(BaseModel):
     """Base model for all database documents."""
 
+    model_config = ConfigDict(
+        populate_by_name=True,
+        arbitrary_types_allowed=True,
+        ser_json_timedelta="iso8601",
+    )
+
     id: Optional[PyObjectId] = Field(default=None, alias="_id")
-    created_at: datetime = Field(default_factory=datetime.utcnow)
-    updated_at: datetime = Field(default_factory=datetime.utcnow)
+    created_at: datetime = Field(default_factory=lambda: datetime.now(timezone.utc))
+    updated_at: datetime = Field(default_factory=lambda: datetime.now(timezone.utc))
     schema_version: str = Field(default="1.0.0")
 
-    class Config:
-        populate_by_name = True
-        arbitrary_types_allowed = True
-        json_encoders = {
-            ObjectId: str,
-            datetime: lambda v: v.isoformat()
-        }
-
     def dict(self, **kwargs):
         """Override dict to handle MongoDB ID field."""
         exclude_unset = kwargs.pop('exclude_unset', False)
         by_alias = kwargs.pop('by_alias', True)
 
-        d = super().dict(
+        d = super().model_dump(
             exclude_unset=exclude_unset,
             by_alias=by_alias,
             **kwargs
@@ -59,4 +70,5 @@ class BaseDocument(BaseModel):
 
     def model_dump_json(self, **kwargs):
         """Dump model to JSON with proper ObjectId handling."""
-        return super().model_dump_json(by_alias=True, **kwargs)
\ No newline at end of file
+        kwargs.setdefault("by_alias", True)
+        return super().model_dump_json(**kwargs)
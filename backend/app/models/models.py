@@ -2,7 +2,8 @@
 
 from typing import Optional, List, Dict, Any, Literal
 from datetime import datetime
-from pydantic import Field
+from pydantic import BaseModel, ConfigDict, Field
+from pymongo import ASCENDING, DESCENDING, IndexModel
 from app.models.base import BaseDocument, PyObjectId
 from app.schemas.schemas import ProjectGenerationSettings
 
@@ -28,7 +29,7 @@ class User(BaseDocument):
     class Config:
         collection_name = "users"
         indexes = [
-            {"fields": ["username"], "unique": True}
+            IndexModel([("username", ASCENDING)], unique=True)
         ]
 
 
@@ -56,10 +57,19 @@ class Project(BaseDocument):
 
     class Config:
         collection_name = "projects"
+        list_projection = {"_id": 1, "title": 1, "status": 1, "created_at": 1}
         indexes = [
-            {"fields": ["user_id"]},
-            {"fields": ["status"]},
-            {"fields": ["created_at", "-1"]}
+            IndexModel([("user_id", ASCENDING)]),
+            IndexModel([("status", ASCENDING)]),
+            IndexModel([("created_at", DESCENDING)]),
+            # Covers list_projection for a user's project cards
+            IndexModel([
+                ("user_id", ASCENDING),
+                ("created_at", DESCENDING),
+                ("status", ASCENDING),
+                ("title", ASCENDING),
+                ("_id", ASCENDING)
+            ])
         ]
 
 
@@ -79,10 +89,20 @@ class Chapter(BaseDocument):
 
     class Config:
         collection_name = "chapters"
+        list_projection = {"_id": 1, "chapter_number": 1, "title": 1, "status": 1, "created_at": 1}
         indexes = [
-            {"fields": ["project_id"]},
-            {"fields": ["project_id", "chapter_number"], "unique": True},
-            {"fields": ["created_at", "-1"]}
+            IndexModel([("project_id", ASCENDING)]),
+            IndexModel([("project_id", ASCENDING), ("chapter_number", ASCENDING)], unique=True),
+            IndexModel([("created_at", DESCENDING)]),
+            # Covers list_projection for a project's chapter cards
+            IndexModel([
+                ("project_id", ASCENDING),
+                ("chapter_number", ASCENDING),
+                ("title", ASCENDING),
+                ("status", ASCENDING),
+                ("created_at", ASCENDING),
+                ("_id", ASCENDING)
+            ])
         ]
 
 
@@ -103,11 +123,20 @@ class Scene(BaseDocument):
 
     class Config:
         collection_name = "scenes"
+        list_projection = {"_id": 1, "scene_number": 1, "title": 1, "created_at": 1}
         indexes = [
-            {"fields": ["project_id"]},
-            {"fields": ["chapter_id"]},
-            {"fields": ["chapter_id", "scene_number"], "unique": True},
-            {"fields": ["created_at", "-1"]}
+            IndexModel([("project_id", ASCENDING)]),
+            IndexModel([("chapter_id", ASCENDING)]),
+            IndexModel([("chapter_id", ASCENDING), ("scene_number", ASCENDING)], unique=True),
+            IndexModel([("created_at", DESCENDING)]),
+            # Covers list_projection for a chapter's scene cards
+            IndexModel([
+                ("chapter_id", ASCENDING),
+                ("scene_number", ASCENDING),
+                ("title", ASCENDING),
+                ("created_at", ASCENDING),
+                ("_id", ASCENDING)
+            ])
         ]
 
 
@@ -133,10 +162,10 @@ class Panel(BaseDocument):
     class Config:
         collection_name = "panels"
         indexes = [
-            {"fields": ["project_id"]},
-            {"fields": ["scene_id"]},
-            {"fields": ["scene_id", "panel_number"], "unique": True},
-            {"fields": ["created_at", "-1"]}
+            IndexModel([("project_id", ASCENDING)]),
+            IndexModel([("scene_id", ASCENDING)]),
+            IndexModel([("scene_id", ASCENDING), ("panel_number", ASCENDING)], unique=True),
+            IndexModel([("created_at", DESCENDING)])
         ]
 
 
@@ -174,10 +203,10 @@ class Image(BaseDocument):
     class Config:
         collection_name = "images"
         indexes = [
-            {"fields": ["project_id"]},
-            {"fields": ["panel_id"]},
-            {"fields": ["status"]},
-            {"fields": ["created_at", "-1"]}
+            IndexModel([("project_id", ASCENDING)]),
+            IndexModel([("panel_id", ASCENDING)]),
+            IndexModel([("status", ASCENDING)]),
+            IndexModel([("created_at", DESCENDING)])
         ]
 
 
@@ -196,8 +225,9 @@ class Character(BaseDocument):
     class Config:
         collection_name = "characters"
         indexes = [
-            {"fields": ["project_id"]},
-            {"fields": ["project_id", "name"], "unique": True}
+            # Serves project_id lookups and the newest-first brief listing
+            IndexModel([("project_id", ASCENDING), ("created_at", DESCENDING)]),
+            IndexModel([("project_id", ASCENDING), ("name", ASCENDING)], unique=True)
         ]
 
 
@@ -214,8 +244,8 @@ class Location(BaseDocument):
     class Config:
         collection_name = "locations"
         indexes = [
-            {"fields": ["project_id"]},
-            {"fields": ["project_id", "name"], "unique": True}
+            IndexModel([("project_id", ASCENDING)]),
+            IndexModel([("project_id", ASCENDING), ("name", ASCENDING)], unique=True)
         ]
 
 
@@ -243,10 +273,11 @@ class Draft(BaseDocument):
     class Config:
         collection_name = "drafts"
         indexes = [
-            {"fields": ["project_id"]},
-            {"fields": ["entity_type", "entity_id"]},
-            {"fields": ["status"]},
-            {"fields": ["created_at", "-1"]}
+            # Serves project_id lookups and the newest-first pending draft listing
+            IndexModel([("project_id", ASCENDING), ("status", ASCENDING), ("created_at", DESCENDING)]),
+            IndexModel([("entity_type", ASCENDING), ("entity_id", ASCENDING)]),
+            IndexModel([("status", ASCENDING)]),
+            IndexModel([("created_at", DESCENDING)])
         ]
 
 
@@ -271,9 +302,8 @@ class Generation(BaseDocument):
     model: Optional[str] = None
     parameters: Dict[str, Any] = Field(default_factory=dict)
 
-    # Results
+    # Results (text output is stored separately in GenerationResult)
     result_id: Optional[PyObjectId] = None
-    result_content: Optional[str] = None
 
     # Timing
     started_at: Optional[datetime] = None
@@ -286,10 +316,26 @@ class Generation(BaseDocument):
     class Config:
         collection_name = "generations"
         indexes = [
-            {"fields": ["project_id"]},
-            {"fields": ["user_id"]},
-            {"fields": ["status"]},
-            {"fields": ["created_at", "-1"]}
+            IndexModel([("project_id", ASCENDING)]),
+            IndexModel([("user_id", ASCENDING)]),
+            IndexModel([("status", ASCENDING)]),
+            IndexModel([("created_at", DESCENDING)])
+        ]
+
+
+class GenerationResult(BaseDocument):
+    """Text output of a generation, kept out of the generations collection."""
+
+    # Database references
+    generation_id: PyObjectId = Field(..., description="Parent generation ID")
+
+    # Content
+    content: str = Field(..., description="Generated text")
+
+    class Config:
+        collection_name = "generation_results"
+        indexes = [
+            IndexModel([("generation_id", ASCENDING)], unique=True)
         ]
 
 
@@ -311,8 +357,55 @@ class ProjectInstruction(BaseDocument):
     class Config:
         collection_name = "project_instructions"
         indexes = [
-            {"fields": ["project_id"]},
-            {"fields": ["level"]},
-            {"fields": ["entity_id"]},
-            {"fields": ["priority", "-1"]}
-        ]
\ No newline at end of file
+            IndexModel([("project_id", ASCENDING)]),
+            IndexModel([("level", ASCENDING)]),
+            IndexModel([("entity_id", ASCENDING)]),
+            IndexModel([("priority", DESCENDING)])
+        ]
+
+
+# List Projections
+class ProjectCard(BaseModel):
+    """Lightweight project view for list endpoints."""
+
+    model_config = ConfigDict(populate_by_name=True, arbitrary_types_allowed=True)
+
+    id: PyObjectId = Field(..., alias="_id")
+    title: str
+    status: ProjectStatus
+    created_at: datetime
+
+
+class ChapterCard(BaseModel):
+    """Lightweight chapter view for list endpoints."""
+
+    model_config = ConfigDict(populate_by_name=True, arbitrary_types_allowed=True)
+
+    id: PyObjectId = Field(..., alias="_id")
+    chapter_number: int
+    title: str
+    status: ChapterStatus
+    created_at: datetime
+
+
+class SceneCard(BaseModel):
+    """Lightweight scene view for list endpoints."""
+
+    model_config = ConfigDict(populate_by_name=True, arbitrary_types_allowed=True)
+
+    id: PyObjectId = Field(..., alias="_id")
+    scene_number: int
+    title: str
+    created_at: datetime
+
+
+# Build the core and JSON schemas once at import time so the first request
+# against each model does not pay for lazy schema generation.
+for _model in (
+    User, Project, Chapter, Scene, Panel, Image,
+    Character, Location, Draft, Generation, GenerationResult,
+    ProjectInstruction, ProjectCard, ChapterCard, SceneCard
+):
+    _model.__pydantic_core_schema__
+    _model.model_json_schema()
+del _model
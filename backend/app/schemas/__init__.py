@@ -14,6 +14,7 @@ from app.schemas.schemas import (
 
     # Detail enhancement schemas
     CharacterProfile,
+    CharacterProfileList,
     SceneSummary,
     ImagePrompt,
 )
@@ -29,6 +30,7 @@ __all__ = [
     "PanelList",
     "PanelListItem",
     "CharacterProfile",
+    "CharacterProfileList",
     "SceneSummary",
     "ImagePrompt",
 ]
\ No newline at end of file
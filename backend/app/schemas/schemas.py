@@ -2,10 +2,11 @@
 
 Minimal schemas with essential fields only.
 Rich information is stored in text fields like summary/description.
+Agent output schemas are frozen since they are only read after parsing.
 """
 
 from typing import List, Optional, Dict, Union
-from pydantic import BaseModel
+from pydantic import BaseModel, ConfigDict
 from enum import Enum
 
 
@@ -15,6 +16,8 @@ from enum import Enum
 
 class ProjectSummary(BaseModel):
     """Output from ProjectSummaryAgent"""
+    model_config = ConfigDict(frozen=True)
+
     title: str
     genre: str
     description: str  # Rich text containing themes, story, etc.
@@ -22,6 +25,8 @@ class ProjectSummary(BaseModel):
 
 class CharacterListItem(BaseModel):
     """Single character in list"""
+    model_config = ConfigDict(frozen=True)
+
     name: str
     role: str  # protagonist, antagonist, supporting
     description: str  # Rich text with brief, relationships, etc.
@@ -29,11 +34,15 @@ class CharacterListItem(BaseModel):
 
 class CharacterList(BaseModel):
     """Output from CharacterListAgent"""
+    model_config = ConfigDict(frozen=True)
+
     characters: List[CharacterListItem]
 
 
 class ChapterListItem(BaseModel):
     """Single chapter in list"""
+    model_config = ConfigDict(frozen=True)
+
     number: int
     title: str
     summary: str  # Rich text with events, plot points, etc.
@@ -41,11 +50,15 @@ class ChapterListItem(BaseModel):
 
 class ChapterList(BaseModel):
     """Output from ChapterListAgent"""
+    model_config = ConfigDict(frozen=True)
+
     chapters: List[ChapterListItem]
 
 
 class SceneListItem(BaseModel):
     """Single scene in list"""
+    model_config = ConfigDict(frozen=True)
+
     number: int
     title: str
     description: str  # Rich text with setting, mood, events, etc.
@@ -53,11 +66,15 @@ class SceneListItem(BaseModel):
 
 class SceneList(BaseModel):
     """Output from SceneListAgent"""
+    model_config = ConfigDict(frozen=True)
+
     scenes: List[SceneListItem]
 
 
 class PanelListItem(BaseModel):
     """Single panel in list"""
+    model_config = ConfigDict(frozen=True)
+
     number: int
     shot_type: str  # close_up, medium, wide, establishing
     description: str  # Rich text with visuals, action, etc.
@@ -67,6 +84,8 @@ class PanelListItem(BaseModel):
 
 class PanelList(BaseModel):
     """Output from PanelListAgent"""
+    model_config = ConfigDict(frozen=True)
+
     panels: List[PanelListItem]
 
 
@@ -76,17 +95,30 @@ class PanelList(BaseModel):
 
 class CharacterProfile(BaseModel):
     """Output from CharacterProfileAgent"""
+    model_config = ConfigDict(frozen=True)
+
     name: str
     biography: str  # Rich text with full character details
 
 
+class CharacterProfileList(BaseModel):
+    """Output from MultiCharacterProfileAgent"""
+    model_config = ConfigDict(frozen=True)
+
+    profiles: List[CharacterProfile]
+
+
 class SceneSummary(BaseModel):
     """Output from SceneSummaryAgent"""
+    model_config = ConfigDict(frozen=True)
+
     summary: str  # Rich text with all scene details
 
 
 class ImagePrompt(BaseModel):
     """Output from VisualPromptAgent"""
+    model_config = ConfigDict(frozen=True)
+
     prompt: str  # Complete prompt for image generation
     negative_prompt: Optional[str] = None
 
@@ -131,6 +163,6 @@ class ProjectGenerationSettings(BaseModel):
 
     def get_mode(self, agent_type: Union[str, AgentType]) -> GenerationMode:
         """Get generation mode for specific agent type."""
-        # Handle both string and AgentType enum
-        key = agent_type.value if hasattr(agent_type, 'value') else agent_type
-        return self.agent_modes.get(key, GenerationMode.REVIEW)
\ No newline at end of file
+        # AgentType is a str enum, so members hash and compare equal to their
+        # values and both forms look up the same key without conversion
+        return self.agent_modes.get(agent_type, GenerationMode.REVIEW)
\ No newline at end of file
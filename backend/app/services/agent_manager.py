@@ -1,10 +1,21 @@
 """Agent Manager for orchestrating LLM agents with generation modes."""
 
-from typing import List, Optional, Dict, Any
+import asyncio
+import functools
+import logging
+import re
+from typing import List, Optional, Dict, Any, NamedTuple, Tuple
 from bson import ObjectId
 from datetime import datetime, timezone
 
-from app.services.llm_agents.base import AgentContext
+from app.services.llm_agents.base import (
+    AgentContext,
+    BaseAgent,
+    DocumentView,
+    format_character_briefs,
+    format_character_names
+)
+from app.core.config import settings as app_settings
 from app.core.observability import trace_method
 from app.services.llm_agents.project_summary import ProjectSummaryAgent
 from app.services.llm_agents.character_list import CharacterListAgent
@@ -28,37 +39,103 @@ from app.models import (
     Project, Character, Chapter, Scene, Panel, Draft
 )
 
+logger = logging.getLogger(__name__)
 
-def parse_user_instructions(instructions: str) -> ProjectGenerationSettings:
-    """Parse user instructions to create generation settings."""
-    settings = ProjectGenerationSettings(user_instructions=instructions)
+UTC = timezone.utc
+
+# Bounds concurrent LLM calls across all managers, so fanned-out generation
+# does not run into provider rate limits
+_LLM_SEMAPHORE = asyncio.Semaphore(app_settings.LLM_MAX_CONCURRENCY)
+
+# Context keys exposed to agents for each loaded document
+PROJECT_SUMMARY_FIELDS = {"title": "title", "genre": "genre", "description": "description"}
+CHAPTER_FIELDS = {"number": "chapter_number", "title": "title", "summary": "summary"}
+SCENE_FIELDS = {"number": "scene_number", "title": "title", "description": "description"}
+
+_AGENT_TYPE_VALUES = tuple(agent_type.value for agent_type in AgentType)
+
+# Mode indicators in user instructions. "auto generate chapters" comes before
+# "auto" so the longer phrase wins where they overlap.
+_INSTRUCTION_RE = re.compile(
+    r"(?P<review_characters>review characters)"
+    r"|(?P<auto_chapters>auto generate chapters)"
+    r"|(?P<review_panels>review panels)"
+    r"|(?P<direct>auto|direct)",
+    re.IGNORECASE
+)
+
+
+@functools.lru_cache(maxsize=1024)
+def _parse_agent_modes(instructions: str) -> Tuple[Tuple[str, GenerationMode], ...]:
+    """Parse per-agent generation modes from user instructions (cached)."""
     modes = {}
 
     # Default mode is review
     default_mode = GenerationMode.REVIEW
 
-    # Check for mode indicators in instructions
-    instructions_lower = instructions.lower()
+    # Single pass over the instructions for all mode indicators
+    for match in _INSTRUCTION_RE.finditer(instructions):
+        rule = match.lastgroup
+        if rule == "review_characters":
+            modes[AgentType.CHARACTER_LIST.value] = GenerationMode.REVIEW
+            modes[AgentType.CHARACTER_PROFILE.value] = GenerationMode.REVIEW
+        elif rule == "auto_chapters":
+            modes[AgentType.CHAPTER_LIST.value] = GenerationMode.DIRECT
+            # Also an "auto" indicator for the default mode
+            default_mode = GenerationMode.DIRECT
+        elif rule == "review_panels":
+            modes[AgentType.PANEL_LIST.value] = GenerationMode.REVIEW
+        elif rule == "direct":
+            default_mode = GenerationMode.DIRECT
 
-    if "auto" in instructions_lower or "direct" in instructions_lower:
-        default_mode = GenerationMode.DIRECT
+    # Set defaults for all agent types
+    for agent_type in _AGENT_TYPE_VALUES:
+        if agent_type not in modes:
+            modes[agent_type] = default_mode
 
-    # Specific agent mode overrides
-    if "review characters" in instructions_lower:
-        modes[AgentType.CHARACTER_LIST.value] = GenerationMode.REVIEW
-        modes[AgentType.CHARACTER_PROFILE.value] = GenerationMode.REVIEW
-    if "auto generate chapters" in instructions_lower:
-        modes[AgentType.CHAPTER_LIST.value] = GenerationMode.DIRECT
-    if "review panels" in instructions_lower:
-        modes[AgentType.PANEL_LIST.value] = GenerationMode.REVIEW
+    # Immutable so the cached value cannot be changed by callers
+    return tuple(modes.items())
 
-    # Set defaults for all agent types
-    for agent_type in AgentType:
-        if agent_type.value not in modes:
-            modes[agent_type.value] = default_mode
 
-    settings.agent_modes = modes
-    return settings
+def parse_user_instructions(instructions: str) -> ProjectGenerationSettings:
+    """Parse user instructions to create generation settings."""
+    # Settings are mutable, so a fresh instance is built around the cached modes
+    return ProjectGenerationSettings(
+        user_instructions=instructions,
+        agent_modes=dict(_parse_agent_modes(instructions))
+    )
+
+
+class Repositories(NamedTuple):
+    """Repositories used by AgentManager, bound to one database."""
+    project: ProjectRepository
+    character: CharacterRepository
+    chapter: ChapterRepository
+    scene: SceneRepository
+    panel: PanelRepository
+    draft: DraftRepository
+
+
+@functools.lru_cache(maxsize=8)
+def get_repositories(db) -> Repositories:
+    """Get repositories bound to db, building them (and its indexes) once."""
+    repositories = Repositories(
+        project=ProjectRepository(),
+        character=CharacterRepository(),
+        chapter=ChapterRepository(),
+        scene=SceneRepository(),
+        panel=PanelRepository(),
+        draft=DraftRepository()
+    )
+
+    # Bind repositories to this database, ensuring its indexes
+    repositories.project.bind(db.projects)
+    repositories.character.bind(db.characters)
+    repositories.chapter.bind(db.chapters)
+    repositories.scene.bind(db.scenes)
+    repositories.panel.bind(db.panels)
+    repositories.draft.bind(db.drafts)
+    return repositories
 
 
 class AgentManager:
@@ -68,21 +145,156 @@ class AgentManager:
         """Initialize with database connection."""
         self.db = db
 
-        # Initialize repositories
-        self.project_repo = ProjectRepository()
-        self.character_repo = CharacterRepository()
-        self.chapter_repo = ChapterRepository()
-        self.scene_repo = SceneRepository()
-        self.panel_repo = PanelRepository()
-        self.draft_repo = DraftRepository()
-
-        # Set database collections directly
-        self.project_repo._collection = db.projects
-        self.character_repo._collection = db.characters
-        self.chapter_repo._collection = db.chapters
-        self.scene_repo._collection = db.scenes
-        self.panel_repo._collection = db.panels
-        self.draft_repo._collection = db.drafts
+        # Repositories are shared by every manager on the same database
+        (
+            self.project_repo,
+            self.character_repo,
+            self.chapter_repo,
+            self.scene_repo,
+            self.panel_repo,
+            self.draft_repo
+        ) = get_repositories(db)
+
+        # Character brief fetches per project, reused across generate_* calls
+        self._character_cache: Dict[str, asyncio.Future] = {}
+        # Formatted character_list context entries, per project
+        self._character_payloads: Dict[str, Dict[str, Any]] = {}
+
+        # In-flight background draft inserts, keyed by draft id
+        self._bg_tasks: Dict[str, asyncio.Task] = {}
+        # Drafts waiting for the next batched insert, and the task doing it
+        self._pending_drafts: List[Draft] = []
+        self._draft_flush: Optional[asyncio.Task] = None
+
+    async def _execute_agent(self, agent: BaseAgent, reuse: bool = True):
+        """Execute an agent, reusing a cached output for an identical prompt.
+
+        Workflow outputs are drafts the user reviews, so an identical prompt
+        may return the earlier draft even though the call is sampled. Pass
+        reuse=False when a fresh output is the point, as in regeneration.
+        """
+        agent.parameters.cache_sampled = reuse
+        async with _LLM_SEMAPHORE:
+            return await agent.execute()
+
+    async def _get_characters(self, project_id: str) -> List[Dict[str, Any]]:
+        """Get a project's character briefs, fetching them at most once.
+
+        The fetch itself is cached, so concurrent callers share one query and
+        a fetch that was in flight when the entry was invalidated cannot
+        write its stale result back. A fetch that fails or finds no
+        characters is dropped once done, so the next caller queries again.
+        """
+        future = self._character_cache.get(project_id)
+        if future is None:
+            future = asyncio.ensure_future(
+                self.character_repo.get_project_character_briefs(project_id)
+            )
+            self._character_cache[project_id] = future
+
+            def _evict_unusable(done: asyncio.Future) -> None:
+                if self._character_cache.get(project_id) is not done:
+                    return
+                if done.cancelled() or done.exception() is not None or not done.result():
+                    del self._character_cache[project_id]
+
+            future.add_done_callback(_evict_unusable)
+        # Shielded so one cancelled caller does not cancel the shared fetch
+        return await asyncio.shield(future)
+
+    def _seed_characters(self, project_id: str, characters: List[Dict[str, Any]]) -> None:
+        """Cache character briefs loaded by another query, unless already cached."""
+        if characters and project_id not in self._character_cache:
+            future = asyncio.get_running_loop().create_future()
+            future.set_result(characters)
+            self._character_cache[project_id] = future
+
+    def _invalidate_characters(self, project_id: str) -> None:
+        """Drop a project's cached character briefs after its characters change."""
+        self._character_cache.pop(project_id, None)
+        self._character_payloads.pop(project_id, None)
+
+    def _character_list_payload(
+        self,
+        project_id: str,
+        characters: List[Dict[str, Any]]
+    ) -> Dict[str, Any]:
+        """Build the character_list context entry from character briefs.
+
+        The repository already projects briefs to name, role and description,
+        so they are passed through as-is rather than copied. The formatted
+        text the agents put in their prompts is computed once per cached
+        briefs list and reused by every agent call for the project.
+        """
+        cached = self._character_payloads.get(project_id)
+        if cached is not None and cached["characters"] is characters:
+            return cached
+
+        payload = {
+            "characters": characters,
+            "character_text": format_character_briefs(characters),
+            "character_names": format_character_names(characters)
+        }
+        self._character_payloads[project_id] = payload
+        return payload
+
+    def _spawn_draft(
+        self,
+        draft_type: str,
+        content: Dict[str, Any],
+        project_id: Optional[ObjectId] = None,
+        entity_id: Optional[ObjectId] = None,
+        metadata: Optional[Dict[str, Any]] = None
+    ) -> ObjectId:
+        """Save agent output as a pending draft without waiting for the insert.
+
+        The id is allocated up front so it can be returned immediately; the
+        insert runs as a background task tracked until it completes. Drafts
+        spawned before that task starts, as when fanned-out generations
+        finish together, share its single insert_many.
+        """
+        draft = Draft(
+            id=ObjectId(),
+            project_id=project_id,
+            entity_type=draft_type,
+            entity_id=entity_id,
+            type=draft_type,
+            content=content,
+            metadata=metadata or {},
+            status="pending"
+        )
+        draft_id = str(draft.id)
+
+        self._pending_drafts.append(draft)
+        if self._draft_flush is None:
+            self._draft_flush = asyncio.create_task(self._save_drafts())
+        task = self._draft_flush
+        self._bg_tasks[draft_id] = task
+        task.add_done_callback(functools.partial(self._on_draft_saved, draft_id))
+        return draft.id
+
+    async def _save_drafts(self) -> List[Draft]:
+        """Insert all drafts spawned since the last batch."""
+        drafts, self._pending_drafts = self._pending_drafts, []
+        self._draft_flush = None
+        return await self.draft_repo.create_drafts(drafts)
+
+    def _on_draft_saved(self, draft_id: str, task: asyncio.Task) -> None:
+        """Drop a finished draft insert and log it if it failed."""
+        self._bg_tasks.pop(draft_id, None)
+        if not task.cancelled() and task.exception() is not None:
+            logger.error(f"Failed to save draft {draft_id}: {task.exception()}")
+
+    async def _wait_for_draft(self, draft_id: str) -> None:
+        """Wait for a draft's background insert if it is still in flight."""
+        task = self._bg_tasks.get(draft_id)
+        if task is not None:
+            await asyncio.shield(task)
+
+    async def drain(self) -> None:
+        """Wait for all background draft inserts, e.g. before shutdown."""
+        if self._bg_tasks:
+            await asyncio.gather(*set(self._bg_tasks.values()), return_exceptions=True)
 
     @trace_method("workflow")
     async def generate_project_summary(
@@ -98,7 +310,7 @@ class AgentManager:
         generation_mode = mode or settings.get_mode(AgentType.PROJECT_SUMMARY)
 
         # Create context
-        context = AgentContext(
+        context = AgentContext.model_construct(
             project_id="",
             user_id=user_id,
             data={"user_input": user_input}
@@ -106,7 +318,8 @@ class AgentManager:
 
         # Execute agent
         agent = ProjectSummaryAgent(context)
-        summary = await agent.execute()
+        summary = await self._execute_agent(agent)
+        payload = summary.model_dump()
 
         if generation_mode == GenerationMode.DIRECT:
             # Save directly to database
@@ -124,35 +337,31 @@ class AgentManager:
             return {
                 "mode": "direct",
                 "project_id": str(created_project.id),
-                "data": summary.dict()
+                "data": payload
             }
         else:
-            # Save to drafts for review
-            draft = Draft(
-                project_id=None,  # No project yet
-                entity_type="project_summary",
-                entity_id=None,
-                type="project_summary",
-                content=summary.dict(),
+            # Save to drafts for review (no project yet)
+            draft_id = self._spawn_draft(
+                "project_summary",
+                payload,
                 metadata={
                     "user_id": user_id,
                     "user_input": user_input,
                     "user_instructions": user_instructions
-                },
-                status="pending"
+                }
             )
-            created_draft = await self.draft_repo.create(draft)
 
             return {
                 "mode": "review",
-                "draft_id": str(created_draft.id),
-                "data": summary.dict(),
+                "draft_id": str(draft_id),
+                "data": payload,
                 "message": "Project summary generated. Please review and approve."
             }
 
     @trace_method("workflow")
     async def approve_project_draft(self, draft_id: str) -> str:
         """Approve a project draft and create the project."""
+        await self._wait_for_draft(draft_id)
         draft = await self.draft_repo.get(draft_id)
         if not draft or draft.type != "project_summary":
             raise ValueError(f"Invalid project draft: {draft_id}")
@@ -162,6 +371,7 @@ class AgentManager:
         metadata = draft.metadata
 
         project = Project(
+            id=ObjectId(),
             user_id=ObjectId(metadata["user_id"]),
             title=content["title"],
             genre=content["genre"],
@@ -170,13 +380,32 @@ class AgentManager:
             generation_settings=parse_user_instructions(metadata.get("user_instructions", "")),
             status="draft"
         )
-        created_project = await self.project_repo.create(project)
 
-        # Update draft status
-        await self.draft_repo.update(draft_id, {
-            "status": "selected",
-            "project_id": created_project.id
-        })
+        # The project id is allocated up front, so the draft can be linked to
+        # it while the project is being inserted
+        created_project, linked_draft = await asyncio.gather(
+            self.project_repo.create(project),
+            self.draft_repo.update(draft_id, {
+                "status": "selected",
+                "project_id": project.id
+            }),
+            return_exceptions=True
+        )
+
+        project_failed = isinstance(created_project, BaseException)
+        link_failed = isinstance(linked_draft, BaseException) or linked_draft is None
+        if project_failed or link_failed:
+            # Undo whichever write went through, so the draft can be approved again
+            if not project_failed:
+                await self.project_repo.delete(project.id)
+            if not link_failed:
+                await self.draft_repo.unlink_project(draft_id, draft.status)
+
+            if project_failed:
+                raise created_project
+            if isinstance(linked_draft, BaseException):
+                raise linked_draft
+            raise ValueError(f"Invalid project draft: {draft_id}")
 
         return str(created_project.id)
 
@@ -200,59 +429,54 @@ class AgentManager:
         generation_mode = mode or settings.get_mode(AgentType.CHARACTER_LIST)
 
         # Create context
-        context = AgentContext(
+        context = AgentContext.model_construct(
             project_id=project_id,
             user_id=str(project.user_id),
             data={
                 "user_input": project.user_input,
-                "project_summary": {
-                    "title": project.title,
-                    "genre": project.genre,
-                    "description": project.description
-                },
+                "project_summary": DocumentView(project, PROJECT_SUMMARY_FIELDS),
                 "num_characters": num_characters
             }
         )
 
         # Execute agent
         agent = CharacterListAgent(context)
-        character_list = await agent.execute()
+        character_list = await self._execute_agent(agent)
+        payload = character_list.model_dump()
 
         if generation_mode == GenerationMode.DIRECT:
             # Save characters directly
-            character_ids = []
-            for char_data in character_list.characters:
-                character = Character(
-                    project_id=ObjectId(project_id),
+            characters = [
+                Character(
+                    project_id=project.id,
                     name=char_data.name,
                     role=char_data.role,
                     description=char_data.description
                 )
-                created = await self.character_repo.create(character)
-                character_ids.append(str(created.id))
+                for char_data in character_list.characters
+            ]
+            created = await self.character_repo.bulk_create(characters)
+            character_ids = [str(character.id) for character in created]
+            self._invalidate_characters(project_id)
 
             return {
                 "mode": "direct",
                 "character_ids": character_ids,
-                "data": character_list.dict()
+                "data": payload
             }
         else:
             # Save to draft for review
-            draft = Draft(
-                project_id=ObjectId(project_id),
-                entity_type="character_list",
-                entity_id=None,
-                type="character_list",
-                content=character_list.dict(),
-                metadata={"num_characters": num_characters},
-                status="pending"
+            draft_id = self._spawn_draft(
+                "character_list",
+                payload,
+                project_id=project.id,
+                metadata={"num_characters": num_characters}
             )
-            created_draft = await self.draft_repo.create(draft)
 
             return {
                 "mode": "review",
-                "draft_id": str(created_draft.id),
-                "data": character_list.dict(),
+                "draft_id": str(draft_id),
+                "data": payload,
                 "message": f"Generated {len(character_list.characters)} characters. Please review."
             }
 
@@ -261,26 +485,49 @@ class AgentManager:
 
     async def approve_character_draft(self, draft_id: str) -> List[str]:
         """Approve character draft and create characters."""
+        await self._wait_for_draft(draft_id)
         draft = await self.draft_repo.get(draft_id)
         if not draft or draft.type != "character_list":
             raise ValueError(f"Invalid character draft: {draft_id}")
 
-        # Create characters from draft
-        character_ids = []
-        for char_data in draft.content["characters"]:
-            character = Character(
+        # Create characters from draft and mark the draft selected together
+        characters = [
+            Character(
                 project_id=draft.project_id,
                 name=char_data["name"],
                 role=char_data["role"],
                 description=char_data["description"]
             )
-            created = await self.character_repo.create(character)
-            character_ids.append(str(created.id))
+            for char_data in draft.content["characters"]
+        ]
+        created, selected_draft = await asyncio.gather(
+            self.character_repo.bulk_create(characters),
+            self.draft_repo.update(draft_id, {"status": "selected"}),
+            return_exceptions=True
+        )
 
-        # Update draft status
-        await self.draft_repo.update(draft_id, {"status": "selected"})
+        insert_failed = isinstance(created, BaseException)
+        select_failed = isinstance(selected_draft, BaseException) or selected_draft is None
+        if insert_failed or select_failed:
+            # Undo whichever write went through, so the draft can be approved
+            # again without leaving duplicate characters behind. Ids are
+            # allocated before the insert, so a partly applied one is undone too.
+            await self.character_repo.delete_many(
+                {"_id": {"$in": [character.id for character in characters]}}
+            )
+            if not select_failed:
+                await self.draft_repo.update(draft_id, {"status": draft.status})
+            self._invalidate_characters(str(draft.project_id))
+
+            if insert_failed:
+                raise created
+            if isinstance(selected_draft, BaseException):
+                raise selected_draft
+            raise ValueError(f"Invalid character draft: {draft_id}")
+
+        self._invalidate_characters(str(draft.project_id))
 
-        return character_ids
+        return [str(character.id) for character in created]
 
     @trace_method("workflow")
 
@@ -293,79 +540,65 @@ class AgentManager:
     ) -> Dict[str, Any]:
         """Generate chapters for a project."""
         # Load project and characters
-        project = await self.project_repo.get(project_id)
+        project, characters = await asyncio.gather(
+            self.project_repo.get(project_id),
+            self._get_characters(project_id)
+        )
         if not project:
             raise ValueError(f"Project {project_id} not found")
 
-        characters = await self.character_repo.get_project_characters(project_id)
-
         # Determine mode
         settings = project.generation_settings or ProjectGenerationSettings()
         generation_mode = mode or settings.get_mode(AgentType.CHAPTER_LIST)
 
         # Create context
-        context = AgentContext(
+        context = AgentContext.model_construct(
             project_id=project_id,
             user_id=str(project.user_id),
             data={
-                "project_summary": {
-                    "title": project.title,
-                    "genre": project.genre,
-                    "description": project.description
-                },
-                "character_list": {
-                    "characters": [
-                        {
-                            "name": char.name,
-                            "role": char.role,
-                            "description": char.description
-                        }
-                        for char in characters
-                    ]
-                },
+                "project_summary": DocumentView(project, PROJECT_SUMMARY_FIELDS),
+                "character_list": self._character_list_payload(project_id, characters),
                 "num_chapters": num_chapters
             }
         )
 
         # Execute agent
         agent = ChapterListAgent(context)
-        chapter_list = await agent.execute()
+        chapter_list = await self._execute_agent(agent)
+        payload = chapter_list.model_dump()
 
         if generation_mode == GenerationMode.DIRECT:
             # Save chapters directly
-            chapter_ids = []
-            for chap_data in chapter_list.chapters:
-                chapter = Chapter(
-                    project_id=ObjectId(project_id),
+            chapters = [
+                Chapter(
+                    project_id=project.id,
                     chapter_number=chap_data.number,
                     title=chap_data.title,
                     summary=chap_data.summary
                 )
-                created = await self.chapter_repo.create(chapter)
-                chapter_ids.append(str(created.id))
+                for chap_data in chapter_list.chapters
+            ]
+            created = await self.chapter_repo.bulk_create(chapters)
+            chapter_ids = [str(chapter.id) for chapter in created]
 
             return {
                 "mode": "direct",
                 "chapter_ids": chapter_ids,
-                "data": chapter_list.dict()
+                "data": payload
             }
         else:
             # Save to draft for review
-            draft = Draft(
-                project_id=ObjectId(project_id),
-                entity_type="chapter_list",
-                entity_id=None,
-                type="chapter_list",
-                content=chapter_list.dict(),
-                metadata={"num_chapters": num_chapters},
-                status="pending"
+            draft_id = self._spawn_draft(
+                "chapter_list",
+                payload,
+                project_id=project.id,
+                metadata={"num_chapters": num_chapters}
             )
-            created_draft = await self.draft_repo.create(draft)
 
             return {
                 "mode": "review",
-                "draft_id": str(created_draft.id),
-                "data": chapter_list.dict(),
+                "draft_id": str(draft_id),
+                "data": payload,
                 "message": f"Generated {len(chapter_list.chapters)} chapters. Please review."
             }
 
@@ -376,93 +609,85 @@ class AgentManager:
         self,
         chapter_id: str,
         num_scenes: int = 8,
-        mode: Optional[GenerationMode] = None
+        mode: Optional[GenerationMode] = None,
+        *,
+        chapter: Optional[Chapter] = None,
+        project: Optional[Project] = None
     ) -> Dict[str, Any]:
-        """Generate scenes for a chapter."""
-        # Load chapter and related data
-        chapter = await self.chapter_repo.get(chapter_id)
-        if not chapter:
-            raise ValueError(f"Chapter {chapter_id} not found")
+        """Generate scenes for a chapter.
+
+        Callers that already hold the chapter and project can pass them in
+        to skip loading them again.
+        """
+        if chapter is None or project is None:
+            # Load chapter, project and character briefs in one query
+            loaded = await self.chapter_repo.get_chapter_context(chapter_id, with_characters=True)
+            if not loaded:
+                raise ValueError(f"Chapter {chapter_id} not found")
+            chapter, project = loaded["chapter"], loaded["project"]
+            self._seed_characters(str(chapter.project_id), loaded["characters"])
 
         project_id = str(chapter.project_id)
-        project = await self.project_repo.get(project_id)
-        characters = await self.character_repo.get_project_characters(project_id)
+        characters = await self._get_characters(project_id)
 
         # Determine mode
         settings = project.generation_settings or ProjectGenerationSettings()
         generation_mode = mode or settings.get_mode(AgentType.SCENE_LIST)
 
         # Create context
-        context = AgentContext(
+        context = AgentContext.model_construct(
             project_id=project_id,
             user_id=str(project.user_id),
             data={
-                "project_summary": {
-                    "title": project.title,
-                    "genre": project.genre
-                },
-                "character_list": {
-                    "characters": [
-                        {
-                            "name": char.name,
-                            "role": char.role,
-                            "description": char.description
-                        }
-                        for char in characters
-                    ]
-                },
-                "chapter": {
-                    "number": chapter.chapter_number,
-                    "title": chapter.title,
-                    "summary": chapter.summary
-                },
+                "project_summary": DocumentView(project, PROJECT_SUMMARY_FIELDS),
+                "character_list": self._character_list_payload(project_id, characters),
+                "chapter": DocumentView(chapter, CHAPTER_FIELDS),
                 "num_scenes": num_scenes
             }
         )
 
         # Execute agent
         agent = SceneListAgent(context)
-        scene_list = await agent.execute()
+        scene_list = await self._execute_agent(agent)
+        payload = scene_list.model_dump()
 
         if generation_mode == GenerationMode.DIRECT:
             # Save scenes directly
-            scene_ids = []
-            for scene_data in scene_list.scenes:
-                scene = Scene(
-                    project_id=ObjectId(project_id),
-                    chapter_id=ObjectId(chapter_id),
+            scenes = [
+                Scene(
+                    project_id=chapter.project_id,
+                    chapter_id=chapter.id,
                     scene_number=scene_data.number,
                     title=scene_data.title,
                     description=scene_data.description
                 )
-                created = await self.scene_repo.create(scene)
-                scene_ids.append(str(created.id))
+                for scene_data in scene_list.scenes
+            ]
+            created = await self.scene_repo.bulk_create(scenes)
+            scene_ids = [str(scene.id) for scene in created]
 
             return {
                 "mode": "direct",
                 "scene_ids": scene_ids,
-                "data": scene_list.dict()
+                "data": payload
             }
         else:
             # Save to draft for review
-            draft = Draft(
+            draft_id = self._spawn_draft(
+                "scene_list",
+                payload,
                 project_id=chapter.project_id,
-                entity_type="scene_list",
-                entity_id=ObjectId(chapter_id),
-                type="scene_list",
-                content=scene_list.dict(),
+                entity_id=chapter.id,
                 metadata={
                     "chapter_id": chapter_id,
                     "num_scenes": num_scenes
-                },
-                status="pending"
+                }
             )
-            created_draft = await self.draft_repo.create(draft)
 
             return {
                 "mode": "review",
-                "draft_id": str(created_draft.id),
-                "data": scene_list.dict(),
+                "draft_id": str(draft_id),
+                "data": payload,
                 "message": f"Generated {len(scene_list.scenes)} scenes. Please review."
             }
 
@@ -473,101 +698,166 @@ class AgentManager:
         self,
         scene_id: str,
         num_panels: int = 6,
-        mode: Optional[GenerationMode] = None
+        mode: Optional[GenerationMode] = None,
+        *,
+        scene: Optional[Scene] = None,
+        chapter: Optional[Chapter] = None,
+        project: Optional[Project] = None
     ) -> Dict[str, Any]:
-        """Generate panels for a scene."""
-        # Load scene and related data
-        scene = await self.scene_repo.get(scene_id)
-        if not scene:
-            raise ValueError(f"Scene {scene_id} not found")
+        """Generate panels for a scene.
+
+        Callers that already hold the scene, chapter and project can pass
+        them in to skip loading them again.
+        """
+        if scene is None or chapter is None or project is None:
+            # Load scene, chapter, project and character briefs in one query
+            loaded = await self.scene_repo.get_scene_context(scene_id, with_characters=True)
+            if not loaded:
+                raise ValueError(f"Scene {scene_id} not found")
+            scene, chapter, project = loaded["scene"], loaded["chapter"], loaded["project"]
+            self._seed_characters(str(chapter.project_id), loaded["characters"])
 
-        chapter = await self.chapter_repo.get(str(scene.chapter_id))
         project_id = str(chapter.project_id)
-        project = await self.project_repo.get(project_id)
-        characters = await self.character_repo.get_project_characters(project_id)
+        characters = await self._get_characters(project_id)
 
         # Determine mode
         settings = project.generation_settings or ProjectGenerationSettings()
         generation_mode = mode or settings.get_mode(AgentType.PANEL_LIST)
 
         # Create context
-        context = AgentContext(
+        context = AgentContext.model_construct(
             project_id=project_id,
             user_id=str(project.user_id),
             data={
-                "character_list": {
-                    "characters": [
-                        {
-                            "name": char.name,
-                            "role": char.role,
-                            "description": char.description
-                        }
-                        for char in characters
-                    ]
-                },
-                "chapter": {
-                    "number": chapter.chapter_number,
-                    "title": chapter.title
-                },
-                "scene": {
-                    "number": scene.scene_number,
-                    "title": scene.title,
-                    "description": scene.description
-                },
+                "character_list": self._character_list_payload(project_id, characters),
+                "chapter": DocumentView(chapter, CHAPTER_FIELDS),
+                "scene": DocumentView(scene, SCENE_FIELDS),
                 "num_panels": num_panels
             }
         )
 
         # Execute agent
         agent = PanelListAgent(context)
-        panel_list = await agent.execute()
+        panel_list = await self._execute_agent(agent)
+        payload = panel_list.model_dump()
 
         if generation_mode == GenerationMode.DIRECT:
             # Save panels directly
-            panel_ids = []
-            for panel_data in panel_list.panels:
-                panel = Panel(
-                    project_id=ObjectId(chapter.project_id),
-                    chapter_id=ObjectId(scene.chapter_id),
-                    scene_id=ObjectId(scene_id),
+            panels = [
+                Panel(
+                    project_id=chapter.project_id,
+                    chapter_id=scene.chapter_id,
+                    scene_id=scene.id,
                     panel_number=panel_data.number,
                     shot_type=panel_data.shot_type,
                     description=panel_data.description,
                     dialogue=panel_data.dialogue,
                     narration=panel_data.narration
                 )
-                created = await self.panel_repo.create(panel)
-                panel_ids.append(str(created.id))
+                for panel_data in panel_list.panels
+            ]
+            created = await self.panel_repo.bulk_create(panels)
+            panel_ids = [str(panel.id) for panel in created]
 
             return {
                 "mode": "direct",
                 "panel_ids": panel_ids,
-                "data": panel_list.dict()
+                "data": payload
             }
         else:
             # Save to draft for review
-            draft = Draft(
+            draft_id = self._spawn_draft(
+                "panel_list",
+                payload,
                 project_id=chapter.project_id,
-                entity_type="panel_list",
-                entity_id=ObjectId(scene_id),
-                type="panel_list",
-                content=panel_list.dict(),
+                entity_id=scene.id,
                 metadata={
                     "scene_id": scene_id,
                     "num_panels": num_panels
-                },
-                status="pending"
+                }
             )
-            created_draft = await self.draft_repo.create(draft)
 
             return {
                 "mode": "review",
-                "draft_id": str(created_draft.id),
-                "data": panel_list.dict(),
+                "draft_id": str(draft_id),
+                "data": payload,
                 "message": f"Generated {len(panel_list.panels)} panels. Please review."
             }
 
     @trace_method("workflow")
+    async def generate_scenes_for_project(
+        self,
+        project_id: str,
+        num_scenes: int = 8,
+        mode: Optional[GenerationMode] = None,
+        concurrency: int = 4
+    ) -> List[Dict[str, Any]]:
+        """Generate scenes for every chapter of a project concurrently.
+
+        Results are in chapter order. A chapter that fails does not discard
+        the others: its entry has mode "error" and the error message.
+        """
+        project, chapters, _ = await asyncio.gather(
+            self.project_repo.get(project_id),
+            self.chapter_repo.get_project_chapters(project_id),
+            self._get_characters(project_id)  # warm the cache before fanning out
+        )
+        if not project:
+            raise ValueError(f"Project {project_id} not found")
+
+        semaphore = asyncio.Semaphore(concurrency)
+
+        async def generate(chapter: Chapter) -> Dict[str, Any]:
+            async with semaphore:
+                try:
+                    return await self.generate_scenes(
+                        str(chapter.id), num_scenes, mode, chapter=chapter, project=project
+                    )
+                except Exception as e:
+                    logger.error(f"Scene generation failed for chapter {chapter.id}: {e}")
+                    return {"mode": "error", "chapter_id": str(chapter.id), "message": str(e)}
+
+        return await asyncio.gather(*(generate(chapter) for chapter in chapters))
+
+    @trace_method("workflow")
+    async def generate_panels_for_chapter(
+        self,
+        chapter_id: str,
+        num_panels: int = 6,
+        mode: Optional[GenerationMode] = None,
+        concurrency: int = 4
+    ) -> List[Dict[str, Any]]:
+        """Generate panels for every scene of a chapter concurrently.
+
+        As with generate_scenes_for_project, a failed scene gets an "error"
+        entry instead of failing the whole chapter.
+        """
+        loaded = await self.chapter_repo.get_chapter_context(chapter_id)
+        if not loaded:
+            raise ValueError(f"Chapter {chapter_id} not found")
+
+        chapter, project = loaded["chapter"], loaded["project"]
+        scenes, _ = await asyncio.gather(
+            self.scene_repo.get_chapter_scenes(chapter_id),
+            self._get_characters(str(chapter.project_id))  # warm the cache
+        )
+
+        semaphore = asyncio.Semaphore(concurrency)
+
+        async def generate(scene: Scene) -> Dict[str, Any]:
+            async with semaphore:
+                try:
+                    return await self.generate_panels(
+                        str(scene.id), num_panels, mode,
+                        scene=scene, chapter=chapter, project=project
+                    )
+                except Exception as e:
+                    logger.error(f"Panel generation failed for scene {scene.id}: {e}")
+                    return {"mode": "error", "scene_id": str(scene.id), "message": str(e)}
+
+        return await asyncio.gather(*(generate(scene) for scene in scenes))
+
+    @trace_method("workflow")
 
 
     async def update_draft(
@@ -577,19 +867,20 @@ class AgentManager:
         regenerate: bool = False
     ) -> Dict[str, Any]:
         """Update a draft based on user feedback."""
+        await self._wait_for_draft(draft_id)
         draft = await self.draft_repo.get(draft_id)
         if not draft:
             raise ValueError(f"Draft {draft_id} not found")
 
         if regenerate:
-            # Store feedback in metadata and regenerate
-            if "feedback" not in draft.metadata:
-                draft.metadata["feedback"] = []
-            draft.metadata["feedback"].append({
-                "timestamp": datetime.now(timezone.utc).isoformat(),
+            # Store feedback in metadata and regenerate. Only the new entry is
+            # sent; the local copy keeps the history for the regenerated draft
+            entry = {
+                "timestamp": datetime.now(UTC).isoformat(timespec="seconds"),
                 "message": feedback
-            })
-            await self.draft_repo.update(draft_id, {"metadata": draft.metadata})
+            }
+            draft.metadata.setdefault("feedback", []).append(entry)
+            await self.draft_repo.push_feedback(draft.id, entry)
 
             # Regenerate based on type
             if draft.type == "character_list":
@@ -603,7 +894,7 @@ class AgentManager:
             # Just update the draft with feedback
             draft.feedback = draft.feedback or []
             draft.feedback.append({
-                "timestamp": datetime.now(timezone.utc),
+                "timestamp": datetime.now(UTC),
                 "message": feedback
             })
             await self.draft_repo.update(draft_id, {"status": "selected"})
@@ -623,16 +914,12 @@ class AgentManager:
         project = await self.project_repo.get(str(draft.project_id))
 
         # Create context with feedback
-        context = AgentContext(
+        context = AgentContext.model_construct(
             project_id=str(draft.project_id),
             user_id=str(project.user_id),
             data={
                 "user_input": project.user_input,
-                "project_summary": {
-                    "title": project.title,
-                    "genre": project.genre,
-                    "description": project.description
-                },
+                "project_summary": DocumentView(project, PROJECT_SUMMARY_FIELDS),
                 "num_characters": draft.metadata.get("num_characters", 5),
                 "feedback": feedback  # Include feedback in context
             }
@@ -640,24 +927,21 @@ class AgentManager:
 
         # Execute agent
         agent = CharacterListAgent(context)
-        character_list = await agent.execute()
+        character_list = await self._execute_agent(agent, reuse=False)
+        payload = character_list.model_dump()
 
         # Create new draft
-        new_draft = Draft(
+        draft_id = self._spawn_draft(
+            "character_list",
+            payload,
             project_id=draft.project_id,
-            entity_type="character_list",
-            entity_id=None,
-            type="character_list",
-            content=character_list.dict(),
-            metadata=draft.metadata,
-            status="pending"
+            metadata=draft.metadata
         )
-        created_draft = await self.draft_repo.create(new_draft)
 
         return {
             "mode": "review",
-            "draft_id": str(created_draft.id),
-            "data": character_list.dict(),
+            "draft_id": str(draft_id),
+            "data": payload,
             "message": "Characters regenerated based on feedback."
         }
 
@@ -666,23 +950,16 @@ class AgentManager:
 
     async def get_project_status(self, project_id: str) -> Dict[str, Any]:
         """Get complete status of a project."""
-        project = await self.project_repo.get(project_id)
+        # Load project, counts and pending drafts together
+        project, character_count, chapter_count, pending_drafts = await asyncio.gather(
+            self.project_repo.get(project_id),
+            self.character_repo.count_project_characters(project_id),
+            self.chapter_repo.count_project_chapters(project_id),
+            self.draft_repo.get_pending_draft_summaries(project_id)
+        )
         if not project:
             raise ValueError(f"Project {project_id} not found")
 
-        # Get counts
-        character_count = len(await self.character_repo.get_project_characters(project_id))
-        chapters = await self.chapter_repo.get_project_chapters(project_id)
-        chapter_count = len(chapters)
-
-        # Get pending drafts
-        pending_drafts = await self.draft_repo.list(
-            filter={
-                "project_id": ObjectId(project_id),
-                "status": "pending"
-            }
-        )
-
         return {
             "project": {
                 "id": str(project.id),
@@ -697,9 +974,9 @@ class AgentManager:
             },
             "pending_drafts": [
                 {
-                    "id": str(draft.id),
-                    "type": draft.type,
-                    "created_at": draft.created_at
+                    "id": str(draft["_id"]),
+                    "type": draft["type"],
+                    "created_at": draft["created_at"]
                 }
                 for draft in pending_drafts
             ]
@@ -12,7 +12,14 @@ from app.services.ai.base import (
     ModelNotFoundError,
     AuthenticationError
 )
+from app.services.ai.fallback import CircuitBreaker, CircuitState
 from app.services.ai.llm_client import LLMClient, get_llm_client
+from app.services.ai.response_cache import (
+    CacheStrategy,
+    InMemoryLRUCache,
+    RedisCache,
+    get_response_cache
+)
 
 __all__ = [
     "BaseLLMService",
@@ -27,6 +34,12 @@ __all__ = [
     "TokenLimitError",
     "ModelNotFoundError",
     "AuthenticationError",
+    "CircuitBreaker",
+    "CircuitState",
     "LLMClient",
-    "get_llm_client"
+    "get_llm_client",
+    "CacheStrategy",
+    "InMemoryLRUCache",
+    "RedisCache",
+    "get_response_cache"
 ]
\ No newline at end of file
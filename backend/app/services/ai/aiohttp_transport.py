@@ -0,0 +1,90 @@
+from typing import Any, AsyncIterator, Optional
+import asyncio
+import httpx
+
+
+class _AiohttpResponseStream(httpx.AsyncByteStream):
+    """Response body of an aiohttp response, read as httpx expects"""
+
+    def __init__(self, response: Any, request: httpx.Request):
+        self._response = response
+        self._request = request
+
+    async def __aiter__(self) -> AsyncIterator[bytes]:
+        import aiohttp
+
+        try:
+            async for chunk in self._response.content.iter_chunked(64 * 1024):
+                yield chunk
+        except asyncio.TimeoutError as e:
+            raise httpx.ReadTimeout(str(e), request=self._request) from e
+        except aiohttp.ClientError as e:
+            raise httpx.ReadError(str(e), request=self._request) from e
+
+    async def aclose(self) -> None:
+        self._response.release()
+
+
+class AiohttpTransport(httpx.AsyncBaseTransport):
+    """httpx transport that sends requests through an aiohttp session.
+
+    Lets AsyncOpenAI run on aiohttp's connection pool, which holds up
+    better than httpx's under hundreds of concurrent requests. Connection
+    and timeout errors are raised as their httpx equivalents, so the SDK's
+    own retries and error types keep working.
+    """
+
+    def __init__(self, limit: int = 256, ttl_dns_cache: int = 300):
+        self.limit = limit
+        self.ttl_dns_cache = ttl_dns_cache
+        self._session: Optional[Any] = None
+
+    def _get_session(self) -> Any:
+        import aiohttp
+
+        # Created on first use, inside the running loop
+        if self._session is None or self._session.closed:
+            self._session = aiohttp.ClientSession(
+                connector=aiohttp.TCPConnector(
+                    limit=self.limit,
+                    ttl_dns_cache=self.ttl_dns_cache
+                ),
+                # httpx decodes the body itself from Content-Encoding
+                auto_decompress=False
+            )
+        return self._session
+
+    async def handle_async_request(self, request: httpx.Request) -> httpx.Response:
+        import aiohttp
+
+        timeout = request.extensions.get("timeout", {})
+        try:
+            response = await self._get_session().request(
+                request.method,
+                str(request.url),
+                headers=list(request.headers.multi_items()),
+                data=await request.aread(),
+                allow_redirects=False,
+                timeout=aiohttp.ClientTimeout(
+                    sock_connect=timeout.get("connect"),
+                    sock_read=timeout.get("read")
+                )
+            )
+        except asyncio.TimeoutError as e:
+            raise httpx.TimeoutException(str(e), request=request) from e
+        except aiohttp.ClientConnectionError as e:
+            raise httpx.ConnectError(str(e), request=request) from e
+        except aiohttp.ClientError as e:
+            raise httpx.TransportError(str(e), request=request) from e
+
+        return httpx.Response(
+            status_code=response.status,
+            headers=list(response.raw_headers),
+            stream=_AiohttpResponseStream(response, request),
+            request=request
+        )
+
+    async def aclose(self) -> None:
+        if self._session is not None:
+            await self._session.close()
+            self._session = None
@@ -1,11 +1,19 @@
 from abc import ABC, abstractmethod
-from typing import Dict, Any, List, Optional, Union
+from typing import Dict, Any, AsyncIterator, List, Optional, Tuple, Type, Union
 from pydantic import BaseModel, Field
 from enum import Enum
+import asyncio
+import functools
 import logging
+import random
+import re
+import orjson
 
 logger = logging.getLogger(__name__)
 
+# A markdown code fence around a JSON answer, as models often add in JSON mode
+_JSON_BLOCK_RE = re.compile(r"```(?:json)?\s*([\s\S]*?)\s*```")
+
 
 class LLMProvider(str, Enum):
     OPENAI = "openai"
@@ -19,6 +27,26 @@ class LLMModel(str, Enum):
     # Ollama Models (local)
     QWEN3 = "qwen3:latest"
 
+# A JSON schema for structured output, or the Pydantic model that defines it
+Schema = Union[Dict[str, Any], Type[BaseModel]]
+
+
+@functools.lru_cache(maxsize=64)
+def _model_schema_json(model: Type[BaseModel]) -> str:
+    return orjson.dumps(model.model_json_schema(), option=orjson.OPT_SORT_KEYS).decode()
+
+
+def schema_json(schema: Schema) -> str:
+    """Return a schema as canonical (key-sorted) JSON.
+
+    Model classes are serialized once and reused; pass the model rather
+    than its model_json_schema() to skip the schema walk on every call.
+    """
+    if isinstance(schema, type):
+        return _model_schema_json(schema)
+    return orjson.dumps(schema, option=orjson.OPT_SORT_KEYS).decode()
+
+
 class GenerationRequest(BaseModel):
     prompt: str
     temperature: float = Field(default=0.7, ge=0.0, le=2.0)
@@ -36,6 +64,8 @@ class GenerationResponse(BaseModel):
     text: str
     model: str
     provider: str
+    # prompt_tokens, completion_tokens, total_tokens, plus cached_tokens when
+    # the provider served part of the prompt from its prompt cache
     usage: Optional[Dict[str, int]] = None
     metadata: Dict[str, Any] = Field(default_factory=dict)
 
@@ -81,7 +111,7 @@ class BaseLLMService(ABC):
     async def generate_structured(
         self,
         request: GenerationRequest,
-        schema: Dict[str, Any]
+        schema: Schema
     ) -> Dict[str, Any]:
         """Generate structured output conforming to a schema"""
         pass
@@ -96,6 +126,14 @@ class BaseLLMService(ABC):
         """List available models for this provider"""
         pass
 
+    async def stream_chat(self, request: ChatRequest) -> AsyncIterator[str]:
+        """Stream chat completion text as it is generated.
+
+        Providers without streaming yield the whole completion at once.
+        """
+        response = await self.chat(request)
+        yield response.text
+
     async def health_check(self) -> bool:
         """Check if the service is available"""
         try:
@@ -160,31 +198,114 @@ class BaseLLMService(ABC):
             if not request.messages:
                 raise ValueError("Messages cannot be empty")
 
-            if len(request.messages) > 100:
-                logger.warning("Large number of messages may exceed context window")
-
     async def retry_with_backoff(
         self,
         func,
         max_retries: int = 3,
-        initial_delay: float = 1.0
+        initial_delay: float = 1.0,
+        max_delay: float = 30.0,
+        jitter: float = 1.0,
+        retry_on: Optional[Tuple[Type[BaseException], ...]] = None
     ):
-        """Retry a function with exponential backoff"""
-        import asyncio
-
-        last_error = None
-        delay = initial_delay
-
-        for attempt in range(max_retries):
+        """Retry a function with capped exponential backoff and jitter.
+
+        Only errors in retry_on (rate limits and timeouts by default) are
+        retried; anything else, including authentication and invalid request
+        errors, is raised at once. A rate limit response's Retry-After header
+        takes precedence over the computed delay, though neither waits longer
+        than max_delay. func is always called at least once, whatever
+        max_retries is.
+        """
+        if retry_on is None:
+            retry_on = (RateLimitError, asyncio.TimeoutError)
+
+        attempts = max(1, max_retries)
+        for attempt in range(attempts):
             try:
                 return await func()
-            except Exception as e:
-                last_error = e
-                if attempt < max_retries - 1:
-                    await asyncio.sleep(delay)
-                    delay *= 2
-
-        raise last_error
+            except _NON_RETRYABLE_ERRORS:
+                raise
+            except retry_on as e:
+                if attempt == attempts - 1:
+                    raise
+
+                delay = _retry_after(e)
+                if delay is None:
+                    delay = initial_delay * 2 ** attempt + random.random() * jitter
+                delay = min(max_delay, delay)
+                logger.warning(f"Retrying after {type(e).__name__} in {delay:.2f}s")
+                await asyncio.sleep(delay)
+
+
+def _retry_after(error: BaseException) -> Optional[float]:
+    """Return the server-advised Retry-After delay in seconds, if any.
+
+    Provider errors are re-raised as our own types inside an except block,
+    so the provider's exception (and its HTTP response) is the cause or
+    context of the one being handled.
+    """
+    for candidate in (error, error.__cause__, error.__context__):
+        response = getattr(candidate, "response", None)
+        headers = getattr(response, "headers", None)
+        if not headers:
+            continue
+        try:
+            return max(0.0, float(headers.get("retry-after")))
+        except (TypeError, ValueError):
+            continue
+    return None
+
+
+def _find_json_span(text: str) -> Optional[str]:
+    """Return the first balanced JSON object or array in text, if any.
+
+    A single pass that tracks bracket depth, skipping brackets inside
+    strings, so prose around the JSON (or after it) is ignored.
+    """
+    start = -1
+    depth = 0
+    in_string = False
+    escape = False
+
+    for i, char in enumerate(text):
+        if in_string:
+            if escape:
+                escape = False
+            elif char == "\\":
+                escape = True
+            elif char == '"':
+                in_string = False
+        elif char in "{[":
+            if start < 0:
+                start = i
+            depth += 1
+        elif start < 0:
+            continue
+        elif char in "}]":
+            depth -= 1
+            if depth == 0:
+                return text[start:i + 1]
+        elif char == '"':
+            in_string = True
+
+    return None
+
+
+def extract_json(text: str) -> Any:
+    """Parse the JSON in an LLM response, tolerating surrounding text.
+
+    Tries the whole text, then a markdown code fence, then the first
+    balanced object or array. Raises orjson.JSONDecodeError (a ValueError)
+    if no valid JSON is found.
+    """
+    try:
+        return orjson.loads(text)
+    except orjson.JSONDecodeError:
+        match = _JSON_BLOCK_RE.search(text)
+        candidate = match.group(1) if match else _find_json_span(text)
+        if candidate is None:
+            raise
+        return orjson.loads(candidate)
 
 
 class LLMError(Exception):
@@ -209,4 +330,8 @@ class ModelNotFoundError(LLMError):
 
 class AuthenticationError(LLMError):
     """Authentication failed"""
-    pass
\ No newline at end of file
+    pass
+
+
+# Errors that retrying cannot fix
+_NON_RETRYABLE_ERRORS = (AuthenticationError, ModelNotFoundError, ValueError)
@@ -0,0 +1,78 @@
+from typing import Optional
+from enum import Enum
+import time
+import logging
+
+logger = logging.getLogger(__name__)
+
+
+class CircuitState(str, Enum):
+    CLOSED = "closed"
+    OPEN = "open"
+    HALF_OPEN = "half_open"
+
+
+class CircuitBreaker:
+    """Stop calling a provider after repeated failures.
+
+    After failure_threshold consecutive failures the circuit opens and
+    the provider is skipped. Once cooldown_seconds have passed it is
+    half-open: one trial call goes through, and its outcome closes the
+    circuit again or reopens it for another cooldown. A trial that never
+    reports back (cancelled, or served from cache) is given up on after
+    another cooldown, so the circuit cannot stay stuck half-open.
+    """
+
+    def __init__(self, name: str, failure_threshold: int = 5, cooldown_seconds: float = 30.0):
+        self.name = name
+        self.failure_threshold = failure_threshold
+        self.cooldown_seconds = cooldown_seconds
+        self.failures = 0
+        self.last_failure_ts = 0.0
+        self._state = CircuitState.CLOSED
+        self._trial_started_ts: Optional[float] = None
+
+    @property
+    def state(self) -> CircuitState:
+        if (
+            self._state == CircuitState.OPEN
+            and time.monotonic() - self.last_failure_ts >= self.cooldown_seconds
+        ):
+            self._state = CircuitState.HALF_OPEN
+        return self._state
+
+    def allow_request(self) -> bool:
+        """Whether a call to the provider should be attempted.
+
+        While half-open only the first caller is let through, as the trial.
+        """
+        state = self.state
+        if state == CircuitState.CLOSED:
+            return True
+        if state == CircuitState.OPEN:
+            return False
+
+        now = time.monotonic()
+        if (
+            self._trial_started_ts is not None
+            and now - self._trial_started_ts < self.cooldown_seconds
+        ):
+            return False
+        self._trial_started_ts = now
+        return True
+
+    def record_success(self) -> None:
+        if self._state != CircuitState.CLOSED:
+            logger.info(f"Circuit for {self.name} closed")
+        self.failures = 0
+        self._state = CircuitState.CLOSED
+        self._trial_started_ts = None
+
+    def record_failure(self) -> None:
+        self.failures += 1
+        self.last_failure_ts = time.monotonic()
+        self._trial_started_ts = None
+        if self._state == CircuitState.HALF_OPEN or self.failures >= self.failure_threshold:
+            if self._state != CircuitState.OPEN:
+                logger.warning(f"Circuit for {self.name} opened after {self.failures} failures")
+            self._state = CircuitState.OPEN
@@ -1,18 +1,95 @@
-from typing import Dict, Any, Optional, Union
+from typing import Dict, Any, AsyncIterator, List, Optional, Union, Awaitable, Callable, TypeVar, TypedDict
+import asyncio
+import hashlib
 import logging
+import orjson
 
 from app.services.ai.base import (
     BaseLLMService,
     LLMProvider,
     GenerationRequest,
     GenerationResponse,
-    ChatRequest
+    ChatRequest,
+    ChatMessage,
+    LLMError,
+    RateLimitError,
+    Schema,
+    schema_json
 )
+from app.services.ai.fallback import CircuitBreaker
 from app.services.ai.openai_service import OpenAIService
+from app.services.ai.response_cache import CacheStrategy, get_response_cache
 from app.core.config import settings
 
 logger = logging.getLogger(__name__)
 
+T = TypeVar("T")
+
+# Errors that make a provider worth skipping for the next one
+_FALLBACK_ERRORS = (RateLimitError, asyncio.TimeoutError)
+
+
+def _request_key(
+    service: BaseLLMService,
+    kind: str,
+    request: Union[GenerationRequest, ChatRequest],
+    schema: Optional[Schema] = None
+) -> Optional[str]:
+    """Key identical deterministic requests, or None if the request is sampled.
+
+    Only temperature 0 calls are expected to give the same answer twice.
+    """
+    if request.temperature != 0:
+        return None
+
+    payload = {
+        "provider": service.provider.value,
+        "kind": kind,
+        "request": request.model_dump(mode="json"),
+        "schema": schema_json(schema) if schema is not None else None
+    }
+    encoded = orjson.dumps(payload, option=orjson.OPT_SORT_KEYS)
+    return f"llm:{hashlib.sha1(encoded).hexdigest()}"
+
+
+class FastChatMessage(TypedDict):
+    """A chat message passed as a plain dict by internal callers"""
+    role: str
+    content: str
+
+
+def _coerce_messages(messages: List[Union[FastChatMessage, ChatMessage]]) -> List[ChatMessage]:
+    """Convert message dicts to ChatMessage, skipping validation for well-formed ones.
+
+    ChatRequest accepts ChatMessage instances without revalidating them, so
+    dicts that already carry string role and content are wrapped with
+    model_construct. Anything else goes through normal validation and
+    fails there.
+    """
+    chat_messages = []
+    for msg in messages:
+        if isinstance(msg, dict):
+            role, content = msg.get("role"), msg.get("content")
+            if isinstance(role, str) and isinstance(content, str) and len(msg) == 2:
+                chat_messages.append(ChatMessage.model_construct(role=role, content=content))
+            else:
+                chat_messages.append(ChatMessage(**msg))
+        else:
+            chat_messages.append(msg)
+    return chat_messages
+
+
+def _load_cached_response(value: Dict[str, Any]) -> GenerationResponse:
+    """Rebuild a cached GenerationResponse, marking it as a cache hit"""
+    response = GenerationResponse.model_validate(value)
+    response.metadata["cache_hit"] = True
+    return response
+
+
+def _copy_json(value: Any) -> Any:
+    """Deep-copy JSON data with an orjson round trip, faster than copy.deepcopy"""
+    return orjson.loads(orjson.dumps(value))
+
 
 class LLMClient:
     """Unified client for multiple LLM providers"""
@@ -21,47 +98,197 @@ class LLMClient:
         self.default_provider = default_provider or LLMProvider.OPENAI
         self.services: Dict[LLMProvider, BaseLLMService] = {}
 
-        # Initialize available services
+        # In-flight deterministic calls, shared by identical concurrent requests
+        self._inflight: Dict[str, asyncio.Future] = {}
+
+        # Completed deterministic calls
+        self._cache: Optional[CacheStrategy] = (
+            get_response_cache() if settings.LLM_CACHE_ENABLED else None
+        )
+
+        # Register available services; each is built on first use
+        self._factories: Dict[LLMProvider, Callable[[], BaseLLMService]] = {}
         self._initialize_services()
 
+        # Providers to try, in order, when a call hits a rate limit or timeout
+        self._fallback_order: List[LLMProvider] = [
+            provider for name in settings.LLM_FALLBACK_ORDER
+            for provider in LLMProvider
+            if provider.value == name and provider in self._factories
+        ]
+        self._breakers: Dict[LLMProvider, CircuitBreaker] = {
+            provider: CircuitBreaker(
+                provider.value,
+                failure_threshold=settings.LLM_CIRCUIT_FAILURE_THRESHOLD,
+                cooldown_seconds=settings.LLM_CIRCUIT_COOLDOWN_SECONDS
+            )
+            for provider in self._factories
+        }
+
     def _initialize_services(self):
-        """Initialize available LLM services based on configuration"""
+        """Register available LLM services based on configuration.
+
+        Only factories are registered here, so a provider that is never used
+        is never constructed.
+        """
 
         # OpenAI
         if settings.OPENAI_API_KEY:
-            self.services[LLMProvider.OPENAI] = OpenAIService(
+            self._factories[LLMProvider.OPENAI] = lambda: OpenAIService(
                 api_key=settings.OPENAI_API_KEY
             )
-            logger.info("Initialized OpenAI service")
 
         # Add Anthropic when API key is available
         # if settings.ANTHROPIC_API_KEY:
-        #     self.services[LLMProvider.ANTHROPIC] = AnthropicService(
+        #     self._factories[LLMProvider.ANTHROPIC] = lambda: AnthropicService(
         #         api_key=settings.ANTHROPIC_API_KEY
         #     )
 
         # Add Ollama for local models
         # if settings.OLLAMA_BASE_URL:
-        #     self.services[LLMProvider.OLLAMA] = OllamaService(
+        #     self._factories[LLMProvider.OLLAMA] = lambda: OllamaService(
         #         base_url=settings.OLLAMA_BASE_URL
         #     )
 
-        if not self.services:
+        if not self._factories:
             logger.warning("No LLM services initialized. Check API keys in configuration.")
 
+    def _service(self, provider: LLMProvider) -> BaseLLMService:
+        """Get a registered provider's service, building it on first use.
+
+        Construction is synchronous, so concurrent callers on the event loop
+        cannot build the same service twice.
+        """
+        service = self.services.get(provider)
+        if service is None:
+            service = self._factories[provider]()
+            self.services[provider] = service
+            logger.info(f"Initialized {provider.value} service")
+        return service
+
     def get_service(self, provider: Optional[LLMProvider] = None) -> BaseLLMService:
         """Get service for specified provider"""
         provider = provider or self.default_provider
 
-        if provider not in self.services:
-            available = list(self.services.keys())
+        if provider not in self._factories:
+            available = list(self._factories.keys())
             if available:
                 logger.warning(f"Provider {provider} not available, using {available[0]}")
-                return self.services[available[0]]
+                return self._service(available[0])
             else:
                 raise ValueError("No LLM services available")
 
-        return self.services[provider]
+        return self._service(provider)
+
+    def _providers_for(self, provider: Optional[LLMProvider] = None) -> List[LLMProvider]:
+        """The preferred provider, followed by the rest of the fallback order"""
+        first = self.get_service(provider).provider
+        return [first] + [p for p in self._fallback_order if p != first]
+
+    async def _with_fallback(
+        self,
+        provider: Optional[LLMProvider],
+        call: Callable[[BaseLLMService], Awaitable[T]]
+    ) -> T:
+        """Run call on the first provider that is up, falling back on failure.
+
+        Providers whose circuit is open are skipped. A rate limit or timeout
+        moves on to the next provider; any other error is raised as is. The
+        breakers themselves are updated by _tracked, inside the call.
+        """
+        last_error: Optional[BaseException] = None
+
+        for candidate in self._providers_for(provider):
+            if not self._breakers[candidate].allow_request():
+                continue
+
+            try:
+                return await call(self._service(candidate))
+            except _FALLBACK_ERRORS as e:
+                last_error = e
+                logger.warning(f"Provider {candidate.value} failed ({type(e).__name__}), trying next")
+
+        if last_error is not None:
+            raise last_error
+        raise LLMError("All LLM providers are unavailable")
+
+    async def _tracked(self, service: BaseLLMService, call: Callable[[], Awaitable[T]]) -> T:
+        """Run a provider call and record its outcome on the provider's breaker.
+
+        This runs inside the single-flight call, so one failure shared by
+        coalesced callers counts against the breaker once, not once per caller.
+        """
+        breaker = self._breakers[service.provider]
+        try:
+            result = await call()
+        except _FALLBACK_ERRORS:
+            breaker.record_failure()
+            raise
+
+        breaker.record_success()
+        return result
+
+    async def _single_flight(
+        self,
+        key: Optional[str],
+        call: Callable[[], Awaitable[Any]],
+        join: Callable[[Any], Any] = lambda result: result
+    ) -> Any:
+        """Run call, or join an identical call that is already in flight.
+
+        Callers that join get join(result), so a mutable result can be copied
+        for each of them. The lookup and insert happen without an await in
+        between, so no lock is needed on the event loop.
+        """
+        if key is None:
+            return await call()
+
+        future = self._inflight.get(key)
+        joined = future is not None
+        if not joined:
+            future = asyncio.ensure_future(call())
+            self._inflight[key] = future
+
+            def _forget(done: asyncio.Future) -> None:
+                if self._inflight.get(key) is done:
+                    del self._inflight[key]
+
+            future.add_done_callback(_forget)
+
+        # Shielded so one cancelled caller does not cancel the shared call
+        result = await asyncio.shield(future)
+        return join(result) if joined else result
+
+    async def _deterministic_call(
+        self,
+        key: Optional[str],
+        call: Callable[[], Awaitable[Any]],
+        dump: Callable[[Any], Any] = lambda result: result,
+        load: Callable[[Any], Any] = lambda value: value,
+        join: Callable[[Any], Any] = lambda result: result
+    ) -> Any:
+        """Serve a deterministic call from the cache, or run it once and cache it.
+
+        Sampled calls (key None) always run. The cache lookup happens inside
+        the single-flight call, so concurrent misses share one lookup too.
+        dump and load convert results to and from cache entries; join is
+        applied to the result handed to each coalesced caller.
+        """
+        if key is None:
+            return await call()
+
+        async def fetch() -> Any:
+            if self._cache is not None:
+                cached = await self._cache.get(key)
+                if cached is not None:
+                    return load(cached)
+
+            result = await call()
+            if self._cache is not None:
+                await self._cache.set(key, dump(result))
+            return result
+
+        return await self._single_flight(key, fetch, join)
 
     async def generate(
         self,
@@ -73,8 +300,6 @@ class LLMClient:
         **kwargs
     ) -> str:
         """Generate text using specified or default provider"""
-        service = self.get_service(provider)
-
         request = GenerationRequest(
             prompt=prompt,
             temperature=temperature,
@@ -83,7 +308,15 @@ class LLMClient:
             **kwargs
         )
 
-        response = await service.generate(request)
+        response = await self._with_fallback(
+            provider,
+            lambda service: self._deterministic_call(
+                _request_key(service, "generate", request),
+                lambda: self._tracked(service, lambda: service.generate(request)),
+                dump=GenerationResponse.model_dump,
+                load=_load_cached_response
+            )
+        )
         return response.text
 
     async def chat(
@@ -96,38 +329,75 @@ class LLMClient:
         **kwargs
     ) -> str:
         """Chat completion using specified or default provider"""
-        service = self.get_service(provider)
+        request = ChatRequest(
+            messages=_coerce_messages(messages),
+            temperature=temperature,
+            max_tokens=max_tokens,
+            model=model,
+            **kwargs
+        )
 
-        # Convert messages to ChatMessage objects if needed
-        from app.services.ai.base import ChatMessage
-        chat_messages = []
-        for msg in messages:
-            if isinstance(msg, dict):
-                chat_messages.append(ChatMessage(**msg))
-            else:
-                chat_messages.append(msg)
+        response = await self._with_fallback(
+            provider,
+            lambda service: self._deterministic_call(
+                _request_key(service, "chat", request),
+                lambda: self._tracked(service, lambda: service.chat(request)),
+                dump=GenerationResponse.model_dump,
+                load=_load_cached_response
+            )
+        )
+        return response.text
+
+    async def stream(
+        self,
+        prompt: str,
+        temperature: float = 0.7,
+        max_tokens: Optional[int] = None,
+        model: Optional[str] = None,
+        provider: Optional[LLMProvider] = None,
+        system_prompt: Optional[str] = None,
+        chunk_size: int = 32,
+        **kwargs
+    ) -> AsyncIterator[str]:
+        """Stream generated text, grouped into chunks of about chunk_size tokens.
+
+        Providers send roughly one token per delta; grouping them means
+        consumers wake once per chunk rather than once per token.
+        """
+        service = self.get_service(provider)
 
         request = ChatRequest(
-            messages=chat_messages,
+            messages=service.convert_to_chat_messages(prompt, system_prompt),
             temperature=temperature,
             max_tokens=max_tokens,
             model=model,
             **kwargs
         )
 
-        response = await service.chat(request)
-        return response.text
+        buffer: List[str] = []
+        async for delta in service.stream_chat(request):
+            buffer.append(delta)
+            if len(buffer) >= chunk_size:
+                yield "".join(buffer)
+                buffer.clear()
+
+        if buffer:
+            yield "".join(buffer)
 
     async def generate_structured(
         self,
         prompt: str,
-        schema: Dict[str, Any],
+        schema: Schema,
         temperature: float = 0.7,
         model: Optional[str] = None,
         provider: Optional[LLMProvider] = None,
         **kwargs
     ) -> Dict[str, Any]:
-        """Generate structured output"""
+        """Generate structured output.
+
+        schema may be a Pydantic model class, whose JSON schema is then
+        built and serialized once rather than on every call.
+        """
         service = self.get_service(provider)
 
         request = GenerationRequest(
@@ -137,7 +407,44 @@ class LLMClient:
             **kwargs
         )
 
-        return await service.generate_structured(request, schema)
+        # Results are plain dicts, so the cache and coalesced callers each get
+        # their own copy; a caller editing its result cannot change another's
+        return await self._deterministic_call(
+            _request_key(service, "structured", request, schema),
+            lambda: service.generate_structured(request, schema),
+            dump=_copy_json,
+            load=_copy_json,
+            join=_copy_json
+        )
+
+    def _batch_service(self) -> OpenAIService:
+        """Get the OpenAI service, the only provider with a batch API"""
+        service = (
+            self._service(LLMProvider.OPENAI)
+            if LLMProvider.OPENAI in self._factories else None
+        )
+        if not isinstance(service, OpenAIService):
+            raise ValueError("Batch requests require the OpenAI service")
+        return service
+
+    async def submit_batch(self, requests: List[Union[GenerationRequest, ChatRequest]]) -> str:
+        """Submit requests for asynchronous, half-price batch processing.
+
+        For bulk generations that are not latency-sensitive. Results are keyed
+        by each request's index in poll_batch.
+        """
+        service = self._batch_service()
+        return await service.submit_batch(
+            [service.build_chat_params(request) for request in requests]
+        )
+
+    async def submit_batch_bodies(self, bodies: List[Dict[str, Any]]) -> str:
+        """Submit prebuilt chat.completions bodies for batch processing"""
+        return await self._batch_service().submit_batch(bodies)
+
+    async def poll_batch(self, batch_id: str) -> Dict[str, Any]:
+        """Get a batch's status and, once completed, its response bodies"""
+        return await self._batch_service().poll_batch(batch_id)
 
     async def count_tokens(
         self,
@@ -152,9 +459,9 @@ class LLMClient:
     async def health_check(self) -> Dict[str, bool]:
         """Check health of all available services"""
         results = {}
-        for provider, service in self.services.items():
+        for provider in self._factories:
             try:
-                results[provider.value] = await service.health_check()
+                results[provider.value] = await self._service(provider).health_check()
             except Exception as e:
                 logger.error(f"Health check failed for {provider}: {str(e)}")
                 results[provider.value] = False
@@ -162,7 +469,7 @@ class LLMClient:
 
     def list_providers(self) -> list:
         """List available providers"""
-        return [p.value for p in self.services.keys()]
+        return [p.value for p in self._factories.keys()]
 
     async def list_models(self, provider: Optional[LLMProvider] = None) -> list:
         """List available models for a provider"""
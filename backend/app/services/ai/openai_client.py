@@ -0,0 +1,137 @@
+from typing import Optional, Set
+from openai import AsyncOpenAI
+import asyncio
+import httpx
+import logging
+
+from app.core.config import settings
+
+logger = logging.getLogger(__name__)
+
+
+# Singleton instance, and the event loop its connection pool belongs to
+_openai_client: Optional[AsyncOpenAI] = None
+_openai_client_loop: Optional[asyncio.AbstractEventLoop] = None
+
+# Closes of clients left behind on an old event loop, kept so they are not
+# garbage collected before they finish
+_closing: Set[asyncio.Task] = set()
+
+
+def _running_loop() -> Optional[asyncio.AbstractEventLoop]:
+    try:
+        return asyncio.get_running_loop()
+    except RuntimeError:
+        return None
+
+
+def _build_http_client() -> httpx.AsyncClient:
+    """Build the pooled HTTP client, on the configured transport"""
+    timeout = httpx.Timeout(settings.OPENAI_TIMEOUT_SECONDS, connect=10.0)
+
+    if settings.OPENAI_HTTP_TRANSPORT == "aiohttp":
+        from app.services.ai.aiohttp_transport import AiohttpTransport
+
+        return httpx.AsyncClient(
+            transport=AiohttpTransport(limit=settings.OPENAI_MAX_CONNECTIONS),
+            timeout=timeout
+        )
+
+    # With HTTP/2, concurrent agent calls are multiplexed over a few pooled
+    # connections instead of each needing its own handshake
+    return httpx.AsyncClient(
+        http2=settings.OPENAI_HTTP2,
+        limits=httpx.Limits(
+            max_connections=settings.OPENAI_MAX_CONNECTIONS,
+            max_keepalive_connections=settings.OPENAI_MAX_KEEPALIVE_CONNECTIONS,
+            keepalive_expiry=settings.OPENAI_KEEPALIVE_EXPIRY_SECONDS
+        ),
+        timeout=timeout
+    )
+
+
+async def _close_quietly(client: AsyncOpenAI) -> None:
+    try:
+        await client.close()
+    except Exception as e:
+        logger.debug(f"Could not close retired OpenAI client: {e}")
+
+
+def _retire_client(
+    client: AsyncOpenAI,
+    client_loop: asyncio.AbstractEventLoop,
+    loop: asyncio.AbstractEventLoop
+) -> None:
+    """Close a client whose pool belongs to another event loop.
+
+    If that loop is still running (in another thread), the client is closed
+    there. Otherwise the loop is finished, as after asyncio.run, and the
+    pool's sockets are closed from the current loop, best effort.
+    """
+    if client_loop.is_running() and not client_loop.is_closed():
+        asyncio.run_coroutine_threadsafe(_close_quietly(client), client_loop)
+        return
+
+    task = loop.create_task(_close_quietly(client))
+    _closing.add(task)
+    task.add_done_callback(_closing.discard)
+
+
+def get_openai_client() -> AsyncOpenAI:
+    """Get or create the shared OpenAI client.
+
+    All agents and services use this one client, so its httpx pool keeps
+    connections alive across requests instead of handshaking per instance.
+    Pooled connections cannot be used from another event loop, so a caller
+    on a different loop than the one that first used the client (say, a
+    fresh loop per test or per worker task) gets a new client, and the old
+    one is closed so its sockets are not leaked.
+    """
+    global _openai_client, _openai_client_loop
+    loop = _running_loop()
+
+    if _openai_client is not None and loop is not None:
+        if _openai_client_loop is None:
+            _openai_client_loop = loop
+        elif _openai_client_loop is not loop:
+            logger.debug("Event loop changed; creating a new OpenAI client")
+            _retire_client(_openai_client, _openai_client_loop, loop)
+            _openai_client = None
+
+    if _openai_client is None:
+        _openai_client = AsyncOpenAI(
+            api_key=settings.OPENAI_API_KEY,
+            http_client=_build_http_client()
+        )
+        _openai_client_loop = loop
+    return _openai_client
+
+
+async def warm_openai_client(connections: int = 4, timeout: float = 5.0) -> None:
+    """Open pooled connections ahead of the first agent calls.
+
+    Concurrent requests each take their own socket, so this leaves
+    `connections` TLS-established keepalive connections in the pool.
+    Best-effort: failures and timeouts are logged and ignored.
+    """
+    if not settings.OPENAI_API_KEY:
+        return
+
+    client = get_openai_client()
+    try:
+        await asyncio.wait_for(
+            asyncio.gather(*(client.models.list() for _ in range(connections))),
+            timeout=timeout
+        )
+        logger.info(f"OpenAI client warmed up with {connections} connections")
+    except Exception as e:
+        logger.warning(f"Could not warm up OpenAI client: {e}")
+
+
+async def close_openai_client() -> None:
+    """Close the shared client and its connection pool"""
+    global _openai_client, _openai_client_loop
+    if _openai_client is not None:
+        await _openai_client.close()
+        _openai_client = None
+        _openai_client_loop = None
@@ -1,9 +1,14 @@
-from typing import Dict, Any, List, Optional
+from typing import Dict, Any, AsyncIterator, List, Optional, Tuple, Union
+from collections import OrderedDict
 import openai
-from openai import AsyncOpenAI
 import tiktoken
-import json
+import asyncio
+import functools
+import hashlib
 import logging
+import re
+import time
+import orjson
 
 from app.services.ai.base import (
     BaseLLMService,
@@ -16,13 +21,150 @@ from app.services.ai.base import (
     RateLimitError,
     TokenLimitError,
     AuthenticationError,
-    ModelNotFoundError
+    ModelNotFoundError,
+    Schema,
+    extract_json,
+    schema_json
 )
+from app.services.ai.openai_client import get_openai_client
 from app.core.config import settings
 
 logger = logging.getLogger(__name__)
 
 
+@functools.lru_cache(maxsize=16)
+def _get_encoding(model: str) -> tiktoken.Encoding:
+    """Get the tiktoken encoding for a model, resolving each model once"""
+    if model.startswith("gpt-4"):
+        return tiktoken.encoding_for_model("gpt-4")
+    elif model.startswith("gpt-3.5"):
+        return tiktoken.encoding_for_model("gpt-3.5-turbo")
+    else:
+        # Default to cl100k_base encoding
+        return tiktoken.get_encoding("cl100k_base")
+
+
+@functools.lru_cache(maxsize=64)
+def _schema_payload(schema_json: str) -> Tuple[str, Dict[str, Any]]:
+    """Build the pretty-printed schema and function definition for a schema.
+
+    Callers pass the schema as canonical (key-sorted) JSON from schema_json,
+    so repeated calls with the same output schema reuse one serialization. The returned dict is
+    shared and must not be modified.
+    """
+    schema = orjson.loads(schema_json)
+    function_def = {
+        "name": "structured_output",
+        "description": "Generate structured output",
+        "parameters": schema
+    }
+    return orjson.dumps(schema, option=orjson.OPT_INDENT_2).decode(), function_def
+
+
+def _translate_openai_error(error: openai.OpenAIError) -> Exception:
+    """Map an OpenAI SDK error to the provider-agnostic LLM error types"""
+    if isinstance(error, openai.RateLimitError):
+        logger.error(f"OpenAI rate limit error: {str(error)}")
+        return RateLimitError(f"Rate limit exceeded: {str(error)}")
+
+    if isinstance(error, openai.AuthenticationError):
+        logger.error(f"OpenAI authentication error: {str(error)}")
+        return AuthenticationError(f"Authentication failed: {str(error)}")
+
+    if isinstance(error, openai.BadRequestError):
+        if "maximum context length" in str(error):
+            return TokenLimitError(f"Token limit exceeded: {str(error)}")
+        return ValueError(f"Invalid request: {str(error)}")
+
+    if isinstance(error, openai.APITimeoutError):
+        logger.error(f"OpenAI request timed out: {str(error)}")
+        return asyncio.TimeoutError(f"Request timed out: {str(error)}")
+
+    logger.error(f"OpenAI API error: {str(error)}")
+    return error
+
+
+def _translate_openai_errors(fn):
+    """Decorate an OpenAIService call to raise LLM errors instead of SDK errors.
+
+    The provider's exception is kept as the cause, so retry_with_backoff can
+    still read its Retry-After header.
+    """
+    @functools.wraps(fn)
+    async def wrapper(*args, **kwargs):
+        try:
+            return await fn(*args, **kwargs)
+        except openai.OpenAIError as e:
+            translated = _translate_openai_error(e)
+            if translated is e:
+                raise
+            raise translated from e
+
+    return wrapper
+
+
+def _to_openai_messages(messages: List[ChatMessage]) -> List[Dict[str, str]]:
+    """Build OpenAI message dicts directly, without pydantic serialization"""
+    return [{"role": msg.role, "content": msg.content} for msg in messages]
+
+
+def _usage_dict(usage: Any) -> Optional[Dict[str, int]]:
+    """Convert OpenAI usage to a dict, including server-side cached prompt tokens"""
+    if not usage:
+        return None
+
+    result = {
+        "prompt_tokens": usage.prompt_tokens,
+        "completion_tokens": usage.completion_tokens,
+        "total_tokens": usage.total_tokens
+    }
+
+    # Only reported by API versions with prompt caching
+    details = getattr(usage, "prompt_tokens_details", None)
+    cached_tokens = getattr(details, "cached_tokens", None) if details else None
+    if cached_tokens is not None:
+        result["cached_tokens"] = cached_tokens
+        if usage.prompt_tokens and cached_tokens / usage.prompt_tokens > 0.5:
+            logger.debug(
+                f"OpenAI prompt cache served {cached_tokens}/{usage.prompt_tokens} prompt tokens"
+            )
+
+    return result
+
+
+# Model listings per (api key, organization); the list changes rarely
+_MODELS_CACHE_TTL_SECONDS = 900
+_models_cache: Dict[Tuple[Optional[str], Optional[str]], Tuple[float, List[str]]] = {}
+_TEXT_MODEL_RE = re.compile(r"gpt-4|gpt-3\.5|text-")
+
+
+# Token counts of recently seen texts. Long texts are keyed by a content
+# hash so the cache does not hold on to whole prompts.
+_TOKEN_COUNT_CACHE_SIZE = 4096
+_SHORT_TEXT_BYTES = 64
+_token_counts: "OrderedDict[Tuple[str, Union[str, bytes]], int]" = OrderedDict()
+
+
+def _count_tokens_cached(model: str, text: str) -> int:
+    """Count tokens for text, reusing the result for repeated content"""
+    encoded = text.encode("utf-8")
+    if len(encoded) <= _SHORT_TEXT_BYTES:
+        key = (model, text)
+    else:
+        key = (model, hashlib.blake2b(encoded, digest_size=16).digest())
+
+    count = _token_counts.get(key)
+    if count is not None:
+        _token_counts.move_to_end(key)
+        return count
+
+    count = len(_get_encoding(model).encode(text))
+    _token_counts[key] = count
+    if len(_token_counts) > _TOKEN_COUNT_CACHE_SIZE:
+        _token_counts.popitem(last=False)
+    return count
+
+
 class OpenAIService(BaseLLMService):
     """OpenAI API service implementation"""
 
@@ -37,164 +179,183 @@ class OpenAIService(BaseLLMService):
     def __init__(self, api_key: Optional[str] = None, config: Optional[Dict[str, Any]] = None):
         super().__init__(api_key, config)
         self.api_key = api_key or settings.OPENAI_API_KEY
-        self.client = AsyncOpenAI(api_key=self.api_key)
         self.organization = config.get("organization") if config else None
 
-        if self.organization:
-            self.client.organization = self.organization
+        # Reuse the shared client's connection pool; with_options gives a
+        # copy for a different key or organization without touching it
+        self.client = get_openai_client()
+        if self.api_key != settings.OPENAI_API_KEY or self.organization:
+            self.client = self.client.with_options(
+                api_key=self.api_key,
+                organization=self.organization
+            )
 
-    async def generate(self, request: GenerationRequest) -> GenerationResponse:
-        """Generate text completion using OpenAI"""
-        self.validate_request(request)
+    def validate_request(self, request: Union[GenerationRequest, ChatRequest]) -> None:
+        """Validate a request, rejecting it locally if it cannot fit the model's context.
+
+        Only models with a known context window are checked, so an unlisted
+        model is left for the API to judge.
+        """
+        super().validate_request(request)
 
         model = request.model or self.default_model
+        context_window = self.MODEL_CONTEXT_WINDOWS.get(model)
+        if context_window is None:
+            return
+
+        if isinstance(request, ChatRequest):
+            texts = [msg.content for msg in request.messages]
+        else:
+            texts = [request.prompt, request.system_prompt or ""]
 
         try:
+            prompt_tokens = sum(_count_tokens_cached(model, text) for text in texts)
+        except Exception as e:
+            # Without a tokenizer the API still enforces the limit itself
+            logger.debug(f"Skipping local token budget check: {e}")
+            return
+
+        if prompt_tokens + (request.max_tokens or 0) > context_window * 0.95:
+            raise TokenLimitError(
+                f"Token limit exceeded: about {prompt_tokens} prompt tokens plus "
+                f"{request.max_tokens or 0} completion tokens for a {context_window} token context"
+            )
+
+    def build_chat_params(self, request: Union[GenerationRequest, ChatRequest]) -> Dict[str, Any]:
+        """Build chat.completions parameters for a generation or chat request"""
+        if isinstance(request, ChatRequest):
+            messages = request.messages
+        else:
             # Convert to chat format (OpenAI deprecated completions API)
             messages = self.convert_to_chat_messages(
                 request.prompt,
                 request.system_prompt
             )
 
-            # Prepare request parameters
-            params = {
-                "model": model,
-                "messages": [msg.dict() for msg in messages],
-                "temperature": request.temperature,
-                "max_tokens": request.max_tokens,
-                "top_p": request.top_p,
-                "frequency_penalty": request.frequency_penalty,
-                "presence_penalty": request.presence_penalty,
-            }
-
-            if request.stop_sequences:
-                params["stop"] = request.stop_sequences
-
-            if request.response_format == "json":
-                params["response_format"] = {"type": "json_object"}
-
-            # Make API call
-            response = await self.client.chat.completions.create(**params)
-
-            # Extract response
-            text = response.choices[0].message.content
-            usage = {
-                "prompt_tokens": response.usage.prompt_tokens,
-                "completion_tokens": response.usage.completion_tokens,
-                "total_tokens": response.usage.total_tokens
-            } if response.usage else None
+        # Unset sampling options are left out rather than sent as nulls
+        optional = {
+            "max_tokens": request.max_tokens,
+            "top_p": request.top_p,
+            "frequency_penalty": request.frequency_penalty,
+            "presence_penalty": request.presence_penalty,
+        }
+        params = {
+            "model": request.model or self.default_model,
+            "messages": _to_openai_messages(messages),
+            "temperature": request.temperature,
+            **{k: v for k, v in optional.items() if v is not None}
+        }
+
+        if request.stop_sequences:
+            params["stop"] = request.stop_sequences
+
+        if request.response_format == "json":
+            params["response_format"] = {"type": "json_object"}
+
+        return params
+
+    @_translate_openai_errors
+    async def generate(self, request: GenerationRequest) -> GenerationResponse:
+        """Generate text completion using OpenAI"""
+        self.validate_request(request)
 
-            return GenerationResponse(
-                text=text,
-                model=model,
-                provider=self.provider.value,
-                usage=usage,
-                metadata={
-                    "finish_reason": response.choices[0].finish_reason,
-                    "id": response.id
-                }
-            )
+        model = request.model or self.default_model
 
-        except openai.RateLimitError as e:
-            logger.error(f"OpenAI rate limit error: {str(e)}")
-            raise RateLimitError(f"Rate limit exceeded: {str(e)}")
+        # Prepare request parameters
+        params = self.build_chat_params(request)
 
-        except openai.AuthenticationError as e:
-            logger.error(f"OpenAI authentication error: {str(e)}")
-            raise AuthenticationError(f"Authentication failed: {str(e)}")
+        # Make API call
+        response = await self.client.chat.completions.create(**params)
 
-        except openai.BadRequestError as e:
-            if "maximum context length" in str(e):
-                raise TokenLimitError(f"Token limit exceeded: {str(e)}")
-            raise ValueError(f"Invalid request: {str(e)}")
+        # Extract response
+        text = response.choices[0].message.content
+        usage = _usage_dict(response.usage)
 
-        except Exception as e:
-            logger.error(f"OpenAI API error: {str(e)}")
-            raise
+        return GenerationResponse(
+            text=text,
+            model=model,
+            provider=self.provider.value,
+            usage=usage,
+            metadata={
+                "finish_reason": response.choices[0].finish_reason,
+                "id": response.id
+            }
+        )
 
+    @_translate_openai_errors
     async def chat(self, request: ChatRequest) -> GenerationResponse:
         """Generate chat completion using OpenAI"""
         self.validate_request(request)
 
         model = request.model or self.default_model
 
-        try:
-            # Prepare request parameters
-            params = {
-                "model": model,
-                "messages": [msg.dict() for msg in request.messages],
-                "temperature": request.temperature,
-                "max_tokens": request.max_tokens,
-                "top_p": request.top_p,
-                "frequency_penalty": request.frequency_penalty,
-                "presence_penalty": request.presence_penalty,
-            }
+        # Prepare request parameters
+        params = self.build_chat_params(request)
 
-            if request.stop_sequences:
-                params["stop"] = request.stop_sequences
+        # Make API call
+        response = await self.client.chat.completions.create(**params)
 
-            if request.response_format == "json":
-                params["response_format"] = {"type": "json_object"}
+        # Extract response
+        text = response.choices[0].message.content
+        usage = _usage_dict(response.usage)
 
-            # Make API call
-            response = await self.client.chat.completions.create(**params)
+        return GenerationResponse(
+            text=text,
+            model=model,
+            provider=self.provider.value,
+            usage=usage,
+            metadata={
+                "finish_reason": response.choices[0].finish_reason,
+                "id": response.id
+            }
+        )
 
-            # Extract response
-            text = response.choices[0].message.content
-            usage = {
-                "prompt_tokens": response.usage.prompt_tokens,
-                "completion_tokens": response.usage.completion_tokens,
-                "total_tokens": response.usage.total_tokens
-            } if response.usage else None
+    async def stream_chat(self, request: ChatRequest) -> AsyncIterator[str]:
+        """Stream chat completion text deltas from OpenAI"""
+        self.validate_request(request)
 
-            return GenerationResponse(
-                text=text,
-                model=model,
-                provider=self.provider.value,
-                usage=usage,
-                metadata={
-                    "finish_reason": response.choices[0].finish_reason,
-                    "id": response.id
-                }
+        try:
+            stream = await self.client.chat.completions.create(
+                **self.build_chat_params(request),
+                stream=True
             )
+            async for chunk in stream:
+                if chunk.choices and chunk.choices[0].delta.content:
+                    yield chunk.choices[0].delta.content
 
-        except openai.RateLimitError as e:
-            logger.error(f"OpenAI rate limit error: {str(e)}")
-            raise RateLimitError(f"Rate limit exceeded: {str(e)}")
-
-        except openai.AuthenticationError as e:
-            logger.error(f"OpenAI authentication error: {str(e)}")
-            raise AuthenticationError(f"Authentication failed: {str(e)}")
-
-        except openai.BadRequestError as e:
-            if "maximum context length" in str(e):
-                raise TokenLimitError(f"Token limit exceeded: {str(e)}")
-            raise ValueError(f"Invalid request: {str(e)}")
-
-        except Exception as e:
-            logger.error(f"OpenAI API error: {str(e)}")
-            raise
+        except openai.OpenAIError as e:
+            translated = _translate_openai_error(e)
+            if translated is e:
+                raise
+            raise translated from e
 
+    @_translate_openai_errors
     async def generate_structured(
         self,
         request: GenerationRequest,
-        schema: Dict[str, Any]
+        schema: Schema
     ) -> Dict[str, Any]:
         """Generate structured output using OpenAI function calling"""
         model = request.model or self.default_model
+        schema_text, function_def = _schema_payload(schema_json(schema))
 
         # Only certain models support function calling
         if not model.startswith(("gpt-5", "gpt-4", "gpt-3.5-turbo")):
             # Fallback to JSON mode
             request.response_format = "json"
-            prompt_with_schema = f"{request.prompt}\n\nPlease respond with valid JSON conforming to this schema:\n{json.dumps(schema, indent=2)}"
-            request.prompt = prompt_with_schema
+            # The schema goes in the system message, ahead of the per-request
+            # prompt, so it is part of the cacheable prompt prefix
+            schema_instructions = f"Please respond with valid JSON conforming to this schema:\n{schema_text}"
+            request.system_prompt = (
+                f"{request.system_prompt}\n\n{schema_instructions}"
+                if request.system_prompt else schema_instructions
+            )
 
             response = await self.generate(request)
 
             try:
-                return json.loads(response.text)
-            except json.JSONDecodeError as e:
+                return extract_json(response.text)
+            except orjson.JSONDecodeError as e:
                 logger.error(f"Failed to parse JSON response: {str(e)}")
                 raise ValueError(f"Invalid JSON in response: {str(e)}")
 
@@ -204,17 +365,10 @@ class OpenAIService(BaseLLMService):
                 request.system_prompt
             )
 
-            # Create function definition from schema
-            function_def = {
-                "name": "structured_output",
-                "description": "Generate structured output",
-                "parameters": schema
-            }
-
             # Make API call with function
             response = await self.client.chat.completions.create(
                 model=model,
-                messages=[msg.dict() for msg in messages],
+                messages=_to_openai_messages(messages),
                 functions=[function_def],
                 function_call={"name": "structured_output"},
                 temperature=request.temperature,
@@ -224,7 +378,7 @@ class OpenAIService(BaseLLMService):
             # Extract function arguments
             function_call = response.choices[0].message.function_call
             if function_call and function_call.arguments:
-                return json.loads(function_call.arguments)
+                return orjson.loads(function_call.arguments)
             else:
                 raise ValueError("No function call in response")
 
@@ -237,36 +391,84 @@ class OpenAIService(BaseLLMService):
         model = model or self.default_model
 
         try:
-            # Get encoding for model
-            if model.startswith("gpt-4"):
-                encoding = tiktoken.encoding_for_model("gpt-4")
-            elif model.startswith("gpt-3.5"):
-                encoding = tiktoken.encoding_for_model("gpt-3.5-turbo")
-            else:
-                # Default to cl100k_base encoding
-                encoding = tiktoken.get_encoding("cl100k_base")
-
-            # Count tokens
-            tokens = encoding.encode(text)
-            return len(tokens)
+            # Count tokens (encoding is CPU-bound but fast, so it stays inline)
+            return _count_tokens_cached(model, text)
 
         except Exception as e:
             logger.error(f"Token counting error: {str(e)}")
             # Rough estimate: 1 token ≈ 4 characters
             return len(text) // 4
 
+    async def submit_batch(self, bodies: List[Dict[str, Any]]) -> str:
+        """Submit chat.completions request bodies to the Batch API.
+
+        Batches are billed at half price but may take up to 24 hours. Each
+        body's custom_id is its index in the list. Returns the batch id.
+        """
+        lines = [
+            orjson.dumps({
+                "custom_id": str(index),
+                "method": "POST",
+                "url": "/v1/chat/completions",
+                "body": {key: value for key, value in body.items() if value is not None}
+            })
+            for index, body in enumerate(bodies)
+        ]
+
+        batch_file = await self.client.files.create(
+            file=("batch.jsonl", b"\n".join(lines)),
+            purpose="batch"
+        )
+        batch = await self.client.batches.create(
+            input_file_id=batch_file.id,
+            endpoint="/v1/chat/completions",
+            completion_window="24h"
+        )
+        logger.info(f"Submitted OpenAI batch {batch.id} with {len(bodies)} requests")
+        return batch.id
+
+    async def poll_batch(self, batch_id: str) -> Dict[str, Any]:
+        """Get a batch's status, and its response bodies once it has completed.
+
+        Returns {"status": ..., "results": {custom_id: body}}. A request that
+        failed has None as its body.
+        """
+        batch = await self.client.batches.retrieve(batch_id)
+        if batch.status != "completed" or not batch.output_file_id:
+            return {"status": batch.status, "results": {}}
+
+        output = await self.client.files.content(batch.output_file_id)
+        results = {}
+        for line in output.content.splitlines():
+            if not line.strip():
+                continue
+            item = orjson.loads(line)
+            response = item.get("response") or {}
+            results[item["custom_id"]] = (
+                response.get("body") if response.get("status_code") == 200 else None
+            )
+
+        return {"status": batch.status, "results": results}
+
     async def list_models(self) -> List[str]:
         """List available OpenAI models"""
         try:
+            cache_key = (self.api_key, self.organization)
+            now = time.monotonic()
+            cached = _models_cache.get(cache_key)
+            if cached and now - cached[0] < _MODELS_CACHE_TTL_SECONDS:
+                return list(cached[1])
+
             models_response = await self.client.models.list()
-            models = []
 
-            for model in models_response.data:
-                # Filter for text generation models
-                if any(prefix in model.id for prefix in ["gpt-4", "gpt-3.5", "text-"]):
-                    models.append(model.id)
+            # Filter for text generation models
+            models = sorted(
+                model.id for model in models_response.data
+                if _TEXT_MODEL_RE.search(model.id)
+            )
 
-            return sorted(models)
+            _models_cache[cache_key] = (now, models)
+            return list(models)
 
         except Exception as e:
             logger.error(f"Failed to list models: {str(e)}")
@@ -0,0 +1,79 @@
+from typing import Optional
+import asyncio
+import time
+import logging
+
+from app.core.config import settings
+
+logger = logging.getLogger(__name__)
+
+
+class _TokenBucket:
+    """Budget that refills continuously up to a per-minute capacity"""
+
+    def __init__(self, per_minute: int):
+        self.capacity = float(per_minute)
+        self.level = float(per_minute)
+        self.rate = per_minute / 60.0
+        self.updated = time.monotonic()
+
+    def wait_time(self, amount: float) -> float:
+        """Seconds until amount is available (0 if it is now)"""
+        now = time.monotonic()
+        self.level = min(self.capacity, self.level + (now - self.updated) * self.rate)
+        self.updated = now
+        amount = min(amount, self.capacity)
+        return max(0.0, (amount - self.level) / self.rate)
+
+    def consume(self, amount: float) -> None:
+        self.level -= min(amount, self.capacity)
+
+
+class RateLimiter:
+    """Client-side requests-per-minute and tokens-per-minute limiter.
+
+    Callers wait in acquire() until both budgets cover their request, in
+    arrival order, so a burst of agent calls is spread across the minute
+    instead of tripping the provider's rate limit. A limit of 0 disables
+    that budget.
+    """
+
+    def __init__(self, requests_per_minute: int = 0, tokens_per_minute: int = 0):
+        self._requests = _TokenBucket(requests_per_minute) if requests_per_minute > 0 else None
+        self._tokens = _TokenBucket(tokens_per_minute) if tokens_per_minute > 0 else None
+        self._lock = asyncio.Lock()
+
+    async def acquire(self, tokens: int = 0) -> None:
+        """Wait until one request of about `tokens` tokens fits both budgets"""
+        async with self._lock:
+            while True:
+                wait = max(
+                    self._requests.wait_time(1) if self._requests else 0.0,
+                    self._tokens.wait_time(tokens) if self._tokens else 0.0
+                )
+                if wait <= 0:
+                    break
+                logger.debug(f"Rate limiter waiting {wait:.2f}s")
+                await asyncio.sleep(wait)
+
+            if self._requests:
+                self._requests.consume(1)
+            if self._tokens:
+                self._tokens.consume(tokens)
+
+
+# Singleton instance
+_rate_limiter = None
+
+
+def get_rate_limiter() -> Optional[RateLimiter]:
+    """Get the shared LLM rate limiter, or None when no limits are configured"""
+    global _rate_limiter
+    if not (settings.LLM_REQUESTS_PER_MINUTE or settings.LLM_TOKENS_PER_MINUTE):
+        return None
+    if _rate_limiter is None:
+        _rate_limiter = RateLimiter(
+            requests_per_minute=settings.LLM_REQUESTS_PER_MINUTE,
+            tokens_per_minute=settings.LLM_TOKENS_PER_MINUTE
+        )
+    return _rate_limiter
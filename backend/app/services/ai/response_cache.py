@@ -0,0 +1,164 @@
+from abc import ABC, abstractmethod
+from typing import Any, Dict, Optional, Tuple
+from collections import OrderedDict
+from collections.abc import Mapping
+import hashlib
+import time
+import logging
+import orjson
+
+from app.core.config import settings
+
+logger = logging.getLogger(__name__)
+
+
+def _json_default(value: Any) -> Any:
+    """Serialize values orjson does not know, such as context views and ObjectIds"""
+    if isinstance(value, Mapping):
+        return dict(value)
+    return str(value)
+
+
+def make_cache_key(namespace: str, payload: Any) -> str:
+    """Build a stable cache key from a namespace and a JSON-able payload"""
+    encoded = orjson.dumps(payload, default=_json_default, option=orjson.OPT_SORT_KEYS)
+    digest = hashlib.sha256(encoded).hexdigest()
+    return f"{namespace}:{digest}"
+
+
+class CacheStrategy(ABC):
+    """Backend for caching JSON-able LLM outputs by key"""
+
+    def __init__(self, default_ttl: int = 3600):
+        self.default_ttl = default_ttl
+        self.hits = 0
+        self.misses = 0
+
+    @abstractmethod
+    async def get(self, key: str) -> Optional[Any]:
+        """Return the cached value for key, or None if missing or expired"""
+        pass
+
+    @abstractmethod
+    async def set(self, key: str, value: Any, ttl: Optional[int] = None) -> None:
+        """Store value under key for ttl seconds (default_ttl if not given)"""
+        pass
+
+    @abstractmethod
+    async def clear(self) -> None:
+        """Drop all cached entries"""
+        pass
+
+    def _record(self, value: Optional[Any]) -> Optional[Any]:
+        """Count a lookup as a hit or a miss and pass the value through"""
+        if value is None:
+            self.misses += 1
+        else:
+            self.hits += 1
+        return value
+
+    def stats(self) -> Dict[str, Any]:
+        """Return hit/miss counters and hit rate"""
+        lookups = self.hits + self.misses
+        return {
+            "hits": self.hits,
+            "misses": self.misses,
+            "hit_rate": self.hits / lookups if lookups else 0.0
+        }
+
+
+class InMemoryLRUCache(CacheStrategy):
+    """Exact-match response cache with LRU eviction and per-entry TTL"""
+
+    def __init__(self, max_entries: int = 1024, default_ttl: int = 3600):
+        super().__init__(default_ttl)
+        self.max_entries = max_entries
+        self._entries: "OrderedDict[str, Tuple[float, Any]]" = OrderedDict()
+
+    async def get(self, key: str) -> Optional[Any]:
+        entry = self._entries.get(key)
+        if entry is None:
+            return self._record(None)
+
+        expires_at, value = entry
+        if expires_at < time.monotonic():
+            del self._entries[key]
+            return self._record(None)
+
+        self._entries.move_to_end(key)
+        return self._record(value)
+
+    async def set(self, key: str, value: Any, ttl: Optional[int] = None) -> None:
+        expires_at = time.monotonic() + (ttl if ttl is not None else self.default_ttl)
+        self._entries[key] = (expires_at, value)
+        self._entries.move_to_end(key)
+
+        while len(self._entries) > self.max_entries:
+            self._entries.popitem(last=False)
+
+    async def clear(self) -> None:
+        self._entries.clear()
+
+    def stats(self) -> Dict[str, Any]:
+        return {**super().stats(), "size": len(self._entries)}
+
+
+class RedisCache(CacheStrategy):
+    """Response cache shared across processes through Redis.
+
+    Cache failures are logged and treated as misses, so an unavailable Redis
+    never fails the LLM call itself.
+    """
+
+    def __init__(self, url: str, default_ttl: int = 3600, prefix: str = "llm-cache:"):
+        super().__init__(default_ttl)
+        import redis.asyncio as redis
+
+        self.prefix = prefix
+        self._redis = redis.from_url(url)
+
+    async def get(self, key: str) -> Optional[Any]:
+        try:
+            raw = await self._redis.get(self.prefix + key)
+        except Exception as e:
+            logger.warning(f"Redis cache get failed: {e}")
+            return self._record(None)
+        return self._record(orjson.loads(raw) if raw is not None else None)
+
+    async def set(self, key: str, value: Any, ttl: Optional[int] = None) -> None:
+        try:
+            await self._redis.set(
+                self.prefix + key,
+                orjson.dumps(value, default=_json_default),
+                ex=ttl if ttl is not None else self.default_ttl
+            )
+        except Exception as e:
+            logger.warning(f"Redis cache set failed: {e}")
+
+    async def clear(self) -> None:
+        try:
+            async for key in self._redis.scan_iter(match=self.prefix + "*"):
+                await self._redis.delete(key)
+        except Exception as e:
+            logger.warning(f"Redis cache clear failed: {e}")
+
+
+# Singleton instance
+_response_cache = None
+
+
+def get_response_cache() -> CacheStrategy:
+    """Get or create the singleton LLM response cache"""
+    global _response_cache
+    if _response_cache is None:
+        if settings.LLM_CACHE_BACKEND == "redis":
+            _response_cache = RedisCache(
+                settings.REDIS_URL,
+                default_ttl=settings.LLM_CACHE_TTL_SECONDS
+            )
+        else:
+            _response_cache = InMemoryLRUCache(
+                max_entries=settings.LLM_CACHE_MAX_ENTRIES,
+                default_ttl=settings.LLM_CACHE_TTL_SECONDS
+            )
+    return _response_cache
@@ -1,19 +1,110 @@
 """Base classes for LLM agents."""
 
 from abc import ABC, abstractmethod
-from typing import Dict, Any, TypeVar, Generic, Type, Optional
+from collections.abc import Mapping
+from typing import Dict, Any, AsyncIterator, Callable, List, Tuple, TypeVar, Generic, Type, Optional, get_args, get_origin
 from pathlib import Path
 from pydantic import BaseModel, Field
-from openai import AsyncOpenAI
+from opentelemetry import trace
+import functools
+import string
 import time
 
-from app.core.config import settings
 from app.schemas.schemas import AgentType
+from app.core import observability
 from app.core.observability import llm_metrics
 from app.services.ai.base import LLMModel
+from app.services.ai.openai_client import get_openai_client
+from app.services.llm_agents.cache import get_agent_cache, get_semantic_cache
 
 T = TypeVar('T', bound=BaseModel)
 
+PROMPTS_DIR = Path(__file__).parent / "prompts"
+
+# Separates a template's fixed instructions from its per-request context. The
+# instructions go first, in the system message, so every call of an agent
+# shares a byte-identical prefix that OpenAI's prompt cache can reuse.
+PROMPT_CONTEXT_SEPARATOR = "\n---\n"
+
+
+class PromptTemplate:
+    """A prompt template compiled once into a render function.
+
+    The template is split with string.Formatter().parse and turned into a
+    function that joins its literal pieces and field values, so format()
+    does not re-parse the template on every call. Templates that use
+    conversions, format specs or indexed fields fall back to str.format.
+    """
+
+    __slots__ = ("text", "_render")
+
+    def __init__(self, text: str):
+        self.text = text
+        self._render = self._compile(text)
+
+    @staticmethod
+    def _compile(text: str) -> Optional[Callable[..., str]]:
+        pieces = []
+        for literal, field, spec, conversion in string.Formatter().parse(text):
+            if literal:
+                pieces.append(repr(literal))
+            if field is None:
+                continue
+            if not field.isidentifier() or spec or conversion is not None:
+                return None
+            pieces.append(f"str(kwargs[{field!r}])")
+
+        # Only literals from the template file and identifier keys end up
+        # in the generated source
+        source = f"def render(**kwargs):\n    return ''.join([{', '.join(pieces)}])\n"
+        namespace: Dict[str, Any] = {}
+        exec(compile(source, "<prompt template>", "exec"), namespace)
+        return namespace["render"]
+
+    def format(self, **kwargs: Any) -> str:
+        if self._render is None:
+            return self.text.format(**kwargs)
+        return self._render(**kwargs)
+
+    def __str__(self) -> str:
+        return self.text
+
+
+@functools.lru_cache(maxsize=64)
+def _read_prompt(filename: str) -> PromptTemplate:
+    """Read and compile a prompt template; templates do not change at runtime.
+
+    Cached by file name, so a lookup does not build the path on every call.
+    """
+    with open(PROMPTS_DIR / filename, "r") as f:
+        return PromptTemplate(f.read())
+
+
+def reload_prompts() -> None:
+    """Drop cached prompt templates, e.g. after editing them in development."""
+    _read_prompt.cache_clear()
+
+
+def _preload_prompts() -> None:
+    """Read every template at import, so no agent call waits on the disk."""
+    for path in PROMPTS_DIR.glob("*.txt"):
+        _read_prompt(path.name)
+
+
+_preload_prompts()
+
+
+def format_character_briefs(characters: List[Dict[str, Any]]) -> str:
+    """Format character briefs as one "- name (role): description" line each."""
+    return "\n".join(
+        f"- {char['name']} ({char['role']}): {char['description']}" for char in characters
+    )
+
+
+def format_character_names(characters: List[Dict[str, Any]]) -> str:
+    """Format character names as a comma-separated list."""
+    return ", ".join(char["name"] for char in characters)
+
 
 class AgentConfig(BaseModel):
     """Agent configuration"""
@@ -23,10 +114,40 @@ class AgentConfig(BaseModel):
 class AgentParameters(BaseModel):
     """Runtime parameters"""
     temperature: float = 1.0  # gpt-5-nano only supports temperature=1
+    # Reuse cached outputs even though temperature > 0 makes them sampled
+    cache_sampled: bool = False
+
+
+class DocumentView(Mapping):
+    """Read-only mapping over a loaded document, for use in AgentContext.data
+
+    Maps context keys to model attributes on access, so building a context
+    does not copy fields into a fresh dict. Use dict(view) where a plain
+    dict is needed.
+    """
+
+    __slots__ = ("_doc", "_fields")
+
+    def __init__(self, doc: Any, fields: Dict[str, str]):
+        self._doc = doc
+        self._fields = fields
+
+    def __getitem__(self, key: str) -> Any:
+        return getattr(self._doc, self._fields[key])
+
+    def __iter__(self):
+        return iter(self._fields)
+
+    def __len__(self) -> int:
+        return len(self._fields)
 
 
 class AgentContext(BaseModel):
-    """Context for agent execution"""
+    """Context for agent execution
+
+    AgentManager assembles data itself and builds contexts with
+    model_construct, so the nested data is neither validated nor copied.
+    """
     project_id: str
     user_id: str
     data: Dict[str, Any] = Field(default_factory=dict)
@@ -40,30 +161,172 @@ class BaseAgent(ABC, Generic[T]):
     output_schema: Type[T]
     config: AgentConfig = AgentConfig()
 
+    # JSON schema response_format for output_schema, built once per class
+    response_format: Dict[str, Any]
+
+    # Span attributes that are the same for every call of a class, passed
+    # in one go when the spans start
+    _span_attributes: Dict[str, Any] = {
+        "agent.type": "unknown",
+        "agent.model": config.model,
+        "agent.provider": "openai"
+    }
+    _llm_span_attributes: Dict[str, Any] = {
+        "llm.model": config.model,
+        "llm.provider": "openai"
+    }
+
+    def __init_subclass__(cls, **kwargs):
+        super().__init_subclass__(**kwargs)
+        agent_type = getattr(cls, "agent_type", None)
+        cls._span_attributes = {
+            "agent.type": agent_type.value if agent_type else "unknown",
+            "agent.model": cls.config.model,
+            "agent.provider": "openai"
+        }
+        cls._llm_span_attributes = {
+            "llm.model": cls.config.model,
+            "llm.provider": "openai"
+        }
+
+        schema = cls.__dict__.get("output_schema")
+        if schema is not None:
+            cls.response_format = {
+                "type": "json_schema",
+                "json_schema": {
+                    "name": schema.__name__,
+                    "schema": schema.model_json_schema()
+                }
+            }
+
     def __init__(self, context: AgentContext, parameters: AgentParameters = None):
         self.context = context
         self.parameters = parameters or AgentParameters()
-        # Initialize OpenAI client once
-        self.client = AsyncOpenAI(api_key=settings.OPENAI_API_KEY)
+        # Shared client, so agents reuse pooled connections
+        self.client = get_openai_client()
+        self._prompt: Optional[str] = None
+
+    @classmethod
+    async def run_many(
+        cls,
+        contexts: List[AgentContext],
+        concurrency: int = 16,
+        parameters: AgentParameters = None
+    ) -> List[Any]:
+        """Run this agent once per context, concurrently.
+
+        See run_agents: results are in context order, and a failed run
+        leaves its exception in place of a result.
+        """
+        from app.services.llm_agents.batch import run_agents
+
+        agents = [
+            cls(context, parameters.model_copy() if parameters else None)
+            for context in contexts
+        ]
+        return await run_agents(agents, max_concurrency=concurrency)
+
+    @staticmethod
+    async def execute_batch(agents: List["BaseAgent"], poll_interval: float = 60.0) -> List[Any]:
+        """Execute agents through the half-price Batch API and wait for them.
+
+        Latency-tolerant bulk work only: a batch can take up to 24 hours.
+        Use execute or run_many when a user is waiting.
+        """
+        from app.services.llm_agents.batch import execute_agents_batch
+
+        return await execute_agents_batch(agents, poll_interval=poll_interval)
 
     @abstractmethod
     async def build_prompt(self) -> str:
         """Build the prompt for the LLM"""
         pass
 
-    def load_prompt_template(self, filename: str) -> str:
-        """Load prompt template from file."""
-        prompt_path = Path(__file__).parent / "prompts" / filename
-        with open(prompt_path, "r") as f:
-            return f.read()
+    async def get_prompt(self) -> str:
+        """Return the prompt, building it on first use.
+
+        The context does not change over an agent's lifetime, so retried
+        or repeated calls on the same instance reuse the built prompt.
+        """
+        if self._prompt is None:
+            self._prompt = await self.build_prompt()
+        return self._prompt
+
+    @staticmethod
+    def build_messages(prompt: str) -> List[Dict[str, str]]:
+        """Split a built prompt into a stable system message and a user message."""
+        instructions, separator, context = prompt.partition(PROMPT_CONTEXT_SEPARATOR)
+        if not separator:
+            return [{"role": "user", "content": prompt}]
+        return [
+            {"role": "system", "content": instructions.strip()},
+            {"role": "user", "content": context.strip()}
+        ]
+
+    def _cache_key(self, prompt: str) -> Optional[str]:
+        """Key this call's output in the agent cache, or None to skip the cache.
+
+        Outputs are only reused for deterministic calls (temperature 0)
+        unless the caller opted in with parameters.cache_sampled.
+        """
+        if get_agent_cache() is None:
+            return None
+        if self.parameters.temperature != 0 and not self.parameters.cache_sampled:
+            return None
+        return get_agent_cache().key(
+            self.config.model,
+            self.parameters.temperature,
+            self.output_schema,
+            prompt
+        )
+
+    def _cache_scope(self) -> tuple:
+        """Scope for semantic matches, so agents never share outputs"""
+        return (
+            self.agent_type.value,
+            self.config.model,
+            self.output_schema.__name__,
+            self.parameters.temperature
+        )
+
+    async def _cached_output(
+        self,
+        key: Optional[str],
+        prompt: str
+    ) -> Tuple[Optional[T], Optional[List[float]]]:
+        """Look up an exact, then a semantic, cached output.
+
+        Also returns the prompt's embedding from the semantic lookup, if
+        there was one, for _cache_output to store.
+        """
+        if key is None:
+            return None, None
+
+        cached = await get_agent_cache().get(key, self.output_schema)
+        semantic = get_semantic_cache()
+        if cached is not None or semantic is None:
+            return cached, None
+        return await semantic.lookup(self._cache_scope(), prompt, self.output_schema)
+
+    async def _cache_output(
+        self,
+        key: Optional[str],
+        result: Optional[T],
+        embedding: Optional[List[float]]
+    ) -> None:
+        if key is None or result is None:
+            return
+        await get_agent_cache().set(key, result)
+        if embedding is not None:
+            get_semantic_cache().store(self._cache_scope(), embedding, result)
+
+    def load_prompt_template(self, filename: str) -> PromptTemplate:
+        """Load prompt template from file (read once, then cached)."""
+        return _read_prompt(filename)
 
     async def execute(self) -> T:
         """Execute the agent using OpenAI's structured output with tracing"""
-        # Import tracer at execution time to ensure it's initialized
-        from app.core import observability
-        from opentelemetry import trace
-
-        # Get the current tracer (will be set if setup_tracing was called)
+        # Read the tracer at call time (it is set once setup_tracing runs)
         tracer = observability.tracer
 
         # Use global tracer if available, otherwise no-op
@@ -72,40 +335,44 @@ class BaseAgent(ABC, Generic[T]):
 
         with tracer.start_as_current_span(
             f"agent.{self.agent_type.value if self.agent_type else 'unknown'}",
-            kind=trace.SpanKind.CLIENT
+            kind=trace.SpanKind.CLIENT,
+            attributes=self._span_attributes
         ) as span:
             start_time = time.time()
 
-            # Set initial span attributes
-            span.set_attribute("agent.type", self.agent_type.value if self.agent_type else "unknown")
-            span.set_attribute("agent.model", self.config.model)
-            span.set_attribute("agent.provider", "openai")
             span.set_attribute("agent.temperature", self.parameters.temperature)
 
             try:
                 # Build prompt
-                prompt = await self.build_prompt()
+                prompt = await self.get_prompt()
                 prompt_length = len(prompt)
 
                 span.set_attribute("agent.prompt_length", prompt_length)
-                # Store full prompt in span for tracing
-                span.set_attribute("agent.prompt_full", prompt)
+
+                cache_key = self._cache_key(prompt)
+                cached, embedding = await self._cached_output(cache_key, prompt)
+                span.set_attribute("agent.cache_hit", cached is not None)
+                if cached is not None:
+                    span.set_attribute("agent.success", True)
+                    span.set_status(trace.Status(trace.StatusCode.OK))
+                    return cached
 
                 # Call OpenAI with nested span (using global tracer)
                 with tracer.start_as_current_span(
                     "openai.chat.completions.parse",
-                    kind=trace.SpanKind.CLIENT
+                    kind=trace.SpanKind.CLIENT,
+                    attributes=self._llm_span_attributes
                 ) as openai_span:
-                    openai_span.set_attribute("llm.model", self.config.model)
                     openai_span.set_attribute("llm.temperature", self.parameters.temperature)
-                    openai_span.set_attribute("llm.provider", "openai")
-                    openai_span.set_attribute("llm.prompt", prompt)
+                    # Store full prompt once, on the API span, for tracing
+                    if openai_span.is_recording():
+                        openai_span.set_attribute("llm.prompt", prompt)
 
                     api_start = time.time()
 
                     completion = await self.client.beta.chat.completions.parse(
                         model=self.config.model,
-                        messages=[{"role": "user", "content": prompt}],
+                        messages=self.build_messages(prompt),
                         response_format=self.output_schema,
                         temperature=self.parameters.temperature
                     )
@@ -114,38 +381,36 @@ class BaseAgent(ABC, Generic[T]):
                     openai_span.set_attribute("llm.duration_seconds", api_duration)
 
                     # Track token usage
-                    if hasattr(completion, 'usage') and completion.usage:
-                        openai_span.set_attribute("llm.tokens.prompt", completion.usage.prompt_tokens)
-                        openai_span.set_attribute("llm.tokens.completion", completion.usage.completion_tokens)
-                        openai_span.set_attribute("llm.tokens.total", completion.usage.total_tokens)
+                    usage = completion.usage
+                    if usage is not None:
+                        openai_span.set_attribute("llm.tokens.prompt", usage.prompt_tokens)
+                        openai_span.set_attribute("llm.tokens.completion", usage.completion_tokens)
+                        openai_span.set_attribute("llm.tokens.total", usage.total_tokens)
 
                         # Also set on parent span
-                        span.set_attribute("tokens.prompt", completion.usage.prompt_tokens)
-                        span.set_attribute("tokens.completion", completion.usage.completion_tokens)
-                        span.set_attribute("tokens.total", completion.usage.total_tokens)
-
-                    # Store the parsed response (structured output) as JSON string
-                    if hasattr(completion.choices[0].message, 'parsed') and completion.choices[0].message.parsed:
-                        import json
-                        response_dict = completion.choices[0].message.parsed.dict() if hasattr(completion.choices[0].message.parsed, 'dict') else {}
-                        openai_span.set_attribute("llm.response_structured", json.dumps(response_dict, default=str))
-
-                    # Also store raw text if available
-                    if hasattr(completion.choices[0].message, 'content') and completion.choices[0].message.content:
-                        openai_span.set_attribute("llm.response_raw", completion.choices[0].message.content)
+                        span.set_attribute("tokens.prompt", usage.prompt_tokens)
+                        span.set_attribute("tokens.completion", usage.completion_tokens)
+                        span.set_attribute("tokens.total", usage.total_tokens)
+
+                    message = completion.choices[0].message
+                    parsed = message.parsed
+
+                    # Store the response once, on the API span only. The raw
+                    # content already is the structured output's JSON, so the
+                    # parsed model is only serialized when there is none.
+                    if openai_span.is_recording():
+                        if message.content:
+                            openai_span.set_attribute("llm.response_raw", message.content)
+                        elif parsed is not None:
+                            openai_span.set_attribute("llm.response_structured", parsed.model_dump_json())
 
                 # Track metrics
                 duration = time.time() - start_time
 
-                # Extract token usage if available
-                tokens_used = 0
-                if hasattr(completion, 'usage') and completion.usage:
-                    tokens_used = completion.usage.total_tokens
-
                 # Record metrics
                 llm_metrics.record_request(
                     model=self.config.model,
-                    tokens=tokens_used,
+                    tokens=usage.total_tokens if usage is not None else 0,
                     duration=duration,
                     success=True
                 )
@@ -153,16 +418,10 @@ class BaseAgent(ABC, Generic[T]):
                 span.set_attribute("agent.success", True)
                 span.set_attribute("agent.duration_seconds", duration)
 
-                # Store the result in the parent span too
-                if completion.choices[0].message.parsed:
-                    import json
-                    result = completion.choices[0].message.parsed
-                    result_dict = result.dict() if hasattr(result, 'dict') else {}
-                    span.set_attribute("agent.response", json.dumps(result_dict, default=str))
-
                 span.set_status(trace.Status(trace.StatusCode.OK))
 
-                return completion.choices[0].message.parsed
+                await self._cache_output(cache_key, parsed, embedding)
+                return parsed
 
             except Exception as e:
                 duration = time.time() - start_time
@@ -184,15 +443,97 @@ class BaseAgent(ABC, Generic[T]):
 
                 raise
 
+    @classmethod
+    def _item_field(cls) -> Tuple[str, Type[BaseModel]]:
+        """The output schema's list field and its item model, for streaming"""
+        fields = [
+            (name, get_args(field.annotation)[0])
+            for name, field in cls.output_schema.model_fields.items()
+            if get_origin(field.annotation) in (list, List)
+            and get_args(field.annotation)
+            and isinstance(get_args(field.annotation)[0], type)
+            and issubclass(get_args(field.annotation)[0], BaseModel)
+        ]
+        if len(fields) != 1:
+            raise TypeError(f"{cls.output_schema.__name__} has no single list field to stream")
+        return fields[0]
+
+    async def stream_items(self) -> AsyncIterator[BaseModel]:
+        """Yield the items of the output's list field as each one completes.
+
+        For list agents (scenes, panels, ...): uses OpenAI's streaming
+        structured output, so a caller can start work on the first item
+        while the rest are still being generated. An item is yielded once
+        the model has moved on to the next one; the last comes with the
+        final completion, which is also what gets cached.
+        """
+        field, item_model = self._item_field()
+        start_time = time.time()
+        prompt = await self.get_prompt()
+
+        cache_key = self._cache_key(prompt)
+        cached, embedding = await self._cached_output(cache_key, prompt)
+        if cached is not None:
+            for item in getattr(cached, field):
+                yield item
+            return
+
+        emitted = 0
+        try:
+            async with self.client.beta.chat.completions.stream(
+                model=self.config.model,
+                messages=self.build_messages(prompt),
+                response_format=self.output_schema,
+                temperature=self.parameters.temperature
+            ) as stream:
+                async for event in stream:
+                    if event.type != "content.delta" or not event.parsed:
+                        continue
+                    items = event.parsed.get(field) or []
+                    # Every item but the last is complete
+                    while emitted < len(items) - 1:
+                        yield item_model.model_validate(items[emitted])
+                        emitted += 1
+
+                completion = await stream.get_final_completion()
+
+        except Exception:
+            llm_metrics.record_request(
+                model=self.config.model,
+                tokens=0,
+                duration=time.time() - start_time,
+                success=False
+            )
+            raise
+
+        parsed = completion.choices[0].message.parsed
+        llm_metrics.record_request(
+            model=self.config.model,
+            tokens=completion.usage.total_tokens if completion.usage else 0,
+            duration=time.time() - start_time,
+            success=True
+        )
+        await self._cache_output(cache_key, parsed, embedding)
+
+        for item in getattr(parsed, field)[emitted:]:
+            yield item
+
     async def _execute_without_tracing(self) -> T:
         """Execute the agent without tracing (fallback)"""
-        prompt = await self.build_prompt()
+        prompt = await self.get_prompt()
+
+        cache_key = self._cache_key(prompt)
+        cached, embedding = await self._cached_output(cache_key, prompt)
+        if cached is not None:
+            return cached
 
         completion = await self.client.beta.chat.completions.parse(
             model=self.config.model,
-            messages=[{"role": "user", "content": prompt}],
+            messages=self.build_messages(prompt),
             response_format=self.output_schema,
             temperature=self.parameters.temperature
         )
 
-        return completion.choices[0].message.parsed
\ No newline at end of file
+        parsed = completion.choices[0].message.parsed
+        await self._cache_output(cache_key, parsed, embedding)
+        return parsed
\ No newline at end of file
@@ -0,0 +1,114 @@
+"""Concurrent execution of independent agents."""
+
+from typing import Any, List, Optional, Sequence, Union
+import asyncio
+
+from app.services.ai.base import LLMError
+from app.services.ai.llm_client import get_llm_client
+from app.services.ai.rate_limit import get_rate_limiter
+from app.services.llm_agents.base import BaseAgent
+
+
+# Batch statuses after which no results will arrive
+_FAILED_BATCH_STATUSES = ("failed", "expired", "cancelling", "cancelled")
+
+
+async def run_agents(
+    agents: Sequence[BaseAgent],
+    *,
+    max_concurrency: int = 16
+) -> List[Union[Any, BaseException]]:
+    """Execute agents concurrently, at most max_concurrency at a time.
+
+    Results come back in the order of the agents. A failing agent does not
+    cancel the others: its slot holds the raised exception instead, so
+    callers keep the partial results. When LLM rate limits are configured,
+    each call first waits for its share of the per-minute budgets.
+    """
+    semaphore = asyncio.Semaphore(max_concurrency)
+    limiter = get_rate_limiter()
+
+    async def run(agent: BaseAgent) -> Any:
+        async with semaphore:
+            if limiter is not None:
+                # Rough prompt size, as in the token counter's fallback
+                await limiter.acquire(tokens=len(await agent.get_prompt()) // 4)
+            return await agent.execute()
+
+    return await asyncio.gather(
+        *(run(agent) for agent in agents),
+        return_exceptions=True
+    )
+
+
+async def submit_agents_batch(agents: Sequence[BaseAgent]) -> str:
+    """Submit agents to the OpenAI Batch API instead of executing them now.
+
+    For bulk work that can wait (up to 24 hours) in exchange for half-price
+    tokens. Returns the batch id for collect_agents_batch.
+    """
+    bodies = []
+    for agent in agents:
+        prompt = await agent.get_prompt()
+        bodies.append({
+            "model": agent.config.model,
+            "messages": agent.build_messages(prompt),
+            "temperature": agent.parameters.temperature,
+            "response_format": agent.response_format
+        })
+
+    return await get_llm_client().submit_batch_bodies(bodies)
+
+
+async def collect_agents_batch(
+    agents: Sequence[BaseAgent],
+    batch_id: str
+) -> Optional[List[Union[Any, BaseException]]]:
+    """Collect the outputs of a submitted agent batch, in agent order.
+
+    Returns None while the batch is still running, and raises LLMError if
+    it failed, expired or was cancelled. As with run_agents, a request that
+    failed or did not parse leaves an exception in its slot.
+    """
+    batch = await get_llm_client().poll_batch(batch_id)
+    if batch["status"] in _FAILED_BATCH_STATUSES:
+        raise LLMError(f"Batch {batch_id} ended with status {batch['status']}")
+    if batch["status"] != "completed":
+        return None
+
+    outputs: List[Union[Any, BaseException]] = []
+    for index, agent in enumerate(agents):
+        body = batch["results"].get(str(index))
+        try:
+            if body is None:
+                raise ValueError(f"Batch request {index} failed")
+            content = body["choices"][0]["message"]["content"]
+            outputs.append(agent.output_schema.model_validate_json(content))
+        except Exception as e:
+            outputs.append(e)
+
+    return outputs
+
+
+async def execute_agents_batch(
+    agents: Sequence[BaseAgent],
+    *,
+    poll_interval: float = 60.0,
+    timeout: Optional[float] = None
+) -> List[Union[Any, BaseException]]:
+    """Run agents through the Batch API and wait for their outputs.
+
+    Submits the batch, then polls every poll_interval seconds until it
+    completes. Meant for background bulk generation; with a timeout, raises
+    asyncio.TimeoutError if the batch has not finished in time.
+    """
+    batch_id = await submit_agents_batch(agents)
+
+    async def wait() -> List[Union[Any, BaseException]]:
+        while True:
+            outputs = await collect_agents_batch(agents, batch_id)
+            if outputs is not None:
+                return outputs
+            await asyncio.sleep(poll_interval)
+
+    return await asyncio.wait_for(wait(), timeout)
@@ -0,0 +1,181 @@
+"""Cache of agent outputs, keyed by what the model is actually sent."""
+
+from typing import Dict, List, Optional, Tuple, Type, TypeVar
+from collections import OrderedDict
+from pydantic import BaseModel
+import itertools
+import logging
+import math
+import operator
+import time
+
+from app.core.config import settings
+from app.services.ai.openai_client import get_openai_client
+from app.services.ai.response_cache import CacheStrategy, get_response_cache, make_cache_key
+
+logger = logging.getLogger(__name__)
+
+T = TypeVar('T', bound=BaseModel)
+
+
+class LLMCache:
+    """Agent output cache over a response cache backend.
+
+    Entries are keyed by (model, temperature, output schema, prompt), so
+    any change to the prompt or its template is a miss. Outputs are stored
+    as JSON and validated back into the output schema on a hit.
+    """
+
+    def __init__(self, backend: CacheStrategy, ttl: Optional[int] = None):
+        self.backend = backend
+        self.ttl = ttl
+
+    @staticmethod
+    def key(model: str, temperature: float, schema: Type[BaseModel], prompt: str) -> str:
+        return make_cache_key("agent", {
+            "m": model,
+            "t": temperature,
+            "s": schema.__name__,
+            "p": prompt
+        })
+
+    async def get(self, key: str, schema: Type[T]) -> Optional[T]:
+        cached = await self.backend.get(key)
+        if cached is None:
+            return None
+        try:
+            return schema.model_validate_json(cached)
+        except ValueError as e:
+            # E.g. written before the schema changed; treat as a miss
+            logger.warning(f"Discarding unreadable agent cache entry: {e}")
+            return None
+
+    async def set(self, key: str, result: BaseModel) -> None:
+        await self.backend.set(key, result.model_dump_json(), ttl=self.ttl)
+
+
+def _normalize(vector: List[float]) -> List[float]:
+    norm = math.sqrt(sum(x * x for x in vector)) or 1.0
+    return [x / norm for x in vector]
+
+
+def _dot(a: List[float], b: List[float]) -> float:
+    return sum(map(operator.mul, a, b))
+
+
+class SemanticLLMCache:
+    """Second cache tier that matches prompts by embedding similarity.
+
+    Consulted after an exact-match miss: the prompt is embedded and
+    compared with earlier prompts of the same scope (agent type, model,
+    schema, temperature), and the output of the closest one is reused if
+    its cosine similarity reaches the threshold. Entries are held in
+    process, per scope, with LRU eviction and a TTL.
+    """
+
+    def __init__(
+        self,
+        threshold: float = 0.92,
+        max_entries: int = 256,
+        ttl: int = 3600,
+        embedding_model: str = "text-embedding-3-small"
+    ):
+        self.threshold = threshold
+        self.max_entries = max_entries
+        self.ttl = ttl
+        self.embedding_model = embedding_model
+        self._ids = itertools.count()
+        # scope -> entry id -> (expires_at, unit embedding, output JSON)
+        self._scopes: Dict[Tuple, "OrderedDict[int, Tuple[float, List[float], str]]"] = {}
+
+    async def embed(self, prompt: str) -> Optional[List[float]]:
+        """Embed a prompt, or return None if the embedding call fails"""
+        try:
+            response = await get_openai_client().embeddings.create(
+                model=self.embedding_model,
+                input=prompt
+            )
+        except Exception as e:
+            logger.warning(f"Semantic cache embedding failed: {e}")
+            return None
+        return _normalize(response.data[0].embedding)
+
+    async def lookup(
+        self,
+        scope: Tuple,
+        prompt: str,
+        schema: Type[T]
+    ) -> Tuple[Optional[T], Optional[List[float]]]:
+        """Find a cached output for a similar prompt.
+
+        Returns the output (or None) and the prompt's embedding, which the
+        caller hands back to store() on a miss.
+        """
+        embedding = await self.embed(prompt)
+        if embedding is None:
+            return None, None
+
+        entries = self._scopes.get(scope)
+        if not entries:
+            return None, embedding
+
+        now = time.monotonic()
+        best_id, best_score = None, self.threshold
+        for entry_id, (expires_at, vector, _) in list(entries.items()):
+            if expires_at < now:
+                del entries[entry_id]
+                continue
+            score = _dot(embedding, vector)
+            if score >= best_score:
+                best_id, best_score = entry_id, score
+
+        if best_id is None:
+            return None, embedding
+
+        entries.move_to_end(best_id)
+        logger.debug(f"Semantic cache hit for {scope[0]} (similarity {best_score:.3f})")
+        try:
+            return schema.model_validate_json(entries[best_id][2]), embedding
+        except ValueError:
+            del entries[best_id]
+            return None, embedding
+
+    def store(self, scope: Tuple, embedding: List[float], result: BaseModel) -> None:
+        entries = self._scopes.setdefault(scope, OrderedDict())
+        entries[next(self._ids)] = (
+            time.monotonic() + self.ttl,
+            embedding,
+            result.model_dump_json()
+        )
+        while len(entries) > self.max_entries:
+            entries.popitem(last=False)
+
+
+# Singleton instances
+_agent_cache = None
+_semantic_cache = None
+
+
+def get_agent_cache() -> Optional[LLMCache]:
+    """Get the agent output cache, or None when LLM caching is disabled"""
+    global _agent_cache
+    if not settings.LLM_CACHE_ENABLED:
+        return None
+    if _agent_cache is None:
+        _agent_cache = LLMCache(get_response_cache(), ttl=settings.LLM_CACHE_TTL_SECONDS)
+    return _agent_cache
+
+
+def get_semantic_cache() -> Optional[SemanticLLMCache]:
+    """Get the semantic agent cache, or None unless it is enabled"""
+    global _semantic_cache
+    if not (settings.LLM_CACHE_ENABLED and settings.LLM_SEMANTIC_CACHE_ENABLED):
+        return None
+    if _semantic_cache is None:
+        _semantic_cache = SemanticLLMCache(
+            threshold=settings.LLM_SEMANTIC_CACHE_THRESHOLD,
+            max_entries=settings.LLM_SEMANTIC_CACHE_MAX_ENTRIES,
+            ttl=settings.LLM_CACHE_TTL_SECONDS,
+            embedding_model=settings.LLM_SEMANTIC_CACHE_EMBEDDING_MODEL
+        )
+    return _semantic_cache
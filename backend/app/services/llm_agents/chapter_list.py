@@ -1,10 +1,9 @@
 """Agent for generating chapter list from project and characters."""
 
-from app.services.llm_agents.base import BaseAgent, AgentType, AgentConfig
+from app.services.llm_agents.base import BaseAgent, AgentType, AgentConfig, format_character_briefs
 from app.services.ai.base import LLMModel
 from app.schemas.schemas import ChapterList
 
-
 class ChapterListAgent(BaseAgent[ChapterList]):
     """Generates list of chapters for the story."""
 
@@ -20,11 +19,10 @@ class ChapterListAgent(BaseAgent[ChapterList]):
         character_list = self.context.data.get("character_list", {})
         num_chapters = self.context.data.get("num_chapters", 10)
 
-        characters = character_list.get("characters", [])
-        character_text = "\n".join([
-            f"- {char['name']} ({char['role']}): {char['description']}"
-            for char in characters
-        ])
+        # Precomputed by AgentManager when the character list is shared
+        character_text = character_list.get("character_text")
+        if character_text is None:
+            character_text = format_character_briefs(character_list.get("characters", []))
 
         template = self.load_prompt_template("chapter_list.txt")
         return template.format(
@@ -0,0 +1,41 @@
+"""Agent for generating several character profiles in one call."""
+
+from app.services.llm_agents.base import BaseAgent, AgentType, AgentConfig
+from app.services.ai.base import LLMModel
+from app.schemas.schemas import CharacterProfileList
+
+
+class MultiCharacterProfileAgent(BaseAgent[CharacterProfileList]):
+    """Generates detailed profiles for a list of characters at once.
+
+    One request instead of one CharacterProfileAgent call per character,
+    which matters when the request-per-minute limit binds before tokens do.
+    The shared instructions and story context are sent once.
+    """
+
+    agent_type = AgentType.CHARACTER_PROFILE
+    name = "Character Profiles Generator"
+    output_schema = CharacterProfileList
+
+    config = AgentConfig(model=LLMModel.GPT_5_NANO.value)
+
+    async def build_prompt(self) -> str:
+        """Build prompt from the characters and project context."""
+        characters = self.context.data.get("characters", [])
+        project_summary = self.context.data.get("project_summary", {})
+
+        listing = "\n\n".join(
+            f"{i}. Character: {char.get('name', 'Unknown')}\n"
+            f"   Role: {char.get('role', 'Unknown')}\n"
+            f"   Brief: {char.get('description', 'No description')}"
+            for i, char in enumerate(characters, start=1)
+        )
+
+        template = self.load_prompt_template("character_profiles.txt")
+        return template.format(
+            count=len(characters),
+            characters=listing,
+            title=project_summary.get('title', 'Unknown'),
+            genre=project_summary.get('genre', 'Unknown'),
+            story_description=project_summary.get('description', 'No description')
+        )
@@ -1,6 +1,6 @@
 """Agent for generating panel list from scene context."""
 
-from app.services.llm_agents.base import BaseAgent, AgentType, AgentConfig
+from app.services.llm_agents.base import BaseAgent, AgentType, AgentConfig, format_character_names
 from app.services.ai.base import LLMModel
 from app.schemas.schemas import PanelList
 
@@ -21,8 +21,10 @@ class PanelListAgent(BaseAgent[PanelList]):
         character_list = self.context.data.get("character_list", {})
         num_panels = self.context.data.get("num_panels", 6)
 
-        characters = character_list.get("characters", [])
-        character_names = ', '.join([char['name'] for char in characters])
+        # Precomputed by AgentManager when the character list is shared
+        character_names = character_list.get("character_names")
+        if character_names is None:
+            character_names = format_character_names(character_list.get("characters", []))
 
         template = self.load_prompt_template("panel_list.txt")
         return template.format(
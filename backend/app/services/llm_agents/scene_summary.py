@@ -20,10 +20,10 @@ class SceneSummaryAgent(BaseAgent[SceneSummary]):
         panels = self.context.data.get("panels", [])
         chapter = self.context.data.get("chapter", {})
 
-        panel_text = "\n".join([
+        panel_text = "\n".join(
             f"Panel {p['number']} ({p['shot_type']}): {p['description']}"
             for p in panels
-        ])
+        )
 
         template = self.load_prompt_template("scene_summary.txt")
         return template.format(
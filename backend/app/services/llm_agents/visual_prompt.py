@@ -68,23 +68,10 @@ class VisualPromptAgent(BaseAgent[ImagePrompt]):
         project_summary = self.context.data.get("project_summary", {})
         visual_style = self.context.data.get("visual_style", "comic book art")
 
-        # For now, use a simple template inline since we don't have a location prompt file yet
-        return f"""Create an image generation prompt for a location establishing shot:
-
-Genre: {project_summary.get('genre', 'Unknown')}
-Visual Style: {visual_style}
-
-Location: {location.get('name', 'Unknown')}
-Description: {location.get('description', 'No description')}
-
-Generate:
-1. A detailed image prompt for an establishing shot that shows:
-   - Wide view of the location
-   - Architectural or environmental details
-   - Atmosphere and mood
-   - Time of day and lighting
-   - Art style consistent with the genre
-
-2. A negative prompt listing things to avoid
-
-The prompt should create a cinematic establishing shot."""
\ No newline at end of file
+        template = self.load_prompt_template("visual_prompt_location.txt")
+        return template.format(
+            genre=project_summary.get('genre', 'Unknown'),
+            visual_style=visual_style,
+            name=location.get('name', 'Unknown'),
+            description=location.get('description', 'No description')
+        )
\ No newline at end of file
@@ -6,11 +6,11 @@ from typing import Generator, AsyncGenerator
 from pymongo import MongoClient
 from pymongo.database import Database
 import os
-from datetime import datetime
+from datetime import datetime, timedelta, timezone
 
 from app.core.config import settings
 from app.db.database import MongoDB
-from app.models import User, Project, Chapter, Scene, Panel
+from app.models import User, Project, Chapter, Scene, Panel, Character
 
 
 # Override settings for testing
@@ -72,11 +72,11 @@ async def test_project(test_db, test_user) -> Project:
     from app.db.repositories.project import project_repository
 
     project = Project(
-        name="Test Graphic Novel",
-        description="A test project for unit testing",
-        owner_id=test_user.id,
+        user_id=test_user.id,
+        title="Test Graphic Novel",
         genre="Science Fiction",
-        target_audience="Young Adults"
+        description="A test project for unit testing",
+        user_input="A story about a city that never sleeps"
     )
     created_project = await project_repository.create(project)
     return created_project
@@ -91,7 +91,7 @@ async def test_chapter(test_db, test_project) -> Chapter:
         project_id=test_project.id,
         chapter_number=1,
         title="The Beginning",
-        description="The first chapter of our story"
+        summary="The first chapter of our story"
     )
     created_chapter = await chapter_repository.create(chapter)
     return created_chapter
@@ -107,9 +107,7 @@ async def test_scene(test_db, test_project, test_chapter) -> Scene:
         chapter_id=test_chapter.id,
         scene_number=1,
         title="Opening Scene",
-        setting="A futuristic city at dawn",
-        mood="Mysterious",
-        scene_type="establishing"
+        description="A futuristic city at dawn, mysterious and quiet"
     )
     created_scene = await scene_repository.create(scene)
     return created_scene
@@ -125,11 +123,9 @@ async def test_panel(test_db, test_project, test_chapter, test_scene) -> Panel:
         chapter_id=test_chapter.id,
         scene_id=test_scene.id,
         panel_number=1,
+        shot_type="wide",
         description="Wide shot of the city skyline with hovering vehicles",
-        panel_type="wide_shot",
-        dialogue=[
-            {"character": "Narrator", "text": "The year is 2150..."}
-        ],
+        dialogue="The year is 2150...",
         narration="The city never sleeps."
     )
     created_panel = await panel_repository.create(panel)
@@ -144,9 +140,11 @@ async def sample_hierarchy(test_db, test_user):
 
     # Create project
     project = Project(
-        name="Complex Project",
+        user_id=test_user.id,
+        title="Complex Project",
+        genre="Fantasy",
         description="A project with full hierarchy",
-        owner_id=test_user.id
+        user_input="A sprawling fantasy epic"
     )
     project = await project_repository.create(project)
 
@@ -156,7 +154,7 @@ async def sample_hierarchy(test_db, test_user):
             project_id=project.id,
             chapter_number=ch_num,
             title=f"Chapter {ch_num}",
-            description=f"Description for chapter {ch_num}"
+            summary=f"Summary for chapter {ch_num}"
         )
         chapter = await chapter_repository.create(chapter)
 
@@ -167,8 +165,7 @@ async def sample_hierarchy(test_db, test_user):
                 chapter_id=chapter.id,
                 scene_number=sc_num,
                 title=f"Scene {ch_num}.{sc_num}",
-                setting=f"Setting for scene {sc_num}",
-                scene_type="action" if sc_num == 1 else "dialogue"
+                description=f"Setting for scene {sc_num}"
             )
             scene = await scene_repository.create(scene)
 
@@ -179,20 +176,48 @@ async def sample_hierarchy(test_db, test_user):
                     chapter_id=chapter.id,
                     scene_id=scene.id,
                     panel_number=pn_num,
-                    description=f"Panel {pn_num} in scene {sc_num}",
-                    panel_type="medium_shot" if pn_num == 2 else "close_up"
+                    shot_type="medium" if pn_num == 2 else "close_up",
+                    description=f"Panel {pn_num} in scene {sc_num}"
                 )
                 await panel_repository.create(panel)
 
     return project
 
 
+@pytest.fixture
+async def sample_characters(test_db, sample_hierarchy):
+    """Create three characters for the sample project, created a minute apart."""
+    from app.db.repositories.content import CharacterRepository
+
+    character_repository = CharacterRepository()
+    characters = []
+    for offset, name in enumerate(["Ava", "Bram", "Cole"]):
+        character = await character_repository.create(Character(
+            project_id=sample_hierarchy.id,
+            name=name,
+            role="protagonist" if offset == 0 else "supporting",
+            description=f"{name} from the capital"
+        ))
+        # Spread creation times so newest-first order is unambiguous
+        character.created_at = character.created_at + timedelta(minutes=offset)
+        test_db.characters.update_one(
+            {"_id": character.id},
+            {"$set": {"created_at": character.created_at}}
+        )
+        characters.append(character)
+
+    return characters
+
+
 # Utility functions for testing
 def assert_datetime_recent(dt: datetime, seconds: int = 5):
     """Assert that a datetime is recent (within specified seconds)."""
     if dt is None:
         raise AssertionError("Datetime is None")
 
-    diff = (datetime.utcnow() - dt).total_seconds()
+    if dt.tzinfo is None:
+        dt = dt.replace(tzinfo=timezone.utc)
+
+    diff = (datetime.now(timezone.utc) - dt).total_seconds()
     if diff > seconds:
         raise AssertionError(f"Datetime {dt} is not recent (diff: {diff}s)")
\ No newline at end of file
@@ -0,0 +1,195 @@
+"""Tests for agent manager workflows."""
+
+import pytest
+from bson import ObjectId
+
+from app.models import Draft
+from app.services.agent_manager import AgentManager
+
+
+@pytest.fixture
+async def project_draft(test_db, test_user) -> Draft:
+    """Create a pending project summary draft."""
+    manager = AgentManager(test_db)
+    draft = Draft(
+        entity_type="project",
+        type="project_summary",
+        content={
+            "title": "Drafted Novel",
+            "genre": "Fantasy",
+            "description": "A drafted project"
+        },
+        metadata={"user_id": str(test_user.id), "user_input": "A fantasy story"}
+    )
+    return await manager.draft_repo.create_draft(draft)
+
+
+class TestApproveProjectDraft:
+    """Test approving a project summary draft."""
+
+    async def test_approve_creates_and_links_project(self, test_db, project_draft):
+        """Test that approval creates the project and links the draft to it."""
+        manager = AgentManager(test_db)
+
+        project_id = await manager.approve_project_draft(str(project_draft.id))
+
+        project = await manager.project_repo.get(project_id)
+        assert project is not None
+        assert project.title == "Drafted Novel"
+
+        draft = await manager.draft_repo.get(project_draft.id)
+        assert draft.status == "selected"
+        assert str(draft.project_id) == project_id
+
+    async def test_failed_insert_unlinks_draft(self, test_db, project_draft, monkeypatch):
+        """Test that a failed project insert leaves the draft pending and unlinked."""
+        manager = AgentManager(test_db)
+
+        async def failing_create(project):
+            raise RuntimeError("insert failed")
+
+        monkeypatch.setattr(manager.project_repo, "create", failing_create)
+
+        with pytest.raises(RuntimeError, match="insert failed"):
+            await manager.approve_project_draft(str(project_draft.id))
+
+        draft = await manager.draft_repo.get(project_draft.id)
+        assert draft.status == "pending"
+        assert draft.project_id is None
+        assert test_db.projects.count_documents({}) == 0
+
+    async def test_failed_link_removes_project(self, test_db, project_draft, monkeypatch):
+        """Test that a failed draft update removes the project it was meant to link."""
+        manager = AgentManager(test_db)
+
+        async def failing_update(id, update_data):
+            raise RuntimeError("update failed")
+
+        monkeypatch.setattr(manager.draft_repo, "update", failing_update)
+
+        with pytest.raises(RuntimeError, match="update failed"):
+            await manager.approve_project_draft(str(project_draft.id))
+
+        assert test_db.projects.count_documents({}) == 0
+        draft = await manager.draft_repo.get(project_draft.id)
+        assert draft.status == "pending"
+
+
+@pytest.fixture
+async def character_draft(test_db) -> Draft:
+    """Create a pending character list draft with two characters."""
+    manager = AgentManager(test_db)
+    draft = Draft(
+        project_id=ObjectId(),
+        entity_type="project",
+        type="character_list",
+        content={"characters": [
+            {"name": "Ava", "role": "protagonist", "description": "A pilot"},
+            {"name": "Bram", "role": "supporting", "description": "Her mechanic"}
+        ]}
+    )
+    return await manager.draft_repo.create_draft(draft)
+
+
+class TestApproveCharacterDraft:
+    """Test approving a character list draft."""
+
+    async def test_approve_creates_characters(self, test_db, character_draft):
+        """Test that approval creates the characters and selects the draft."""
+        manager = AgentManager(test_db)
+
+        character_ids = await manager.approve_character_draft(str(character_draft.id))
+
+        assert len(character_ids) == 2
+        assert test_db.characters.count_documents({"project_id": character_draft.project_id}) == 2
+        draft = await manager.draft_repo.get(character_draft.id)
+        assert draft.status == "selected"
+
+    async def test_failed_insert_keeps_draft_pending(self, test_db, character_draft, monkeypatch):
+        """Test that a failed character insert leaves the draft pending."""
+        manager = AgentManager(test_db)
+
+        async def failing_bulk_create(characters):
+            raise RuntimeError("insert failed")
+
+        monkeypatch.setattr(manager.character_repo, "bulk_create", failing_bulk_create)
+
+        with pytest.raises(RuntimeError, match="insert failed"):
+            await manager.approve_character_draft(str(character_draft.id))
+
+        draft = await manager.draft_repo.get(character_draft.id)
+        assert draft.status == "pending"
+        assert test_db.characters.count_documents({}) == 0
+
+    async def test_failed_select_removes_characters(self, test_db, character_draft, monkeypatch):
+        """Test that a failed draft update removes the inserted characters."""
+        manager = AgentManager(test_db)
+
+        async def failing_update(id, update_data):
+            raise RuntimeError("update failed")
+
+        monkeypatch.setattr(manager.draft_repo, "update", failing_update)
+
+        with pytest.raises(RuntimeError, match="update failed"):
+            await manager.approve_character_draft(str(character_draft.id))
+
+        assert test_db.characters.count_documents({}) == 0
+        draft = await manager.draft_repo.get(character_draft.id)
+        assert draft.status == "pending"
+
+
+class TestCharacterCache:
+    """Test the per-project character brief cache."""
+
+    @pytest.fixture
+    def briefs_query(self, test_db, monkeypatch):
+        """Replace the brief query with one that replays the given outcomes."""
+        manager = AgentManager(test_db)
+        query = {"outcomes": [], "calls": 0}
+
+        async def get_project_character_briefs(project_id):
+            outcome = query["outcomes"][query["calls"]]
+            query["calls"] += 1
+            if isinstance(outcome, Exception):
+                raise outcome
+            return outcome
+
+        monkeypatch.setattr(
+            manager.character_repo, "get_project_character_briefs", get_project_character_briefs
+        )
+        return manager, query
+
+    async def test_briefs_are_cached(self, briefs_query):
+        """Test that a successful fetch is shared by later callers."""
+        manager, query = briefs_query
+        briefs = [{"name": "Ava", "role": "protagonist", "description": "A pilot"}]
+        query["outcomes"] = [briefs]
+        project_id = str(ObjectId())
+
+        assert await manager._get_characters(project_id) == briefs
+        assert await manager._get_characters(project_id) == briefs
+        assert query["calls"] == 1
+
+    async def test_failed_fetch_is_not_cached(self, briefs_query):
+        """Test that a failed fetch raises and the next caller queries again."""
+        manager, query = briefs_query
+        briefs = [{"name": "Ava", "role": "protagonist", "description": "A pilot"}]
+        query["outcomes"] = [RuntimeError("connection lost"), briefs]
+        project_id = str(ObjectId())
+
+        with pytest.raises(RuntimeError, match="connection lost"):
+            await manager._get_characters(project_id)
+
+        assert await manager._get_characters(project_id) == briefs
+        assert query["calls"] == 2
+
+    async def test_empty_fetch_is_not_cached(self, briefs_query):
+        """Test that a project without characters is queried again next time."""
+        manager, query = briefs_query
+        briefs = [{"name": "Ava", "role": "protagonist", "description": "A pilot"}]
+        query["outcomes"] = [[], briefs]
+        project_id = str(ObjectId())
+
+        assert await manager._get_characters(project_id) == []
+        assert await manager._get_characters(project_id) == briefs
+        assert query["calls"] == 2
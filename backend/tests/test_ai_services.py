@@ -0,0 +1,675 @@
+"""Tests for the LLM client and its supporting services."""
+
+import asyncio
+import orjson
+import pytest
+from types import SimpleNamespace
+
+from app.services.ai import base, fallback, openai_client, rate_limit, response_cache
+from app.services.ai.base import (
+    AuthenticationError,
+    BaseLLMService,
+    ChatMessage,
+    ChatRequest,
+    GenerationRequest,
+    GenerationResponse,
+    LLMError,
+    LLMProvider,
+    RateLimitError,
+    _find_json_span,
+    extract_json
+)
+from app.services.ai.fallback import CircuitBreaker, CircuitState
+from app.services.ai.llm_client import LLMClient, _load_cached_response, _request_key
+from app.services.ai.rate_limit import RateLimiter
+from app.services.ai.response_cache import InMemoryLRUCache
+
+
+class FakeLLMService(BaseLLMService):
+    """A provider that answers (or fails) without any network calls."""
+
+    def __init__(self, provider: LLMProvider = LLMProvider.OPENAI, error: Exception = None, text: str = "ok"):
+        super().__init__()
+        self.provider = provider
+        self.error = error
+        self.text = text
+        self.calls = 0
+
+    async def generate(self, request):
+        self.calls += 1
+        await asyncio.sleep(0)
+        if self.error is not None:
+            raise self.error
+        return GenerationResponse(text=self.text, model="fake", provider=self.provider.value)
+
+    async def chat(self, request):
+        return await self.generate(request)
+
+    async def generate_structured(self, request, schema):
+        self.calls += 1
+        await asyncio.sleep(0)
+        return {"scenes": [{"title": self.text}]}
+
+    async def count_tokens(self, text, model=None):
+        return len(text.split())
+
+    async def list_models(self):
+        return ["fake"]
+
+
+def make_client(*services: FakeLLMService, failure_threshold: int = 5) -> LLMClient:
+    """Build an LLM client over fake services, tried in the order given."""
+    client = LLMClient()
+    client._cache = None
+    client._factories = {service.provider: (lambda s=service: s) for service in services}
+    client.services = {}
+    client.default_provider = services[0].provider
+    client._fallback_order = [service.provider for service in services]
+    client._breakers = {
+        service.provider: CircuitBreaker(service.provider.value, failure_threshold=failure_threshold)
+        for service in services
+    }
+    return client
+
+
+class TestExtractJson:
+    """Test finding and parsing JSON in LLM responses."""
+
+    def test_braces_inside_strings(self):
+        """Test that brackets inside string values do not end the span."""
+        text = 'Result: {"title": "Ends with }", "tags": ["[draft]"]} as requested'
+
+        assert _find_json_span(text) == '{"title": "Ends with }", "tags": ["[draft]"]}'
+        assert extract_json(text) == {"title": "Ends with }", "tags": ["[draft]"]}
+
+    def test_escaped_quotes(self):
+        """Test that an escaped quote does not close the string."""
+        text = 'Here you go: {"line": "She said \\"}\\" and left"} Thanks!'
+
+        assert extract_json(text) == {"line": 'She said "}" and left'}
+
+    def test_fenced_block(self):
+        """Test that a markdown code fence is unwrapped."""
+        text = 'Sure!\n```json\n{"scenes": [{"number": 1}]}\n```\nLet me know.'
+
+        assert extract_json(text) == {"scenes": [{"number": 1}]}
+
+    def test_trailing_prose(self):
+        """Test that only the first balanced value is taken."""
+        text = '[{"name": "Ava"}] I also considered {"name": "Bram"}.'
+
+        assert _find_json_span(text) == '[{"name": "Ava"}]'
+        assert extract_json(text) == [{"name": "Ava"}]
+
+    def test_whole_text(self):
+        """Test that plain JSON is parsed directly."""
+        assert extract_json('{"a": 1}') == {"a": 1}
+
+    def test_unterminated_object(self):
+        """Test that an unbalanced object yields no span and a decode error."""
+        text = 'Partial: {"title": "Cut off", "scenes": [1, 2'
+
+        assert _find_json_span(text) is None
+        with pytest.raises(orjson.JSONDecodeError):
+            extract_json(text)
+
+    def test_no_json(self):
+        """Test that text without any JSON raises a decode error."""
+        assert _find_json_span("No JSON here") is None
+        with pytest.raises(ValueError):
+            extract_json("No JSON here")
+
+
+class FlakyCall:
+    """An async callable that raises the given errors before succeeding."""
+
+    def __init__(self, *errors: BaseException):
+        self.errors = list(errors)
+        self.calls = 0
+
+    async def __call__(self):
+        self.calls += 1
+        if self.errors:
+            raise self.errors.pop(0)
+        return "done"
+
+
+@pytest.fixture
+def sleeps(monkeypatch):
+    """Record backoff delays instead of sleeping."""
+    delays = []
+
+    async def fake_sleep(delay):
+        delays.append(delay)
+
+    monkeypatch.setattr(base.asyncio, "sleep", fake_sleep)
+    return delays
+
+
+class TestRetryWithBackoff:
+    """Test retry_with_backoff delays and error handling."""
+
+    async def test_non_retryable_errors_raise_immediately(self, sleeps):
+        """Test that authentication and unlisted errors are not retried."""
+        service = FakeLLMService()
+
+        for error in (AuthenticationError("bad key"), KeyError("missing")):
+            call = FlakyCall(error)
+            with pytest.raises(type(error)):
+                await service.retry_with_backoff(call, max_retries=3)
+            assert call.calls == 1
+
+        assert sleeps == []
+
+    async def test_retries_until_success(self, sleeps):
+        """Test that a rate limit is retried with exponential backoff."""
+        service = FakeLLMService()
+        call = FlakyCall(RateLimitError("slow"), RateLimitError("slow"))
+
+        result = await service.retry_with_backoff(call, max_retries=3, initial_delay=1.0, jitter=0)
+
+        assert result == "done"
+        assert call.calls == 3
+        assert sleeps == [1.0, 2.0]
+
+    async def test_last_error_is_raised(self, sleeps):
+        """Test that the error is raised once the attempts run out."""
+        service = FakeLLMService()
+        call = FlakyCall(*(RateLimitError(f"attempt {i}") for i in range(3)))
+
+        with pytest.raises(RateLimitError, match="attempt 2"):
+            await service.retry_with_backoff(call, max_retries=3, jitter=0)
+
+        assert call.calls == 3
+        assert len(sleeps) == 2
+
+    async def test_delay_is_capped(self, sleeps):
+        """Test that exponential backoff and jitter never exceed max_delay."""
+        service = FakeLLMService()
+        call = FlakyCall(*(asyncio.TimeoutError() for _ in range(4)))
+
+        await service.retry_with_backoff(
+            call, max_retries=5, initial_delay=2.0, max_delay=5.0, jitter=1.0
+        )
+
+        assert 2.0 <= sleeps[0] <= 3.0
+        assert 4.0 <= sleeps[1] <= 5.0
+        assert sleeps[2:] == [5.0, 5.0]
+
+    async def test_retry_after_takes_precedence(self, sleeps, monkeypatch):
+        """Test that a server-advised delay replaces the computed one, up to max_delay."""
+        service = FakeLLMService()
+        advised = iter([7.0, 120.0])
+        monkeypatch.setattr(base, "_retry_after", lambda error: next(advised))
+        call = FlakyCall(RateLimitError("slow"), RateLimitError("slow"))
+
+        await service.retry_with_backoff(call, max_retries=3, max_delay=30.0, jitter=0)
+
+        assert sleeps == [7.0, 30.0]
+
+    async def test_retry_after_header_from_cause(self, sleeps):
+        """Test that the Retry-After header is read from the provider's error."""
+        service = FakeLLMService()
+        provider_error = Exception("429")
+        provider_error.response = SimpleNamespace(headers={"retry-after": "4"})
+        error = RateLimitError("slow")
+        error.__cause__ = provider_error
+
+        await service.retry_with_backoff(FlakyCall(error), max_retries=2, jitter=0)
+
+        assert sleeps == [4.0]
+
+    async def test_runs_once_without_retries(self, sleeps):
+        """Test that max_retries of zero still makes the call."""
+        service = FakeLLMService()
+
+        assert await service.retry_with_backoff(FlakyCall(), max_retries=0) == "done"
+
+        with pytest.raises(RateLimitError):
+            await service.retry_with_backoff(FlakyCall(RateLimitError("slow")), max_retries=0)
+        assert sleeps == []
+
+
+class TestOpenAIClient:
+    """Test the shared OpenAI client across event loops."""
+
+    def test_new_loop_closes_old_client(self, monkeypatch):
+        """Test that a client left on a finished loop is closed, not leaked."""
+        monkeypatch.setattr(openai_client.settings, "OPENAI_API_KEY", "test-key")
+        monkeypatch.setattr(openai_client, "_openai_client", None)
+        monkeypatch.setattr(openai_client, "_openai_client_loop", None)
+
+        async def get_client():
+            client = openai_client.get_openai_client()
+            # Let a retired client's close run before the loop finishes
+            for _ in range(5):
+                await asyncio.sleep(0)
+            return client
+
+        first = asyncio.run(get_client())
+        second = asyncio.run(get_client())
+
+        assert second is not first
+        assert first._client.is_closed
+        assert not second._client.is_closed
+        asyncio.run(openai_client.close_openai_client())
+
+    async def test_same_loop_reuses_client(self, monkeypatch):
+        """Test that callers on one loop share a single client."""
+        monkeypatch.setattr(openai_client.settings, "OPENAI_API_KEY", "test-key")
+        monkeypatch.setattr(openai_client, "_openai_client", None)
+        monkeypatch.setattr(openai_client, "_openai_client_loop", None)
+
+        client = openai_client.get_openai_client()
+
+        assert openai_client.get_openai_client() is client
+        await openai_client.close_openai_client()
+
+
+@pytest.fixture
+def clock(monkeypatch):
+    """A settable monotonic clock for the circuit breaker."""
+    now = SimpleNamespace(value=1000.0)
+    monkeypatch.setattr(fallback, "time", SimpleNamespace(monotonic=lambda: now.value))
+    return now
+
+
+class TestCircuitBreaker:
+    """Test circuit breaker state transitions."""
+
+    def test_opens_after_threshold(self, clock):
+        """Test that consecutive failures open the circuit."""
+        breaker = CircuitBreaker("test", failure_threshold=3, cooldown_seconds=30)
+
+        for _ in range(2):
+            breaker.record_failure()
+            assert breaker.state == CircuitState.CLOSED
+            assert breaker.allow_request() is True
+
+        breaker.record_failure()
+        assert breaker.state == CircuitState.OPEN
+        assert breaker.allow_request() is False
+
+    def test_success_resets_failures(self, clock):
+        """Test that a success in between keeps the circuit closed."""
+        breaker = CircuitBreaker("test", failure_threshold=2, cooldown_seconds=30)
+
+        breaker.record_failure()
+        breaker.record_success()
+        breaker.record_failure()
+
+        assert breaker.state == CircuitState.CLOSED
+
+    def test_half_open_allows_single_trial(self, clock):
+        """Test that only one caller is let through once the cooldown passes."""
+        breaker = CircuitBreaker("test", failure_threshold=1, cooldown_seconds=30)
+        breaker.record_failure()
+
+        clock.value += 29
+        assert breaker.allow_request() is False
+
+        clock.value += 1
+        assert breaker.state == CircuitState.HALF_OPEN
+        assert breaker.allow_request() is True
+        assert breaker.allow_request() is False
+        assert breaker.allow_request() is False
+
+    def test_trial_success_closes(self, clock):
+        """Test that a successful trial closes the circuit."""
+        breaker = CircuitBreaker("test", failure_threshold=1, cooldown_seconds=30)
+        breaker.record_failure()
+        clock.value += 30
+
+        assert breaker.allow_request() is True
+        breaker.record_success()
+
+        assert breaker.state == CircuitState.CLOSED
+        assert breaker.failures == 0
+        assert breaker.allow_request() is True
+        assert breaker.allow_request() is True
+
+    def test_trial_failure_reopens(self, clock):
+        """Test that a failed trial reopens the circuit for another cooldown."""
+        breaker = CircuitBreaker("test", failure_threshold=3, cooldown_seconds=30)
+        for _ in range(3):
+            breaker.record_failure()
+        clock.value += 30
+
+        assert breaker.allow_request() is True
+        breaker.record_failure()
+
+        assert breaker.state == CircuitState.OPEN
+        assert breaker.allow_request() is False
+
+        clock.value += 30
+        assert breaker.allow_request() is True
+
+    def test_abandoned_trial_expires(self, clock):
+        """Test that a trial which never reports back is retried after a cooldown."""
+        breaker = CircuitBreaker("test", failure_threshold=1, cooldown_seconds=30)
+        breaker.record_failure()
+        clock.value += 30
+
+        assert breaker.allow_request() is True
+
+        clock.value += 29
+        assert breaker.allow_request() is False
+
+        clock.value += 1
+        assert breaker.allow_request() is True
+
+
+@pytest.fixture
+def limiter_clock(monkeypatch):
+    """A fake clock for the rate limiter that its sleeps advance."""
+    real_sleep = asyncio.sleep
+    clock = SimpleNamespace(value=500.0, sleeps=[])
+
+    async def fake_sleep(delay):
+        clock.sleeps.append(delay)
+        clock.value += delay
+        await real_sleep(0)
+
+    monkeypatch.setattr(rate_limit, "time", SimpleNamespace(monotonic=lambda: clock.value))
+    monkeypatch.setattr(rate_limit.asyncio, "sleep", fake_sleep)
+    return clock
+
+
+class TestRateLimiter:
+    """Test request and token budgets of the rate limiter."""
+
+    async def test_unlimited(self, limiter_clock):
+        """Test that a limiter without budgets never waits."""
+        limiter = RateLimiter()
+
+        for _ in range(100):
+            await limiter.acquire(tokens=10_000)
+
+        assert limiter_clock.sleeps == []
+
+    async def test_request_budget(self, limiter_clock):
+        """Test that requests beyond the per-minute budget wait for the refill."""
+        limiter = RateLimiter(requests_per_minute=2)
+
+        await limiter.acquire()
+        await limiter.acquire()
+        assert limiter_clock.sleeps == []
+
+        await limiter.acquire()
+        assert limiter_clock.sleeps == [pytest.approx(30.0)]
+
+    async def test_waiters_are_served_in_order(self, limiter_clock):
+        """Test that concurrent callers acquire in arrival order."""
+        limiter = RateLimiter(requests_per_minute=1)
+        order = []
+
+        async def caller(name):
+            await limiter.acquire()
+            order.append((name, limiter_clock.value))
+
+        await asyncio.gather(*(caller(name) for name in "abcd"))
+
+        assert [name for name, _ in order] == ["a", "b", "c", "d"]
+        assert [at - 500.0 for _, at in order] == [
+            pytest.approx(0.0), pytest.approx(60.0), pytest.approx(120.0), pytest.approx(180.0)
+        ]
+
+    async def test_token_budget(self, limiter_clock):
+        """Test that a request waits until enough tokens have refilled."""
+        limiter = RateLimiter(tokens_per_minute=600)
+
+        await limiter.acquire(tokens=500)
+        assert limiter_clock.sleeps == []
+
+        # 100 tokens left, refilling at 10 per second
+        await limiter.acquire(tokens=300)
+        assert limiter_clock.sleeps == [pytest.approx(20.0)]
+
+    async def test_tokens_beyond_capacity(self, limiter_clock):
+        """Test that an oversized request waits for a full bucket, not forever."""
+        limiter = RateLimiter(tokens_per_minute=600)
+
+        await limiter.acquire(tokens=1000)
+        assert limiter_clock.sleeps == []
+
+        await limiter.acquire(tokens=1000)
+        assert limiter_clock.sleeps == [pytest.approx(60.0)]
+
+    async def test_waits_for_both_budgets(self, limiter_clock):
+        """Test that the longer of the request and token waits applies."""
+        limiter = RateLimiter(requests_per_minute=60, tokens_per_minute=600)
+
+        await limiter.acquire(tokens=600)
+        await limiter.acquire(tokens=60)
+
+        # The request budget is free again after a second, the tokens after six
+        assert limiter_clock.sleeps == [pytest.approx(6.0)]
+
+
+@pytest.fixture
+def cache_clock(monkeypatch):
+    """A settable monotonic clock for the response cache."""
+    now = SimpleNamespace(value=100.0)
+    monkeypatch.setattr(response_cache, "time", SimpleNamespace(monotonic=lambda: now.value))
+    return now
+
+
+class TestResponseCache:
+    """Test the in-memory response cache and deterministic call keys."""
+
+    async def test_ttl_expiry(self, cache_clock):
+        """Test that entries expire after their TTL."""
+        cache = InMemoryLRUCache(default_ttl=60)
+        await cache.set("default", "a")
+        await cache.set("short", "b", ttl=5)
+
+        cache_clock.value += 5
+        assert await cache.get("short") == "b"
+        cache_clock.value += 1
+        assert await cache.get("short") is None
+        assert await cache.get("default") == "a"
+
+        cache_clock.value += 60
+        assert await cache.get("default") is None
+        assert cache.stats()["size"] == 0
+
+    async def test_lru_eviction(self, cache_clock):
+        """Test that the least recently used entry is evicted first."""
+        cache = InMemoryLRUCache(max_entries=2)
+        await cache.set("a", 1)
+        await cache.set("b", 2)
+        assert await cache.get("a") == 1
+
+        await cache.set("c", 3)
+
+        assert await cache.get("b") is None
+        assert await cache.get("a") == 1
+        assert await cache.get("c") == 3
+
+    async def test_stats(self, cache_clock):
+        """Test hit and miss counters."""
+        cache = InMemoryLRUCache()
+        assert cache.stats() == {"hits": 0, "misses": 0, "hit_rate": 0.0, "size": 0}
+
+        await cache.set("a", {"text": "cached"})
+        await cache.get("a")
+        await cache.get("a")
+        await cache.get("b")
+
+        assert cache.stats() == {"hits": 2, "misses": 1, "hit_rate": 2 / 3, "size": 1}
+
+    def test_request_key_only_for_deterministic_requests(self):
+        """Test that only temperature 0 requests get a key."""
+        service = FakeLLMService(LLMProvider.OPENAI)
+
+        assert _request_key(service, "generate", GenerationRequest(prompt="p", temperature=0.7)) is None
+
+        key = _request_key(service, "generate", GenerationRequest(prompt="p", temperature=0))
+        assert key is not None and key.startswith("llm:")
+        assert key == _request_key(service, "generate", GenerationRequest(prompt="p", temperature=0))
+
+    def test_request_key_covers_the_request(self):
+        """Test that provider, kind, request fields and schema all change the key."""
+        service = FakeLLMService(LLMProvider.OPENAI)
+        request = GenerationRequest(prompt="p", temperature=0)
+        key = _request_key(service, "generate", request)
+
+        assert key != _request_key(FakeLLMService(LLMProvider.OLLAMA), "generate", request)
+        assert key != _request_key(service, "structured", request)
+        assert key != _request_key(service, "generate", GenerationRequest(prompt="q", temperature=0))
+        assert key != _request_key(service, "generate", request, {"type": "object"})
+
+        chat = ChatRequest(messages=[ChatMessage(role="user", content="p")], temperature=0)
+        assert _request_key(service, "chat", chat) is not None
+
+    async def test_cache_hit_marks_response_only(self):
+        """Test that a cache hit is flagged without changing the stored entry."""
+        service = FakeLLMService(LLMProvider.OPENAI, text="cached text")
+        client = make_client(service)
+        client._cache = InMemoryLRUCache()
+        request = GenerationRequest(prompt="p", temperature=0)
+        key = _request_key(service, "generate", request)
+
+        async def call():
+            return await client._deterministic_call(
+                key,
+                lambda: service.generate(request),
+                dump=GenerationResponse.model_dump,
+                load=_load_cached_response
+            )
+
+        first = await call()
+        second = await call()
+        third = await call()
+
+        assert service.calls == 1
+        assert "cache_hit" not in first.metadata
+        assert second.metadata["cache_hit"] is True
+        assert third.text == "cached text"
+        assert client._cache._entries[key][1]["metadata"] == {}
+        assert client._cache.stats()["hits"] == 2
+
+    async def test_structured_results_are_copied(self):
+        """Test that editing a structured result changes neither the cache nor other callers."""
+        service = FakeLLMService(LLMProvider.OPENAI, text="Opening")
+        client = make_client(service)
+        client._cache = InMemoryLRUCache()
+        schema = {"type": "object"}
+
+        first, joined = await asyncio.gather(
+            client.generate_structured("p", schema, temperature=0),
+            client.generate_structured("p", schema, temperature=0)
+        )
+        first["scenes"].append({"title": "Added"})
+
+        assert service.calls == 1
+        assert joined == {"scenes": [{"title": "Opening"}]}
+
+        joined["scenes"][0]["title"] = "Edited"
+        cached = await client.generate_structured("p", schema, temperature=0)
+        assert cached == {"scenes": [{"title": "Opening"}]}
+
+        cached["scenes"].clear()
+        again = await client.generate_structured("p", schema, temperature=0)
+        assert again == {"scenes": [{"title": "Opening"}]}
+        assert service.calls == 1
+
+    async def test_sampled_calls_bypass_cache(self):
+        """Test that sampled generations always reach the provider."""
+        service = FakeLLMService(LLMProvider.OPENAI)
+        client = make_client(service)
+        client._cache = InMemoryLRUCache()
+
+        await client.generate("p", temperature=0.7)
+        await client.generate("p", temperature=0.7)
+
+        assert service.calls == 2
+        assert client._cache.stats()["size"] == 0
+
+
+class TestLLMClient:
+    """Test provider fallback and call coalescing."""
+
+    async def test_coalesced_failure_counts_once(self):
+        """Test that callers sharing one failed call record a single breaker failure."""
+        service = FakeLLMService(LLMProvider.OPENAI, error=RateLimitError("slow down"))
+        client = make_client(service)
+
+        results = await asyncio.gather(
+            *(client.generate("Same prompt", temperature=0) for _ in range(3)),
+            return_exceptions=True
+        )
+
+        assert all(isinstance(result, RateLimitError) for result in results)
+        assert service.calls == 1
+        assert client._breakers[LLMProvider.OPENAI].failures == 1
+
+    async def test_falls_back_on_rate_limit(self):
+        """Test that a rate-limited provider hands the call to the next one."""
+        primary = FakeLLMService(LLMProvider.OPENAI, error=RateLimitError("slow down"))
+        secondary = FakeLLMService(LLMProvider.OLLAMA, text="from ollama")
+        client = make_client(primary, secondary)
+
+        text = await client.generate("Prompt")
+
+        assert text == "from ollama"
+        assert primary.calls == 1
+        assert client._breakers[LLMProvider.OPENAI].failures == 1
+        assert client._breakers[LLMProvider.OLLAMA].failures == 0
+
+    async def test_preferred_provider_goes_first(self):
+        """Test that an explicit provider is tried before the fallback order."""
+        primary = FakeLLMService(LLMProvider.OPENAI, text="from openai")
+        secondary = FakeLLMService(LLMProvider.OLLAMA, text="from ollama")
+        client = make_client(primary, secondary)
+
+        text = await client.generate("Prompt", provider=LLMProvider.OLLAMA)
+
+        assert text == "from ollama"
+        assert primary.calls == 0
+
+    async def test_skips_open_circuit(self):
+        """Test that a provider with an open circuit is not called."""
+        primary = FakeLLMService(LLMProvider.OPENAI, text="from openai")
+        secondary = FakeLLMService(LLMProvider.OLLAMA, text="from ollama")
+        client = make_client(primary, secondary, failure_threshold=1)
+        client._breakers[LLMProvider.OPENAI].record_failure()
+
+        text = await client.generate("Prompt")
+
+        assert text == "from ollama"
+        assert primary.calls == 0
+
+    async def test_other_errors_do_not_fall_back(self):
+        """Test that errors other than rate limits and timeouts are raised as is."""
+        primary = FakeLLMService(LLMProvider.OPENAI, error=LLMError("bad request"))
+        secondary = FakeLLMService(LLMProvider.OLLAMA)
+        client = make_client(primary, secondary)
+
+        with pytest.raises(LLMError, match="bad request"):
+            await client.generate("Prompt")
+
+        assert secondary.calls == 0
+        assert client._breakers[LLMProvider.OPENAI].failures == 0
+
+    async def test_all_providers_failing(self):
+        """Test that the last error is raised once every provider has failed."""
+        primary = FakeLLMService(LLMProvider.OPENAI, error=RateLimitError("openai"))
+        secondary = FakeLLMService(LLMProvider.OLLAMA, error=RateLimitError("ollama"))
+        client = make_client(primary, secondary)
+
+        with pytest.raises(RateLimitError, match="ollama"):
+            await client.generate("Prompt")
+
+    async def test_all_circuits_open(self):
+        """Test that an error is raised without any calls when every circuit is open."""
+        primary = FakeLLMService(LLMProvider.OPENAI)
+        secondary = FakeLLMService(LLMProvider.OLLAMA)
+        client = make_client(primary, secondary, failure_threshold=1)
+        for breaker in client._breakers.values():
+            breaker.record_failure()
+
+        with pytest.raises(LLMError, match="unavailable"):
+            await client.generate("Prompt")
+
+        assert primary.calls == secondary.calls == 0
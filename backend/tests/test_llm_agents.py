@@ -0,0 +1,55 @@
+"""Tests for LLM agent helpers."""
+
+import string
+import pytest
+
+from app.services.llm_agents.base import PROMPTS_DIR, PromptTemplate
+
+
+def _field_values(text: str) -> dict:
+    """Give every top-level field in a template a distinct value."""
+    names = {
+        field.split(".")[0].split("[")[0]
+        for _, field, _, _ in string.Formatter().parse(text)
+        if field
+    }
+    return {name: f"<{name} value>" for name in names}
+
+
+class TestPromptTemplate:
+    """Test that compiled templates render exactly like str.format."""
+
+    @pytest.mark.parametrize(
+        "path", sorted(PROMPTS_DIR.glob("*.txt")), ids=lambda path: path.name
+    )
+    def test_prompt_files(self, path):
+        """Test every shipped prompt template against str.format."""
+        text = path.read_text()
+        values = _field_values(text)
+        template = PromptTemplate(text)
+
+        assert values
+        assert template._render is not None
+        assert template.format(**values) == text.format(**values)
+
+    @pytest.mark.parametrize("text, values", [
+        ("Plain text without fields", {}),
+        ("Braces {{like this}} stay {x}", {"x": "literal"}),
+        ("{{{x}}}", {"x": "wrapped"}),
+        ("Start {x} middle {y} end", {"x": 1, "y": 2.5}),
+        ("Repeated {x} and {x}", {"x": "twice"}),
+        ("Conversion {x!r}", {"x": "quoted"}),
+        ("Spec [{x:>4}]", {"x": "ab"}),
+        ("Spec {n:03d}", {"n": 7}),
+        ("Indexed {a[0]} and {a[1]}", {"a": ["first", "second"]}),
+        ("Attribute {x.real}", {"x": 3}),
+        ("Extra kwargs {x}", {"x": "used", "unused": "ignored"}),
+    ])
+    def test_matches_str_format(self, text, values):
+        """Test templates with escapes, conversions, specs and indexes."""
+        assert PromptTemplate(text).format(**values) == text.format(**values)
+
+    def test_missing_field_raises_key_error(self):
+        """Test that a missing field fails the same way as str.format."""
+        with pytest.raises(KeyError):
+            PromptTemplate("Hello {name}").format()
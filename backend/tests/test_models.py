@@ -40,6 +40,21 @@ class TestBaseDocument:
         assert isinstance(user_dict["_id"], str)  # ObjectId converted to string
         assert user_dict["username"] == "dict_test"
 
+    def test_json_schema_object_id_as_string(self):
+        """Test that ObjectId fields are exposed as strings in the JSON schema."""
+        schema = Project.model_json_schema()
+        assert schema["properties"]["user_id"]["type"] == "string"
+
+    def test_object_id_serialization_modes(self):
+        """Test that ObjectIds stay native in python mode and become strings in JSON."""
+        project_id = ObjectId()
+        chapter = Chapter(project_id=str(project_id), chapter_number=1, title="T", summary="S")
+
+        assert isinstance(chapter.project_id, ObjectId)
+        assert chapter.model_dump()["project_id"] == project_id
+        assert chapter.model_dump(mode="json")["project_id"] == str(project_id)
+        assert f'"project_id":"{project_id}"' in chapter.model_dump_json()
+
 
 class TestUserModel:
     """Test User model."""
@@ -1,12 +1,68 @@
 """Tests for repository operations and aggregations."""
 
 import pytest
+from datetime import timedelta
 from bson import ObjectId
+from pymongo.errors import BulkWriteError
 
-from app.models import Project, Chapter, Scene, Panel
+from app.models import User, Project, Chapter, Scene, Panel, Character, Generation, Draft
 from app.db.repositories.user import user_repository
 from app.db.repositories.project import project_repository
-from app.db.repositories.content import chapter_repository, scene_repository, panel_repository
+from app.db.repositories.content import (
+    CharacterRepository, chapter_repository, scene_repository, panel_repository
+)
+from app.db.repositories.draft import DraftRepository
+from app.db.repositories.generation import GenerationRepository, GenerationResultRepository
+
+
+class TestBaseRepository:
+    """Test base repository bulk operations."""
+
+    async def test_bulk_create(self, test_db):
+        """Test creating a batch of new documents in one insert."""
+        users = [User(username=f"writer{i}", hashed_password="hash") for i in range(3)]
+
+        created = await user_repository.bulk_create(users)
+
+        assert created == users
+        assert all(user.id is not None for user in created)
+        assert await user_repository.count() == 3
+        stored = await user_repository.get(created[1].id)
+        assert stored.username == "writer1"
+        assert stored.created_at is not None
+
+    async def test_bulk_create_skips_duplicates(self, test_db, test_user):
+        """Test that a duplicate is skipped while the rest of the batch persists."""
+        users = [
+            User(username="writer1", hashed_password="hash"),
+            User(username="testuser", hashed_password="hash"),
+            User(username="writer2", hashed_password="hash")
+        ]
+
+        created = await user_repository.bulk_create(users)
+
+        assert [user.username for user in created] == ["writer1", "writer2"]
+        assert await user_repository.count() == 3
+        assert await user_repository.username_exists("writer2") is True
+        duplicate = await user_repository.get_by_username("testuser")
+        assert duplicate.id == test_user.id
+
+    async def test_bulk_create_raises_other_errors(self, test_db, monkeypatch):
+        """Test that a write error other than a duplicate key is raised."""
+        def failing_insert_many(docs, ordered=True):
+            raise BulkWriteError({
+                "writeErrors": [
+                    {"index": 0, "code": 11000, "errmsg": "duplicate key"},
+                    {"index": 1, "code": 121, "errmsg": "Document failed validation"}
+                ],
+                "nInserted": 0
+            })
+
+        monkeypatch.setattr(user_repository.collection, "insert_many", failing_insert_many)
+        users = [User(username=f"writer{i}", hashed_password="hash") for i in range(2)]
+
+        with pytest.raises(BulkWriteError):
+            await user_repository.bulk_create(users)
 
 
 class TestUserRepository:
@@ -150,6 +206,34 @@ class TestContentRepositories:
         assert chapters[1].chapter_number == 2
         assert chapters[2].chapter_number == 3
 
+    async def test_count_project_chapters(self, test_db, sample_hierarchy):
+        """Test counting a project's chapters."""
+        count = await chapter_repository.count_project_chapters(str(sample_hierarchy.id))
+        assert count == 3
+
+        empty = await chapter_repository.count_project_chapters(str(ObjectId()))
+        assert empty == 0
+
+    async def test_count_project_characters(self, test_db, sample_hierarchy):
+        """Test counting a project's characters."""
+        character_repository = CharacterRepository()
+        for name in ("Ava", "Bram"):
+            await character_repository.create(Character(
+                project_id=sample_hierarchy.id,
+                name=name,
+                role="supporting",
+                description=f"{name} from the capital"
+            ))
+        await character_repository.create(Character(
+            project_id=ObjectId(),
+            name="Cole",
+            role="antagonist",
+            description="From another story"
+        ))
+
+        count = await character_repository.count_project_characters(str(sample_hierarchy.id))
+        assert count == 2
+
     async def test_get_chapter_with_scenes(self, test_db, sample_hierarchy):
         """Test getting chapter with all its scenes."""
         chapters = await chapter_repository.get_project_chapters(str(sample_hierarchy.id))
@@ -167,6 +251,42 @@ class TestContentRepositories:
         assert first_scene["scene_number"] == 1
         assert first_scene["panel_count"] == 3
 
+    async def test_get_chapter_context(self, test_db, sample_hierarchy):
+        """Test getting a chapter together with its project."""
+        chapters = await chapter_repository.get_project_chapters(str(sample_hierarchy.id))
+
+        context = await chapter_repository.get_chapter_context(str(chapters[1].id))
+
+        assert context is not None
+        assert context["chapter"].id == chapters[1].id
+        assert context["chapter"].title == "Chapter 2"
+        assert context["project"].id == sample_hierarchy.id
+        assert "characters" not in context
+
+    async def test_get_chapter_context_missing(self, test_db, sample_hierarchy):
+        """Test that a missing chapter or parent project gives no context."""
+        chapters = await chapter_repository.get_project_chapters(str(sample_hierarchy.id))
+
+        assert await chapter_repository.get_chapter_context(str(ObjectId())) is None
+        assert await chapter_repository.get_chapter_context("not-an-id") is None
+
+        test_db.projects.delete_one({"_id": sample_hierarchy.id})
+        assert await chapter_repository.get_chapter_context(str(chapters[0].id)) is None
+
+    async def test_get_chapter_context_with_characters(self, test_db, sample_hierarchy, sample_characters):
+        """Test joining the project's character briefs, newest first."""
+        chapters = await chapter_repository.get_project_chapters(str(sample_hierarchy.id))
+
+        context = await chapter_repository.get_chapter_context(
+            str(chapters[0].id), with_characters=True
+        )
+
+        assert context["chapter"].id == chapters[0].id
+        assert context["characters"] == [
+            {"name": character.name, "role": character.role, "description": character.description}
+            for character in reversed(sample_characters)
+        ]
+
     async def test_get_next_chapter_number(self, test_db, sample_hierarchy):
         """Test auto-incrementing chapter numbers."""
         next_num = await chapter_repository.get_next_chapter_number(str(sample_hierarchy.id))
@@ -198,6 +318,45 @@ class TestContentRepositories:
         assert first_panel["panel_number"] == 1
         assert first_panel["draft_count"] == 0  # No drafts created yet
 
+    async def test_get_scene_context(self, test_db, sample_hierarchy):
+        """Test getting a scene together with its chapter and project."""
+        chapters = await chapter_repository.get_project_chapters(str(sample_hierarchy.id))
+        scenes = await scene_repository.get_chapter_scenes(str(chapters[2].id))
+
+        context = await scene_repository.get_scene_context(str(scenes[1].id))
+
+        assert context is not None
+        assert context["scene"].title == "Scene 3.2"
+        assert context["chapter"].id == chapters[2].id
+        assert context["project"].id == sample_hierarchy.id
+        assert "characters" not in context
+
+    async def test_get_scene_context_missing(self, test_db, sample_hierarchy):
+        """Test that a missing scene, chapter or project gives no context."""
+        chapters = await chapter_repository.get_project_chapters(str(sample_hierarchy.id))
+        first_scenes = await scene_repository.get_chapter_scenes(str(chapters[0].id))
+        last_scenes = await scene_repository.get_chapter_scenes(str(chapters[2].id))
+
+        assert await scene_repository.get_scene_context(str(ObjectId())) is None
+        assert await scene_repository.get_scene_context("not-an-id") is None
+
+        test_db.chapters.delete_one({"_id": chapters[0].id})
+        assert await scene_repository.get_scene_context(str(first_scenes[0].id)) is None
+
+        test_db.projects.delete_one({"_id": sample_hierarchy.id})
+        assert await scene_repository.get_scene_context(str(last_scenes[0].id)) is None
+
+    async def test_get_scene_context_with_characters(self, test_db, sample_hierarchy, sample_characters):
+        """Test joining the project's character briefs through the chapter, newest first."""
+        chapters = await chapter_repository.get_project_chapters(str(sample_hierarchy.id))
+        scenes = await scene_repository.get_chapter_scenes(str(chapters[0].id))
+
+        context = await scene_repository.get_scene_context(str(scenes[0].id), with_characters=True)
+
+        assert context["scene"].id == scenes[0].id
+        assert [brief["name"] for brief in context["characters"]] == ["Cole", "Bram", "Ava"]
+        assert all("_id" not in brief for brief in context["characters"])
+
     async def test_get_next_scene_number(self, test_db, sample_hierarchy):
         """Test auto-incrementing scene numbers."""
         chapters = await chapter_repository.get_project_chapters(str(sample_hierarchy.id))
@@ -234,6 +393,190 @@ class TestContentRepositories:
             assert "chapter" in panel
 
 
+def make_draft(**fields) -> Draft:
+    """Build a scene list draft, overriding any of its fields."""
+    values = {
+        "entity_type": "chapter",
+        "type": "scene_list",
+        "content": {"scenes": []}
+    }
+    values.update(fields)
+    return Draft(**values)
+
+
+class TestDraftRepository:
+    """Test draft repository operations."""
+
+    async def test_create_drafts(self, test_db):
+        """Test creating several drafts in one insert."""
+        draft_repository = DraftRepository()
+        drafts = [make_draft(content={"scenes": [{"title": f"Scene {i}"}]}) for i in range(3)]
+
+        created = await draft_repository.create_drafts(drafts)
+
+        assert created == drafts
+        assert len({draft.id for draft in created}) == 3
+        stored = await draft_repository.get(created[2].id)
+        assert stored.content == {"scenes": [{"title": "Scene 2"}]}
+        assert stored.status == "pending"
+        assert stored.created_at is not None
+
+        assert await draft_repository.create_drafts([]) == []
+        assert await draft_repository.count() == 3
+
+    async def test_push_feedback(self, test_db):
+        """Test appending feedback entries to a draft in order."""
+        draft_repository = DraftRepository()
+        draft = await draft_repository.create_draft(make_draft(metadata={"source": "agent"}))
+        # Stored datetimes are truncated to milliseconds, so compare stored values
+        created = await draft_repository.get(draft.id)
+
+        assert await draft_repository.push_feedback(draft.id, {"text": "Make it darker"}) is True
+        assert await draft_repository.push_feedback(str(draft.id), {"text": "Shorter"}) is True
+
+        stored = await draft_repository.get(draft.id)
+        assert stored.metadata["feedback"] == [{"text": "Make it darker"}, {"text": "Shorter"}]
+        assert stored.metadata["source"] == "agent"
+        assert stored.updated_at >= created.updated_at
+
+        assert await draft_repository.push_feedback(ObjectId(), {"text": "Lost"}) is False
+
+    async def test_get_pending_draft_summaries(self, test_db):
+        """Test listing a project's pending drafts newest first, without content."""
+        draft_repository = DraftRepository()
+        project_id = ObjectId()
+        older = await draft_repository.create_draft(make_draft(project_id=project_id))
+        newer = await draft_repository.create_draft(
+            make_draft(project_id=project_id, type="character_list")
+        )
+        await draft_repository.create_draft(make_draft(project_id=project_id, status="selected"))
+        await draft_repository.create_draft(make_draft(project_id=ObjectId()))
+        # Inserts in the same millisecond would tie on created_at
+        test_db.drafts.update_one(
+            {"_id": older.id},
+            {"$set": {"created_at": older.created_at - timedelta(minutes=1)}}
+        )
+
+        summaries = await draft_repository.get_pending_draft_summaries(str(project_id))
+
+        assert [summary["_id"] for summary in summaries] == [newer.id, older.id]
+        assert summaries[0]["type"] == "character_list"
+        assert set(summaries[0]) == {"_id", "type", "created_at"}
+
+    async def test_select_draft_rejects_siblings(self, test_db):
+        """Test that selecting a draft rejects only pending drafts for the same entity."""
+        draft_repository = DraftRepository()
+        entity_id = ObjectId()
+        selected, sibling, other_type, other_entity, already_rejected = await draft_repository.create_drafts([
+            make_draft(entity_id=entity_id),
+            make_draft(entity_id=entity_id),
+            make_draft(entity_id=entity_id, type="scene_summary"),
+            make_draft(entity_id=ObjectId()),
+            make_draft(entity_id=entity_id, status="rejected")
+        ])
+        other_entity_type = await draft_repository.create_draft(
+            make_draft(entity_type="scene", entity_id=entity_id)
+        )
+
+        assert await draft_repository.select_draft(str(selected.id)) is True
+
+        async def status_of(draft):
+            return (await draft_repository.get(draft.id)).status
+
+        assert await status_of(selected) == "selected"
+        assert await status_of(sibling) == "rejected"
+        assert await status_of(other_type) == "pending"
+        assert await status_of(other_entity) == "pending"
+        assert await status_of(other_entity_type) == "pending"
+
+        untouched = test_db.drafts.find_one({"_id": already_rejected.id})
+        assert untouched["status"] == "rejected"
+        assert untouched["updated_at"] == untouched["created_at"]
+
+    async def test_select_missing_draft(self, test_db):
+        """Test that selecting a draft that does not exist changes nothing."""
+        draft_repository = DraftRepository()
+
+        assert await draft_repository.select_draft(str(ObjectId())) is False
+
+
+class TestGenerationRepositories:
+    """Test generation and generation result repositories."""
+
+    async def test_update_status_completed(self, test_db):
+        """Test that completing a generation stamps completed_at with updated_at."""
+        generation_repository = GenerationRepository()
+        generation = await generation_repository.create(Generation(
+            project_id=ObjectId(),
+            user_id=ObjectId(),
+            generation_type="text",
+            prompt="Write the opening scene"
+        ))
+        # Stored datetimes are truncated to milliseconds, so compare with the
+        # stored value rather than the in-memory one
+        created_at = test_db["generations"].find_one({"_id": generation.id})["updated_at"]
+
+        updated = await generation_repository.update_status(str(generation.id), "completed")
+        assert updated is True
+
+        doc = test_db["generations"].find_one({"_id": generation.id})
+        assert doc["status"] == "completed"
+        assert doc["completed_at"] == doc["updated_at"]
+        assert doc["updated_at"] >= created_at
+
+    async def test_update_status_failed(self, test_db):
+        """Test that a failed generation records the error but no completion time."""
+        generation_repository = GenerationRepository()
+        generation = await generation_repository.create(Generation(
+            project_id=ObjectId(),
+            user_id=ObjectId(),
+            generation_type="text",
+            prompt="Write the opening scene"
+        ))
+
+        await generation_repository.update_status(
+            str(generation.id), "failed", error_message="Rate limited"
+        )
+
+        doc = test_db["generations"].find_one({"_id": generation.id})
+        assert doc["status"] == "failed"
+        assert doc["error_message"] == "Rate limited"
+        assert doc.get("completed_at") is None
+
+    async def test_save_and_get_result(self, test_db):
+        """Test storing a generation's output and reading it back."""
+        result_repository = GenerationResultRepository()
+        generation_id = str(ObjectId())
+
+        await result_repository.save_result(generation_id, "Once upon a time")
+
+        result = await result_repository.get_by_generation(generation_id)
+        assert result is not None
+        assert str(result.generation_id) == generation_id
+        assert result.content == "Once upon a time"
+        assert result.created_at is not None
+
+        missing = await result_repository.get_by_generation(str(ObjectId()))
+        assert missing is None
+
+    async def test_save_result_replaces_content(self, test_db):
+        """Test that saving again replaces the earlier output in place."""
+        result_repository = GenerationResultRepository()
+        generation_id = str(ObjectId())
+
+        await result_repository.save_result(generation_id, "First draft")
+        first = await result_repository.get_by_generation(generation_id)
+
+        await result_repository.save_result(generation_id, "Second draft")
+        second = await result_repository.get_by_generation(generation_id)
+
+        assert second.id == first.id
+        assert second.content == "Second draft"
+        assert second.created_at == first.created_at
+        assert second.updated_at >= first.updated_at
+        assert await result_repository.count({"generation_id": ObjectId(generation_id)}) == 1
+
+
 class TestAggregations:
     """Test aggregation utilities."""
 